@@ -33,13 +33,208 @@
 
 from __future__ import annotations
 
+import base64
+import collections
+import contextlib
+import datetime as dt
+import functools
+import itertools
+import json
+import numpy as np
+import os
 import pandas as pd
+import queue
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
 import traceback
 import sqlalchemy as sa
+import uuid
+import weakref
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
 from enum import IntEnum
 from sqlalchemy.exc import SQLAlchemyError
+from utils4 import utils
 from utils4.reporterror import reporterror
 from utils4.user_interface import ui
+# locals
+try:
+    from ._sinks import make_sink
+except ImportError:
+    from _sinks import make_sink
+
+
+class AdmissionError(Exception):
+    """Raised when an operation is shed by the :class:`AdmissionPolicy`."""
+
+
+class AdmissionPolicy:
+    """Admission control for connection checkout, by priority class.
+
+    Each priority class (e.g. ``'interactive'`` and ``'batch'``) has its
+    own concurrency limit, and its own first-in-first-out queue of
+    waiting operations. An operation must be *admitted* to its class
+    before a connection is checked out of the pool, and the admission is
+    released when the connection is returned.
+
+    By limiting the lower priority classes to fewer than the pool's
+    ``pool_size`` connections, a batch job flooding the interface cannot
+    starve the latency-sensitive (interactive) calls of connections.
+
+    Once a class is saturated (i.e. its limit is reached), its
+    operations are either *delayed* (queued until admitted), or *shed*
+    by raising an :class:`AdmissionError`, if the class' queue is full,
+    or the operation is not admitted within the class' timeout.
+
+    The policy holds the admission state. Therefore, pass the *same*
+    policy object to each interface which is to be controlled jointly;
+    for example, interfaces sharing an engine.
+
+    Args:
+        limits (dict, optional): The concurrency limit for each priority
+            class, as ``{class: limit}``. A limit of None is unlimited.
+            Defaults to ``{'interactive': None, 'batch': 4}``.
+        queue_sizes (dict, optional): The maximum number of operations
+            queued per class, as ``{class: size}``. An operation is shed
+            if its class' queue is full. Defaults to None, meaning the
+            queues are unbounded.
+        timeouts (dict, optional): The maximum number of seconds an
+            operation is queued per class, as ``{class: seconds}``,
+            before it is shed. Defaults to None, meaning operations wait
+            until admitted.
+
+    :Example:
+
+        Limit batch work to four connections, and shed batch work which
+        cannot be admitted within ten seconds::
+
+            >>> from dbilib.database import AdmissionPolicy, DBInterface
+
+            >>> policy = AdmissionPolicy(limits={'interactive': None, 'batch': 4},
+                                         timeouts={'batch': 10})
+            >>> web = DBInterface(connstr=connstr, admission=policy)
+            >>> etl = DBInterface(connstr=connstr, admission=policy, priority='batch')
+
+    """
+
+    def __init__(self, limits: dict=None, queue_sizes: dict=None, timeouts: dict=None):
+        """Admission policy initialiser."""
+        limits = {'interactive': None, 'batch': 4} if limits is None else limits
+        queue_sizes = queue_sizes or {}
+        timeouts = timeouts or {}
+        self._lock = threading.Lock()
+        self._classes = {name: {'limit': limit,
+                                'queue_size': queue_sizes.get(name),
+                                'timeout': timeouts.get(name),
+                                'active': 0,
+                                'queue': collections.deque(),
+                                'cond': threading.Condition()}
+                         for name, limit in limits.items()}
+        self._metrics = {name: {'admitted': 0, 'shed': 0, 'wait_total': 0.0, 'wait_max': 0.0}
+                         for name in limits}
+
+    @property
+    def metrics(self) -> dict:
+        """Accessor to a snapshot of the admission counters, per class.
+
+        :Counters:
+
+            - ``admitted``: Number of operations admitted.
+            - ``shed``: Number of operations shed.
+            - ``wait_total``: Total time spent queued by the admitted
+              operations, in seconds.
+            - ``wait_max``: Longest time spent queued by an admitted
+              operation, in seconds.
+
+        """
+        with self._lock:
+            return {name: dict(counters) for name, counters in self._metrics.items()}
+
+    @contextlib.contextmanager
+    def admit(self, priority: str) -> Generator[None, None, None]:
+        """Admit an operation to its priority class for the block.
+
+        Args:
+            priority (str): The operation's priority class.
+
+        Raises:
+            AdmissionError: If the operation is shed.
+            ValueError: If the priority class is not defined.
+
+        """
+        if priority not in self._classes:
+            raise ValueError(f'Invalid priority: {priority}. '
+                             f'Expected one of: {list(self._classes)}.')
+        cls = self._classes[priority]
+        start = time.monotonic()
+        with cls['cond']:
+            if cls['limit'] is not None and (cls['active'] >= cls['limit'] or cls['queue']):
+                self._wait(priority=priority, cls=cls, start=start)
+            cls['active'] += 1
+        wait = time.monotonic() - start
+        with self._lock:
+            counters = self._metrics[priority]
+            counters['admitted'] += 1
+            counters['wait_total'] += wait
+            counters['wait_max'] = max(counters['wait_max'], wait)
+        try:
+            yield
+        finally:
+            with cls['cond']:
+                cls['active'] -= 1
+                cls['cond'].notify_all()
+
+    def _shed(self, priority: str, reason: str):
+        """Count and raise the shedding of an operation.
+
+        Args:
+            priority (str): The operation's priority class.
+            reason (str): The reason the operation was shed.
+
+        Raises:
+            AdmissionError: Always.
+
+        """
+        with self._lock:
+            self._metrics[priority]['shed'] += 1
+        raise AdmissionError(f'Operation shed from the {priority!r} class: {reason}.')
+
+    def _wait(self, priority: str, cls: dict, start: float):
+        """Queue an operation until it is at the head of its class' queue,
+        and the class is below its limit.
+
+        The caller must hold the class' condition.
+
+        Args:
+            priority (str): The operation's priority class.
+            cls (dict): The class' settings and state.
+            start (float): The operation's arrival time, per
+                ``time.monotonic``.
+
+        Raises:
+            AdmissionError: If the class' queue is full, or the
+                operation is not admitted within the class' timeout.
+
+        """
+        queue_ = cls['queue']
+        if cls['queue_size'] is not None and len(queue_) >= cls['queue_size']:
+            self._shed(priority=priority, reason='the queue is full')
+        ticket = object()
+        queue_.append(ticket)
+        deadline = None if cls['timeout'] is None else start + cls['timeout']
+        while queue_[0] is not ticket or cls['active'] >= cls['limit']:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                queue_.remove(ticket)
+                cls['cond'].notify_all()  # The next in the queue may proceed.
+                self._shed(priority=priority, reason='timed out in the queue')
+            cls['cond'].wait(timeout=remaining)
+        queue_.popleft()
+        cls['cond'].notify_all()  # The next in the queue may also be admitted.
 
 
 class ExitCode(IntEnum):
@@ -53,10 +248,565 @@ class ExitCode(IntEnum):
     ERR_BKUP_CKSUM = 112        # Checksum mismatch
 
 
+class LazyResult:
+    """A query result which holds its connection open, and fetches the
+    rows on demand.
+
+    Rather than fetching the full result when the statement is
+    executed, only the rows required by the method called are fetched.
+    For example, :meth:`first` fetches a single row, and
+    :meth:`iter_batches` fetches one batch at a time.
+
+    The connection is released deterministically: once the rows are
+    exhausted, once the result is materialised (e.g. via
+    :meth:`to_pandas`), when :meth:`close` is called, or on leaving a
+    ``with`` block. Otherwise, the connection is released when the
+    result is garbage collected. A closed result cannot be fetched.
+
+    Note:
+        This class is not designed to be created directly. Rather, use
+        the ``lazy`` argument of the
+        :meth:`_dbi_base._DBIBase.execute_query` method.
+
+    Args:
+        result (sqlalchemy.engine.cursor.CursorResult): The result of
+            the executed statement.
+        stack (contextlib.ExitStack): The stack holding the result's
+            connection context, which is closed to release the
+            connection.
+        fetch_size (int): Default number of rows per batch.
+
+    :Example:
+
+        Collect the first row only::
+
+            >>> dbi.execute_query('select * from orders order by order_date',
+                                  lazy=True).first()
+            (1, datetime.date(2023, 6, 7), ...)
+
+
+        Stream the rows in batches, releasing the connection on leaving
+        the block, even if the loop exits early::
+
+            >>> with dbi.execute_query('select * from history', lazy=True) as res:
+                    for batch in res.iter_batches(50000):
+                        process(batch)
+
+    """
+
+    def __init__(self,
+                 result: sa.engine.cursor.CursorResult,
+                 stack: contextlib.ExitStack,
+                 fetch_size: int):
+        """Lazy result initialiser."""
+        self._result = result
+        self._keys = list(result.keys())
+        self._fetch_size = fetch_size
+        # The finalizer must not reference the instance.
+        self._finalizer = weakref.finalize(self, stack.close)
+
+    def __enter__(self) -> LazyResult:
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Exit the context manager, and release the connection."""
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        """The result is closed, and its connection released."""
+        return not self._finalizer.alive
+
+    @property
+    def keys(self) -> list:
+        """Accessor to the result's column names."""
+        return list(self._keys)
+
+    def all(self) -> list:
+        """Fetch the remaining rows, and release the connection.
+
+        Returns:
+            list: The remaining rows, as a list of tuples.
+
+        """
+        return [row for batch in self.iter_batches() for row in batch]
+
+    def close(self):
+        """Release the result's connection."""
+        self._finalizer()
+
+    def first(self) -> sa.engine.Row | None:
+        """Fetch the first (remaining) row, and release the connection.
+
+        Returns:
+            sa.engine.Row | None: The row, or None if there are no
+            rows.
+
+        """
+        self._check_open()
+        try:
+            return self._result.fetchone()
+        finally:
+            self.close()
+
+    def iter_batches(self, n: int=None) -> Generator[list, None, None]:
+        """Fetch the remaining rows in batches.
+
+        The connection is released once the rows are exhausted.
+
+        Args:
+            n (int, optional): Number of rows per batch. Defaults to
+                None, which uses the interface's fetch size.
+
+        Yields:
+            list: A batch of (at most) ``n`` rows.
+
+        """
+        self._check_open()
+        while batch := self._result.fetchmany(n or self._fetch_size):
+            yield batch
+        self.close()
+
+    def scalar(self) -> object:
+        """Fetch the first column of the first row, and release the
+        connection.
+
+        Returns:
+            object: The value, or None if there are no rows.
+
+        """
+        row = self.first()
+        return row[0] if row is not None else None
+
+    def to_arrow(self) -> object:
+        """Fetch the remaining rows into a ``pyarrow.Table``, and release
+        the connection.
+
+        Each batch is converted to Arrow columns as it is fetched.
+
+        Raises:
+            ModuleNotFoundError: If the ``pyarrow`` library is not
+                installed.
+
+        Returns:
+            pyarrow.Table: The rows.
+
+        """
+        if not utils.testimport('pyarrow', verbose=False):
+            raise ModuleNotFoundError('The pyarrow library is required for Arrow output.')
+        return _DBIBase._result_to_frame(batches=self.iter_batches(),
+                                         columns=self._keys,
+                                         backend='arrow')
+
+    def to_numpy(self) -> np.ndarray:
+        """Fetch the remaining rows into a NumPy structured array, and
+        release the connection.
+
+        Returns:
+            np.ndarray: The rows, with a field per column.
+
+        """
+        return _DBIBase._result_to_output(batches=self.iter_batches(),
+                                          keys=self._keys,
+                                          output='numpy',
+                                          flat=False)
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Fetch the remaining rows into a DataFrame, and release the
+        connection.
+
+        Returns:
+            pd.DataFrame: The rows. If there are no rows, an empty
+            DataFrame containing the column names only, is returned.
+
+        """
+        return _DBIBase._result_to_frame(batches=self.iter_batches(),
+                                         columns=self._keys,
+                                         backend='pandas')
+
+    def _check_open(self):
+        """Verify the result is open.
+
+        Raises:
+            sa.exc.ResourceClosedError: If the result is closed.
+
+        """
+        if self.closed:
+            raise sa.exc.ResourceClosedError('This result is closed.')
+
+
+class MemoryBudget:
+    """Memory budget for a query's results, enforced while fetching.
+
+    The results are fetched in batches, and the number of rows and the
+    (estimated) size of the rows are totalled as each batch is fetched.
+    Once either limit is exceeded, the fetch either *fails early*, by
+    raising a :class:`MemoryBudgetError`, or *spills* the fetched and
+    remaining rows to a temporary Arrow IPC file, which is returned as
+    a memory-mapped :class:`SpilledResult`, rather than an in-memory
+    result.
+
+    The size of each batch is estimated from the Python object sizes of
+    a sample of its rows. Therefore, the estimate is an approximation
+    of the memory held by the fetched rows, rather than an exact
+    measure.
+
+    Args:
+        max_rows (int, optional): Maximum number of rows fetched into
+            memory. Defaults to None, meaning unlimited.
+        max_bytes (int, optional): Maximum (estimated) size of the rows
+            fetched into memory, in bytes. Defaults to None, meaning
+            unlimited.
+        spill (bool, optional): Spill the result to disk, rather than
+            raising an error, if the budget is exceeded. Requires the
+            ``pyarrow`` library. Defaults to False.
+        spill_dir (str, optional): Directory into which results are
+            spilled. Defaults to None, which uses the system's temporary
+            directory.
+
+    :Example:
+
+        Fail any query fetching more than one million rows, or 500 MB::
+
+            >>> from dbilib.database import DBInterface, MemoryBudget
+
+            >>> dbi = DBInterface(connstr=connstr,
+                                  budget=MemoryBudget(max_rows=1_000_000,
+                                                      max_bytes=500 * 2**20))
+
+
+        Spill a large result to disk::
+
+            >>> res = dbi.execute_query('select * from history',
+                                        budget=MemoryBudget(max_bytes=2**30, spill=True))
+            >>> for batch in res.iter_batches():
+                    process(batch)
+
+    """
+
+    # Number of rows per batch sampled to estimate the batch's size.
+    _SAMPLE = 100
+
+    def __init__(self,
+                 max_rows: int=None,
+                 max_bytes: int=None,
+                 spill: bool=False,
+                 spill_dir: str=None):
+        """Memory budget initialiser."""
+        if spill and not utils.testimport('pyarrow', verbose=False):
+            raise ModuleNotFoundError('The pyarrow library is required for spilling to disk.')
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.spill = spill
+        self.spill_dir = spill_dir
+
+    def exceeded(self, rows: int, nbytes: int) -> bool:
+        """Test if the fetched rows exceed the budget.
+
+        Args:
+            rows (int): Number of rows fetched.
+            nbytes (int): Estimated size of the fetched rows, in bytes.
+
+        Returns:
+            bool: True if either limit is exceeded, otherwise False.
+
+        """
+        return ((self.max_rows is not None and rows > self.max_rows)
+                or (self.max_bytes is not None and nbytes > self.max_bytes))
+
+    def measure(self, rows: list) -> int:
+        """Estimate the size of a batch of rows.
+
+        Args:
+            rows (list): The batch of rows.
+
+        Returns:
+            int: The estimated size of the rows, in bytes. If the budget
+            has no byte limit, the rows are not measured and zero is
+            returned.
+
+        """
+        if self.max_bytes is None or not rows:
+            return 0
+        sample = rows[:self._SAMPLE]
+        size = sum(sys.getsizeof(row) + sum(map(sys.getsizeof, row)) for row in sample)
+        return size * len(rows) // len(sample)
+
+
+class MemoryBudgetError(Exception):
+    """Raised when a query's results exceed the :class:`MemoryBudget`."""
+
+
+class RetryPolicy:
+    """Retry policy for transient database errors.
+
+    A transient error is an error which is expected to succeed if the
+    operation is retried; for example, a deadlock, a lock timeout or a
+    lost connection. The errors classified as transient are defined by
+    each of the database-specific classes.
+
+    The delay before each retry grows exponentially, and is 'jittered'
+    by a random factor, so many clients failing at once do not retry in
+    lock-step.
+
+    Args:
+        retries (int, optional): Maximum number of retries per
+            operation. Defaults to 3.
+        backoff (float, optional): Delay before the first retry, in
+            seconds. The delay doubles for each subsequent retry.
+            Defaults to 0.1.
+        max_backoff (float, optional): Maximum delay before a retry, in
+            seconds. Defaults to 5.0.
+        jitter (bool, optional): Apply 'full jitter' to each delay; that
+            is, sleep for a random period between zero and the
+            calculated delay. Defaults to True.
+        retry_writes (bool, optional): Also retry non-idempotent
+            operations (e.g. an ``INSERT`` via :meth:`execute_query` or
+            a ``call_procedure_update`` call). Only enable this if the
+            writes are safe to repeat, as a lost connection during a
+            COMMIT cannot be distinguished from a failed write.
+            Defaults to False.
+        on_retry (callable, optional): A callable which is called
+            before each retry as ``on_retry(attempt, delay, error)``;
+            for example, to log or instrument the retries. Defaults to
+            None.
+
+    :Example:
+
+        Retry transient errors up to five times::
+
+            >>> from dbilib.database import DBInterface, RetryPolicy
+
+            >>> dbi = DBInterface(connstr=connstr, retry=RetryPolicy(retries=5))
+
+    """
+
+    def __init__(self,
+                 retries: int=3,
+                 backoff: float=0.1,
+                 max_backoff: float=5.0,
+                 jitter: bool=True,
+                 retry_writes: bool=False,
+                 on_retry: callable=None):
+        """Retry policy initialiser."""
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_writes = retry_writes
+        self.on_retry = on_retry
+
+    def delay(self, attempt: int) -> float:
+        """Calculate the delay before the given retry attempt.
+
+        Args:
+            attempt (int): The zero-based retry attempt number.
+
+        Returns:
+            float: The delay, in seconds.
+
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return random.uniform(0, delay) if self.jitter else delay
+
+
 class SecurityWarning(Warning):
     """Security warning stub-class."""
 
 
+class SpilledResult:
+    """A query result which was spilled to a temporary Arrow IPC file.
+
+    The file is read via a memory map, so the data is paged in from
+    disk as it is accessed, rather than being held in memory. The file
+    is deleted when the result is closed, or garbage collected.
+
+    Args:
+        path (str): Path to the Arrow IPC file.
+
+    :Example:
+
+        Process a spilled result in batches, and delete the file::
+
+            >>> with dbi.execute_query(stmt, budget=budget) as res:
+                    for batch in res.iter_batches():
+                        process(batch.to_pandas())
+
+    """
+
+    def __init__(self, path: str):
+        """Spilled result initialiser."""
+        self._path = path
+        # The finalizer must not reference the instance.
+        self._finalizer = weakref.finalize(self, self._remove, path)
+
+    def __enter__(self) -> SpilledResult:
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Exit the context manager, and delete the file."""
+        self.close()
+
+    def __len__(self) -> int:
+        """The number of rows in the result."""
+        return self.to_arrow().num_rows
+
+    @property
+    def path(self) -> str:
+        """Accessor to the path of the Arrow IPC file."""
+        return self._path
+
+    def close(self):
+        """Delete the file.
+
+        Any tables or batches read from the file must not be used once
+        the file is deleted.
+
+        """
+        self._finalizer()
+
+    def iter_batches(self) -> Generator[object, None, None]:
+        """Iterate over the result's record batches.
+
+        Yields:
+            pyarrow.RecordBatch: Each (memory-mapped) batch, as written.
+
+        """
+        reader = self._reader()
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+
+    def to_arrow(self) -> object:
+        """Read the result as a memory-mapped table.
+
+        Returns:
+            pyarrow.Table: The result. As the table's buffers are mapped
+            from the file, this is a zero-copy operation.
+
+        """
+        return self._reader().read_all()
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Read the result into a DataFrame.
+
+        Note:
+            The full result is loaded into memory.
+
+        Returns:
+            pd.DataFrame: The result.
+
+        """
+        return self.to_arrow().to_pandas()
+
+    def _reader(self) -> object:
+        """Open the file via a memory map.
+
+        Returns:
+            pyarrow.ipc.RecordBatchFileReader: A reader for the file.
+
+        """
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel  # Optional.
+        return pa.ipc.open_file(pa.memory_map(self._path, 'r'))
+
+    @staticmethod
+    def _remove(path: str):
+        """Delete the file, if it exists.
+
+        Args:
+            path (str): Path to the file.
+
+        """
+        with contextlib.suppress(OSError):
+            os.remove(path)
+
+
+class _EngineRegistry:
+    """Process-wide registry of engines shared by the interface objects.
+
+    Engines are keyed by the normalised connection URL and the engine
+    options, so interfaces for the same database (and options) share a
+    single engine, and therefore a single connection pool.
+
+    Each engine is reference counted. An engine is disposed (and its
+    pooled connections closed) when the last interface using it is
+    closed, or garbage collected.
+
+    """
+
+    def __init__(self):
+        """Engine registry initialiser."""
+        # Re-entrant, as a garbage collection (and therefore a release)
+        # may be triggered while the lock is held.
+        self._lock = threading.RLock()
+        self._engines = {}  # {key: [engine, refcount]}
+
+    def acquire(self, key: tuple, factory: callable) -> sa.engine.base.Engine:
+        """Acquire the engine for the given key, creating it if required.
+
+        Args:
+            key (tuple): The engine's registry key.
+            factory (callable): A callable which creates the engine, if
+                an engine is not already registered for the key.
+
+        Returns:
+            sa.engine.base.Engine: The shared engine.
+
+        """
+        with self._lock:
+            entry = self._engines.get(key)
+            if entry is not None:
+                entry[1] += 1
+                return entry[0]
+        # Created outside of the lock, so other keys are not blocked
+        # while the (possibly slow) engine creation runs.
+        engine = factory()
+        with self._lock:
+            entry = self._engines.setdefault(key, [engine, 0])
+            entry[1] += 1
+        if entry[0] is not engine:
+            engine.dispose()  # Lost the race to another thread.
+        return entry[0]
+
+    def refcount(self, key: tuple) -> int:
+        """Return the number of references to the given key's engine.
+
+        Args:
+            key (tuple): The engine's registry key.
+
+        Returns:
+            int: The reference count, or zero if not registered.
+
+        """
+        with self._lock:
+            entry = self._engines.get(key)
+            return entry[1] if entry else 0
+
+    def release(self, key: tuple):
+        """Release a reference to the given key's engine.
+
+        If this is the last reference, the engine is removed from the
+        registry and disposed.
+
+        Args:
+            key (tuple): The engine's registry key.
+
+        """
+        with self._lock:
+            entry = self._engines.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self._engines[key]
+        entry[0].dispose()
+
+
+_REGISTRY = _EngineRegistry()
+
+
 class _DBIBase:
     """This class holds the methods and properties which are used across
     all databases. Each of the database-specific constructors inherits
@@ -73,6 +823,55 @@ class _DBIBase:
     Args:
         connstr (str): The database-specific SQLAlchemy connection
             string.
+        retry (RetryPolicy | int, optional): The policy used to retry
+            operations which fail with a transient error. If an integer
+            is provided, a default policy with that number of retries is
+            used. Defaults to None, which disables retries.
+        shared (bool, optional): Share the engine (and its connection
+            pool) with other interface objects created with the same
+            connection string and options, via a process-wide registry.
+            Defaults to True.
+        replicas (list[str], optional): Connection strings for read
+            replicas of the primary database (``connstr``). Read
+            statements are routed to the replicas; see *Read Replicas*
+            below. Defaults to None.
+        routing (str, optional): How a replica is selected for each
+            read. Either ``'round-robin'``, or ``'least-outstanding'``,
+            which selects the replica with the fewest connections
+            checked out by this interface. Defaults to 'round-robin'.
+        read_your_writes (float, optional): For this number of seconds
+            after a write, reads are routed to the primary, so the
+            interface reads its own writes regardless of replica lag.
+            Defaults to 0.0, which disables the window.
+        admission (AdmissionPolicy, optional): The admission policy
+            applied before each connection is checked out. Refer to the
+            :class:`AdmissionPolicy` class. Defaults to None, which
+            admits all operations.
+        priority (str, optional): The interface's default priority
+            class, used by the admission policy. Defaults to
+            'interactive'.
+        backend (str, optional): The interface's default DataFrame
+            library; ``'pandas'``, ``'polars'`` or ``'arrow'``. The
+            polars and pyarrow libraries are optional, and are imported
+            only if selected. Defaults to 'pandas'.
+        budget (MemoryBudget, optional): The memory budget enforced
+            while fetching the results of :meth:`execute_query`. Refer
+            to the :class:`MemoryBudget` class. Defaults to None, which
+            applies no budget.
+
+    :Read Replicas:
+
+        If replicas are configured, :meth:`execute_query` calls for
+        read statements (e.g. ``SELECT``), and therefore the
+        ``table_exists`` method, and :meth:`iter_query` calls are served
+        by a replica. All other statements, :meth:`transaction` blocks
+        and stored procedure calls are served by the primary. A read
+        can be forced onto the primary using the ``primary`` argument
+        of :meth:`execute_query`.
+
+    The interface can be used as a context manager, which calls
+    :meth:`close` on exit. Otherwise, the shared engine is released when
+    the interface is garbage collected.
 
     :Example Use:
 
@@ -88,19 +887,87 @@ class _DBIBase:
                                               '<user>:<pwd>@<host>:<port>/'
                                               '<db_name>'))
 
+
+        Release the connection pool deterministically as::
+
+            >>> with DBInterface(connstr=connstr) as dbi:
+                    dbi.execute_query(...)
+
     """
 
     _PREFIX = '\n[DatabaseError]:'
     _PREFIXW = '\n[DatabaseWarning]:'
-
-    def __init__(self, connstr: str):
+    # Substrings of the DBAPI error messages which identify a transient
+    # error. These are defined by the database-specific classes.
+    _TRANSIENT_ERRORS = ()
+    # Substrings of the DBAPI error messages raised when a statement is
+    # cancelled by a timeout. These are defined by the database-specific
+    # classes.
+    _TIMEOUT_ERRORS = ()
+    _RE_READ = re.compile(r'^\s*(select|with|show|pragma|explain|describe|values)\b',
+                          flags=re.IGNORECASE)
+    # Keywords which mark a statement as a (potential) write, wherever they
+    # appear; e.g. a CTE feeding a DELETE, or SELECT ... INTO.
+    _RE_WRITE = re.compile(r'\b(insert|update|delete|merge|into|create|drop|alter|'
+                           r'replace|truncate)\b',
+                           flags=re.IGNORECASE)
+    _ROUTING = ('round-robin', 'least-outstanding')
+    _OUTPUTS = ('columns', 'arrays', 'numpy')
+    # DataFrame backends, and the (optional) library required by each.
+    _BACKENDS = {'pandas': 'pandas', 'polars': 'polars', 'arrow': 'pyarrow'}
+    # Number of rows fetched per batch by the columnar output modes.
+    _FETCH_SIZE = 10000
+    # Default number of concurrent extraction workers, if the connection
+    # pool's size is not known (e.g. a NullPool).
+    _MAX_WORKERS = 4
+
+    def __init__(self,
+                 connstr: str,
+                 retry: RetryPolicy | int=None,
+                 shared: bool=True,
+                 replicas: list[str]=None,
+                 routing: str='round-robin',
+                 read_your_writes: float=0.0,
+                 admission: AdmissionPolicy=None,
+                 priority: str='interactive',
+                 backend: str='pandas',
+                 budget: MemoryBudget=None):
         """Class initialiser."""
+        if routing not in self._ROUTING:
+            raise ValueError(f'Invalid routing: {routing}. Expected one of: {self._ROUTING}.')
+        self._backend = self._check_backend(backend=backend)
         self._connstr = connstr
         self._engine = None
+        self._shared = shared
+        self._finalizers = []
+        self._replicas = []
+        self._routing = routing
+        self._read_your_writes = read_your_writes
+        self._last_write = None
+        self._outstanding = []  # Number of checked out connections, per replica.
+        self._next = itertools.count()
+        self._route_lock = threading.Lock()
+        self._admission = admission
+        self._priority = priority
+        self._budget = budget
+        self._retry = RetryPolicy(retries=retry) if isinstance(retry, int) else retry
+        self._metrics = {'retries': 0, 'retries_exhausted': 0, 'timeouts': 0}
+        self._metrics_lock = threading.Lock()
+        self._local = threading.local()  # Per-thread transaction state.
         if connstr:
             # Testing: Enable an instance to be created without a
             # connection string.
-            self._engine = self._create_engine()
+            self._engine = self._acquire_engine(connstr=connstr)
+            self._replicas = [self._acquire_engine(connstr=r) for r in replicas or ()]
+            self._outstanding = [0] * len(self._replicas)
+
+    def __enter__(self) -> _DBIBase:
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Exit the context manager, and close the interface."""
+        self.close()
 
     @property
     def database_name(self):
@@ -112,150 +979,1795 @@ class _DBIBase:
         """Accessor to the ``sqlalchemy.engine.base.Engine`` object."""
         return self._engine
 
-    def execute_query(self,
-                      stmt: str,
-                      params: dict=None,
-                      *,
-                      raw: bool=True,
-                      flat: bool=False,
-                      commit: bool=True,
-                      ignore_unsafe: bool=False) -> list | pd.DataFrame | None:
-        """Execute a query statement.
+    @property
+    def in_transaction(self) -> bool:
+        """Test if the current thread is within a :meth:`transaction` block."""
+        return getattr(self._local, 'conn', None) is not None
+
+    @property
+    def metrics(self) -> dict:
+        """Accessor to a snapshot of the interface's instrumentation
+        counters.
+
+        :Counters:
+
+            - ``retries``: Number of operations retried after a
+              transient error.
+            - ``retries_exhausted``: Number of operations which failed
+              with a transient error after all retries were used.
+            - ``timeouts``: Number of statements cancelled by a
+              timeout.
+            - ``admission``: If an admission policy is set, the
+              policy's counters per priority class, including the queue
+              wait times. Refer to :attr:`AdmissionPolicy.metrics`.
+
+        """
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        if self._admission is not None:
+            metrics['admission'] = self._admission.metrics
+        return metrics
+
+    def checksum_blocks(self,
+                        table_name: str,
+                        key_column: str,
+                        block_size: int=100000,
+                        database_name: str=None) -> dict[int, tuple]:
+        """Calculate a checksum for each key-range block of the given table.
+
+        The table is divided into blocks on a *non-negative integer* key
+        column, where each block ``n`` contains the keys in the range
+        ``[n * block_size, (n + 1) * block_size)``. A checksum is
+        calculated for each block, using the database's hashing
+        functions.
+
+        Args:
+            table_name (str): Name of the table against which the
+                checksums are to be calculated.
+            key_column (str): Name of the (indexed) non-negative
+                integer key column on which the table is blocked.
+            block_size (int, optional): Key range spanned by each block.
+                Defaults to 100000.
+            database_name (str, optional): Name of the database (or
+                schema) in which the table resides, if different from
+                the one to which the engine object points. Defaults to
+                None.
+
+        Raises:
+            sqlalchemy.exc.SQLAlchemyError: If the table cannot be read.
+
+        Returns:
+            dict[int, tuple]: A dictionary of
+            ``{block: (min_key, max_key, row_count, checksum)}`` items.
+
+        """
+        return self._block_checksums(table_name=table_name,
+                                     key_column=key_column,
+                                     block_size=block_size,
+                                     database_name=database_name)
+
+    def close(self):
+        """Close the interface, and release its engine.
+
+        If the engine is shared, it is disposed (and its pooled
+        connections closed) only when the last interface using it is
+        closed. The interface is not usable once closed.
+
+        """
+        if self._engine is None:
+            return
+        for finalizer in self._finalizers:
+            finalizer()  # Each is called only once.
+        self._engine = None
+        self._replicas = []
+
+    def compare_blocks(self,
+                       table_name: str,
+                       key_column: str,
+                       *,
+                       other_table: str=None,
+                       database_name: str=None,
+                       other_database: str=None,
+                       block_size: int=100000,
+                       min_block_size: int=1000,
+                       previous: dict=None) -> tuple[list[tuple], dict]:
+        """Compare two tables by block checksum, and locate the differences.
+
+        The block checksums of the two tables are calculated
+        concurrently, and compared. Each mismatched block is then
+        *drilled into*, by comparing sub-blocks of 1/16th of its size
+        (and only within its key range), until the ``min_block_size`` is
+        reached. Therefore, only the mismatched ranges are re-read.
+
+        :Incremental Verification:
+
+            The second item of the returned tuple contains the checksums
+            of the blocks which matched. If this is passed back via the
+            ``previous`` argument on a later verification, any block of
+            the first table whose checksum is unchanged is assumed to
+            still match, and is *not* calculated on the other table.
+
+        Args:
+            table_name (str): Name of the (source) table.
+            key_column (str): Name of the (indexed) non-negative
+                integer key column on which the tables are blocked.
+            other_table (str, optional): Name of the table to compare
+                against. Defaults to None, meaning ``table_name``.
+            database_name (str, optional): Database (or schema) of the
+                source table, if different from the one to which the
+                engine object points. Defaults to None.
+            other_database (str, optional): Database (or schema) of the
+                other table. Defaults to None.
+            block_size (int, optional): Key range spanned by each
+                top-level block. Defaults to 100000.
+            min_block_size (int, optional): Key range at which the
+                drill-down stops. Defaults to 1000.
+            previous (dict, optional): Block checksums of matching
+                blocks, as returned by a previous call. Defaults to
+                None.
+
+        :Example:
+
+            Verify a backup table, then re-verify it later, reading only
+            the blocks which have changed::
+
+                >>> diffs, verified = dbi.compare_blocks('orders',
+                                                         key_column='id',
+                                                         other_database='__bak__mydb')
+                >>> diffs
+                []
+
+                >>> diffs, verified = dbi.compare_blocks('orders',
+                                                         key_column='id',
+                                                         other_database='__bak__mydb',
+                                                         previous=verified)
+                >>> diffs
+                [(1204000, 1204999)]  # <-- Only this range differs.
+
+        Raises:
+            sqlalchemy.exc.SQLAlchemyError: If either table cannot be
+                read; rather than the table appearing to hold no blocks.
+
+        Returns:
+            tuple[list[tuple], dict]: A tuple containing a list of the
+            ``(min_key, max_key)`` ranges which differ, and a dictionary
+            of ``{block: checksum}`` for the blocks which match, as::
+
+                (diffs, verified)
+
+        """
+        size = int(block_size)
+        previous = previous or {}
+        kwargs = {'key_column': key_column, 'block_size': size}
+        src = self._block_checksums(table_name=table_name, database_name=database_name, **kwargs)
+        skip = {k for k, v in src.items() if previous.get(k) == v[3]}
+        # Restrict the other table to the blocks which are not skipped.
+        ranges, start = [], None
+        for blk in sorted(skip):
+            if start is None or start < blk * size:
+                ranges.append((start, blk * size - 1))
+            start = (blk + 1) * size
+        ranges.append((start, None))
+        dst = self._block_checksums(table_name=other_table or table_name,
+                                    database_name=other_database,
+                                    ranges=ranges if skip and len(ranges) <= 100 else None,
+                                    **kwargs)
+        diffs, verified = [], {}
+        for blk in sorted(set(src) | set(dst)):
+            a, b = src.get(blk), dst.get(blk)
+            if blk in skip or (a and b and a[2:] == b[2:]):
+                verified[blk] = a[3]
+            else:
+                diffs.extend(self._drill_blocks(table_name=table_name,
+                                                other_table=other_table or table_name,
+                                                key_column=key_column,
+                                                database_name=database_name,
+                                                other_database=other_database,
+                                                lo=blk * size,
+                                                hi=(blk + 1) * size - 1,
+                                                block_size=size,
+                                                min_block_size=min_block_size))
+        return diffs, verified
+
+    def execute_query(self,
+                      stmt: str,
+                      params: dict=None,
+                      *,
+                      raw: bool=True,
+                      flat: bool=False,
+                      commit: bool=True,
+                      ignore_unsafe: bool=False,
+                      idempotent: bool=None,
+                      timeout: float=None,
+                      primary: bool=False,
+                      raise_errors: bool=False,
+                      priority: str=None,
+                      output: str=None,
+                      backend: str=None,
+                      budget: MemoryBudget=None,
+                      lazy: bool=False) -> list | tuple | dict | np.ndarray | pd.DataFrame | LazyResult | SpilledResult | None:  # noqa
+        """Execute a query statement.
+
+        Important:
+            The following are *not* allowed to be executed by this
+            method:
+
+                - Statements containing multiple semi-colons (``;``).
+                - Statements containing a comment delimiter (``--``).
+
+            If found, a :class:`SecurityWarning` will be raised by the
+            :meth:`_is_dangerous` method.
+
+        Args:
+            stmt (str): Statement to be executed. The parameter bindings
+                are to be written in colon format.
+            params (dict, optional): Parameter key/value bindings as a
+                dictionary, if applicable. Defaults to None.
+            raw (bool, optional): Return the data in 'raw' (tuple)
+                format rather than as a formatted DataFrame.
+                Defaults to True for efficiency.
+            flat (bool, optional): Flatten the response. This is useful
+                if the expected response is a collection of *single
+                elements*. If True, this will return a flattened tuple of
+                elements, rather than a list of tuples, as is the default
+                behaviour. If an ``output`` mode is used, the first column
+                is returned in that mode's format; for example, a 1-D
+                NumPy array for ``output='numpy'``. Note (1): If true,
+                and the return is a list of multi-value tuples, only the
+                first element in each tuple will be returned. Note (2):
+                This argument should only be used if ``raw=True``.
+                Defaults to False.
+            commit (bool, optional): Call COMMIT after the transaction
+                is complete. Defaults to True (for backwards
+                compatibility).
+            ignore_unsafe (bool, optional): Bypass the 'is dangerous'
+              check and the run query anyway. This may be required if
+              a script contains multiple statements. Defaults to False.
+
+              WARNING: **HC SVNT DRACONES**
+            idempotent (bool, optional): The statement is safe to be
+              retried on a transient error, per the interface's
+              :class:`RetryPolicy`. Defaults to None, meaning read
+              statements (e.g. ``SELECT``) are retried, while others are
+              retried only if the policy's ``retry_writes`` is set.
+            timeout (float, optional): Cancel the statement if it has not
+              completed within this number of seconds. A cancelled
+              statement's connection is invalidated (discarded from the
+              pool) and the error is reported. Defaults to None, which
+              applies no timeout.
+            primary (bool, optional): Execute a read statement on the
+              primary, rather than on a replica. Only applies if
+              replicas are configured. Defaults to False.
+            raise_errors (bool, optional): Raise a database error rather
+              than reporting it. Defaults to False.
+            priority (str, optional): The statement's priority class,
+              used by the admission policy. If the statement is shed, an
+              :class:`AdmissionError` is raised. Defaults to None, which
+              uses the interface's priority.
+            output (str, optional): Return the results in a columnar
+              format, filled directly from the cursor in batches, rather
+              than as rows. Either ``'columns'`` (a dictionary of lists,
+              per column), ``'arrays'`` (a dictionary of NumPy arrays,
+              per column) or ``'numpy'`` (a NumPy structured array). If
+              used, the ``raw`` argument is ignored. Defaults to None.
+            backend (str, optional): The DataFrame library used if
+              ``raw=False``. Either ``'pandas'``, ``'polars'`` (a
+              ``polars.DataFrame``) or ``'arrow'`` (a ``pyarrow.Table``).
+              The polars and Arrow frames are built directly from the
+              cursor's fetched batches. The library is imported only if
+              selected. Defaults to None, which uses the interface's
+              backend.
+            budget (MemoryBudget, optional): The memory budget enforced
+              while fetching the results. If exceeded, a
+              :class:`MemoryBudgetError` is raised, or a
+              :class:`SpilledResult` is returned, per the budget.
+              Defaults to None, which uses the interface's budget.
+            lazy (bool, optional): Return a :class:`LazyResult`, which
+              holds the connection open and fetches the rows on demand,
+              rather than fetching the rows immediately. If used, the
+              ``raw``, ``flat``, ``output``, ``backend`` and ``budget``
+              arguments are ignored, and the ``timeout`` applies to the
+              statement's execution only. Defaults to False.
+
+        If the query did not return results and the ``raw`` argument is
+        False, an empty DataFrame containing the column names only, is
+        returned.
+
+        Note:
+            In the SQL query, the bind parameters are specified by name,
+            using the format ``:bind_name``. The ``params`` dictionary
+            argument must contain the associated parameter name/value
+            bindings.
+
+        Warning:
+
+            1) Generally, whatever statement is passed into this method
+               **will be executed**, and may have *destructive
+               implications.*
+
+            2) This method contains a ``commit`` call, and the option to
+               disable the COMMIT.
+
+            If a statement is passed into this method, and the user has
+            the appropriate permissions - the change
+            **will be committed**.
+
+            Within a :meth:`transaction` block, the statement is
+            executed on the transaction's connection, the ``commit``
+            argument is ignored, and errors are raised rather than
+            reported.
+
+            **... HC SVNT DRACONES.**
+
+        Returns:
+            list | tuple | dict | np.ndarray | pd.DataFrame | LazyResult | SpilledResult | None:
+            If the ``raw`` parameter is True, a list of tuples containing
+            values is returned. Otherwise, a ``pandas.DataFrame`` object
+            containing the returned data is returned. If an ``output``
+            mode is used, the results are returned in that format. If
+            the results were spilled to disk, a :class:`SpilledResult`
+            is returned. If the ``lazy`` argument is True, a
+            :class:`LazyResult` is returned.
+
+            If this method is called with a script which does not return
+            results, for example a CREATE script, None is returned;
+            regardless of the value passed to the ``raw`` parameter.
+
+        """
+        # pylint: disable=line-too-long     # Kept for clarity.
+        # pylint: disable=no-else-return    # Additional else and return used for clarity.
+        # pylint: disable=no-member         # The error does have a _message member.
+        if output is not None and output not in self._OUTPUTS:
+            raise ValueError(f'Invalid output: {output}. Expected one of: {self._OUTPUTS}.')
+        backend = self._check_backend(backend=backend or self._backend)
+        try:
+            rtn = None
+            # Perform a cursory 'security check.'
+            if ignore_unsafe or not self._is_dangerous(stmt=stmt):
+                read = self._is_read(stmt=stmt)
+                if idempotent is None:
+                    idempotent = read
+                if lazy:
+                    return self._with_retry(self._execute_lazy,
+                                            stmt=stmt,
+                                            params=params,
+                                            commit=commit,
+                                            timeout=timeout,
+                                            read=read and not primary,
+                                            priority=priority,
+                                            idempotent__=idempotent)
+                rtn = self._with_retry(self._execute,
+                                       stmt=stmt,
+                                       params=params,
+                                       raw=raw,
+                                       commit=commit,
+                                       timeout=timeout,
+                                       read=read and not primary,
+                                       priority=priority,
+                                       output=output,
+                                       flat=flat,
+                                       backend=backend,
+                                       budget=budget or self._budget,
+                                       idempotent__=idempotent)
+        except SecurityWarning:
+            print(traceback.format_exc())
+        except Exception as err:
+            # Non-database errors (e.g. an AdmissionError) are raised.
+            if self.in_transaction or raise_errors or not isinstance(err, SQLAlchemyError):
+                raise
+            if 'object does not return rows' not in err._message():
+                reporterror(err)
+        if flat and output is None and isinstance(rtn, list):
+            return tuple(row[0] for row in rtn)
+        return rtn
+
+    def extract_incremental(self,
+                            table: str,
+                            watermark_column: str,
+                            key_columns: list | tuple,
+                            state: str,
+                            *,
+                            where: str=None,
+                            params: dict=None,
+                            raw: bool=True) -> list | pd.DataFrame | None:
+        """Extract only the rows added or changed since the last pull.
+
+        The rows beyond the persisted high-water mark are returned *in
+        full*, and the high-water mark is advanced once the rows have
+        been fetched. To stream the changes in chunks, please use the
+        :meth:`iter_incremental` method.
+
+        For a detailed description of the arguments and of how ties on
+        the watermark value are handled, please refer to the
+        :meth:`iter_incremental` method.
+
+        Args:
+            table (str): Name of the table to be extracted.
+            watermark_column (str): Name of the (ever-increasing)
+                watermark column; for example ``updated_at``, or a
+                rowversion column.
+            key_columns (list | tuple): The column(s) making up a
+                *unique* key for the table.
+            state (str): Path to the JSON state file in which the
+                high-water mark is stored.
+            where (str, optional): An additional filter to be applied,
+                *without* the ``WHERE`` keyword. Defaults to None.
+            params (dict, optional): Parameter key/value bindings for
+                the ``where`` filter, if applicable. Defaults to None.
+            raw (bool, optional): Return the data in 'raw' (tuple)
+                format rather than as a formatted DataFrame. Defaults to
+                True for efficiency.
+
+        Returns:
+            list | pd.DataFrame | None: The rows beyond the high-water
+            mark. If an error occurs, the error is reported, the state
+            is left unchanged and None is returned.
+
+        """
+        rows, keys = [], None
+        try:
+            for chunk, last in self._iter_incremental(table=table,
+                                                      watermark_column=watermark_column,
+                                                      key_columns=key_columns,
+                                                      state=state,
+                                                      where=where,
+                                                      params=params,
+                                                      chunksize=10000):
+                rows.extend(chunk)
+                keys = list(chunk[0]._fields)  # pylint: disable=protected-access
+            if rows:
+                self._state_save(path=state, name=table, values=last)
+        except Exception as err:
+            reporterror(err)
+            return None
+        if raw:
+            return rows
+        if keys is None:
+            keys = list(self.execute_query(f'SELECT * FROM {table} WHERE 1 = 0', raw=False).columns)
+        return pd.DataFrame(rows, columns=keys)
+
+    def iter_incremental(self,
+                         table: str,
+                         watermark_column: str,
+                         key_columns: list | tuple,
+                         state: str,
+                         *,
+                         where: str=None,
+                         params: dict=None,
+                         chunksize: int=10000,
+                         raw: bool=True) -> Generator[list | pd.DataFrame]:
+        """Stream only the rows added or changed since the last pull.
+
+        The rows whose watermark value is beyond the persisted high-water
+        mark are streamed in chunks, ordered by the watermark and key
+        columns. The high-water mark is persisted once each chunk has
+        been *consumed*; that is, when the next chunk is requested. If
+        the caller fails while processing a chunk, that chunk is
+        delivered again on the next pull.
+
+        :Ties:
+
+            Many rows can share a watermark value (e.g. a bulk update
+            sharing a timestamp). Comparing on the watermark alone either
+            drops the remainder of a partially consumed tie (``>``) or
+            re-reads the whole tie (``>=``). Therefore, the high-water
+            mark is stored as the watermark value *and* the key of the
+            last row consumed, and the rows are selected using the
+            (watermark, key) pair, as::
+
+                wm > :wm OR (wm = :wm AND key > :key)
+
+        :State:
+
+            The state file is a small JSON file holding the high-water
+            mark for each table, so a single file can be shared by a
+            sync job's tables. The file is replaced atomically on each
+            update. If the file does not exist, the full table is
+            extracted.
+
+        Args:
+            table (str): Name of the table to be extracted.
+            watermark_column (str): Name of the (ever-increasing)
+                watermark column; for example ``updated_at``, or a
+                rowversion column.
+            key_columns (list | tuple): The column(s) making up a
+                *unique* key for the table.
+            state (str): Path to the JSON state file in which the
+                high-water mark is stored.
+            where (str, optional): An additional filter to be applied,
+                *without* the ``WHERE`` keyword. Defaults to None.
+            params (dict, optional): Parameter key/value bindings for
+                the ``where`` filter, if applicable. Defaults to None.
+            chunksize (int, optional): Number of rows per chunk.
+                Defaults to 10000.
+            raw (bool, optional): Yield each chunk in 'raw' (tuple)
+                format rather than as a formatted DataFrame. Defaults to
+                True for efficiency.
+
+        :Example:
+
+            Pull the rows changed since the last hourly sync::
+
+                >>> for df in dbi.iter_incremental('orders',
+                                                   watermark_column='updated_at',
+                                                   key_columns=['order_id'],
+                                                   state='/var/lib/sync/state.json',
+                                                   raw=False):
+                        load(df)
+
+        Yields:
+            list | pd.DataFrame: A chunk of (at most) ``chunksize`` rows.
+
+        """
+        try:
+            for chunk, last in self._iter_incremental(table=table,
+                                                      watermark_column=watermark_column,
+                                                      key_columns=key_columns,
+                                                      state=state,
+                                                      where=where,
+                                                      params=params,
+                                                      chunksize=chunksize):
+                # pylint: disable=protected-access  # Row._fields is public API.
+                yield chunk if raw else pd.DataFrame(chunk, columns=chunk[0]._fields)
+                self._state_save(path=state, name=table, values=last)
+        except Exception as err:
+            reporterror(err)
+
+    def iter_query(self,
+                   stmt: str,
+                   params: dict=None,
+                   *,
+                   chunksize: int=10000,
+                   raw: bool=True,
+                   ignore_unsafe: bool=False,
+                   priority: str=None,
+                   raise_errors: bool=False) -> Generator[list | pd.DataFrame]:
+        """Execute a query statement and stream the results in chunks.
+
+        Unlike :meth:`execute_query`, the results are not fetched in
+        full. Rather, the rows are fetched from a server-side cursor
+        (where supported by the driver) and yielded in chunks, so only a
+        single chunk is held in memory at a time.
+
+        Args:
+            stmt (str): Statement to be executed. The parameter bindings
+                are to be written in colon format.
+            params (dict, optional): Parameter key/value bindings as a
+                dictionary, if applicable. Defaults to None.
+            chunksize (int, optional): Number of rows per chunk.
+                Defaults to 10000.
+            raw (bool, optional): Yield each chunk in 'raw' (tuple)
+                format rather than as a formatted DataFrame. Defaults to
+                True for efficiency.
+            ignore_unsafe (bool, optional): Bypass the 'is dangerous'
+                check and the run query anyway. Defaults to False.
+            priority (str, optional): The query's priority class, used
+                by the admission policy. The admission is held until the
+                stream is exhausted (or closed). Defaults to None, which
+                uses the interface's priority.
+            raise_errors (bool, optional): Raise a database error rather
+                than reporting it. Defaults to False.
+
+        :Example:
+
+            Stream a large table into a process, 50,000 rows at a time::
+
+                >>> for df in dbi.iter_query('select * from mytable',
+                                             chunksize=50000,
+                                             raw=False):
+                        process(df)
+
+        Yields:
+            list | pd.DataFrame: A chunk of (at most) ``chunksize`` rows.
+
+        """
+        try:
+            if ignore_unsafe or not self._is_dangerous(stmt=stmt):
+                with self._connect(read=True, priority=priority) as conn:
+                    yield from self._stream(conn=conn,
+                                            stmt=stmt,
+                                            params=params,
+                                            chunksize=chunksize,
+                                            raw=raw)
+        except SecurityWarning:
+            print(traceback.format_exc())
+        except AdmissionError:
+            raise
+        except Exception as err:
+            if raise_errors:
+                raise
+            reporterror(err)
+
+    def parallel_extract(self,
+                         table: str,
+                         partition_column: str,
+                         n_partitions: int,
+                         sink: callable | queue.Queue | str,
+                         *,
+                         method: str='minmax',
+                         chunksize: int=10000,
+                         max_workers: int=None,
+                         raw: bool=True) -> list[int | None]:
+        """Extract a table by concurrently streaming range partitions.
+
+        The table is split into ``n_partitions`` ranges on the partition
+        column. Each range is queried over its own pooled connection, and
+        streamed into the sink in chunks of ``chunksize`` rows.
+
+        Memory is bounded to (roughly) ``max_workers * chunksize`` rows,
+        as each worker holds a single chunk at a time. If the sink is a
+        bounded ``queue.Queue``, a full queue blocks the workers until
+        the consumer catches up.
+
+        Args:
+            table (str): Name of the table to be extracted.
+            partition_column (str): Name of the (preferably indexed)
+                column on which the table is partitioned.
+            n_partitions (int): Number of partitions to create.
+            sink (callable | queue.Queue | str): Destination of the
+                data. One of:
+
+                    - A callable, called as ``sink(part, chunk)``. The
+                      calls are serialised, so the callable need not be
+                      thread-safe.
+                    - A ``queue.Queue``, onto which ``(part, chunk)``
+                      tuples are put, followed by a ``(part, None)``
+                      sentinel once each partition is complete.
+                    - A directory path, into which a Parquet file is
+                      written for each partition. (Requires ``pyarrow``)
+
+            method (str, optional): Method used to compute the partition
+                boundaries. Options are:
+
+                    - ``'minmax'``: Equal-width ranges between the
+                      column's min and max values. Numeric columns only.
+                    - ``'quantile'``: Equal-count ranges, computed using
+                      the ``NTILE`` window function. Use for skewed or
+                      non-numeric columns.
+
+                Defaults to 'minmax'.
+            chunksize (int, optional): Number of rows per chunk.
+                Defaults to 10000.
+            max_workers (int, optional): Number of concurrent workers.
+                Defaults to None, which uses the lesser of the number of
+                partitions and the connection pool size (or
+                ``_MAX_WORKERS``, if the pool has no fixed size). An
+                interface served by a single, shared connection (e.g. a
+                private in-memory SQLite database) always extracts the
+                partitions serially.
+            raw (bool, optional): Pass each chunk to the sink in 'raw'
+                (tuple) format rather than as a DataFrame. Defaults to
+                True.
+
+        Note:
+            Rows with a NULL partition column value are included in the
+            first partition.
+
+        :Example:
+
+            Extract a table into 16 Parquet files, using 8 connections::
+
+                >>> dbi.parallel_extract('mytable',
+                                         partition_column='id',
+                                         n_partitions=16,
+                                         sink='/path/to/output',
+                                         max_workers=8)
+                [31250000, 31250000, ...]
+
+        Raises:
+            sqlalchemy.exc.SQLAlchemyError: If the partition boundaries
+                cannot be computed; for example, if the table does not
+                exist.
+
+        Returns:
+            list[int | None]: The number of rows extracted for each
+            partition. If a partition fails, the error is reported and
+            None is returned for that partition.
+
+        """
+        sink = make_sink(sink=sink, stem=table)
+        col = self._engine.dialect.identifier_preparer.quote(partition_column)
+        edges = self._partition_edges(table=table, column=col, n=n_partitions, method=method)
+        stmts = []
+        base = f'SELECT * FROM {table} WHERE '
+        bounds = [None, *edges, None]
+        for i, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+            conds, params = [], {}
+            if lo is not None:
+                conds.append(f'{col} > :_lo')
+                params['_lo'] = lo
+            if hi is not None:
+                conds.append(f'{col} <= :_hi')
+                params['_hi'] = hi
+            where = ' AND '.join(conds) or '1 = 1'
+            if i == 0:
+                where = f'({where}) OR {col} IS NULL'
+            stmts.append((base + where, params))
+        if isinstance(self._engine.pool, sa.pool.StaticPool):
+            # A single connection is shared by every checkout; which must
+            # not be used by concurrent threads.
+            max_workers = 1
+        elif not max_workers:
+            size = getattr(self._engine.pool, 'size', None)
+            max_workers = min(len(stmts), size() if size else self._MAX_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futs = [pool.submit(self._extract_partition,
+                                part=i,
+                                stmt=stmt,
+                                params=params,
+                                sink=sink,
+                                chunksize=chunksize,
+                                raw=raw)
+                    for i, (stmt, params) in enumerate(stmts)]
+            return [f.result() for f in futs]
+
+    def paginate(self,
+                 table: str,
+                 key_columns: list | tuple,
+                 page_size: int=1000,
+                 where: str=None,
+                 *,
+                 params: dict=None,
+                 token: str=None,
+                 raw: bool=True) -> Generator[tuple[list | pd.DataFrame, str]]:
+        """Walk a table in pages, using keyset (seek) pagination.
+
+        Rather than using ``LIMIT/OFFSET``, which must scan (and discard)
+        every preceding row on each call, each page is collected by
+        seeking *past* the key of the last row of the previous page.
+        Provided the key columns are indexed, each page costs the same
+        regardless of its depth into the table.
+
+        Args:
+            table (str): Name of the table to be paginated.
+            key_columns (list | tuple): The column(s) making up a
+                *unique* key for the table, in sort order. For example,
+                the primary key column(s).
+            page_size (int, optional): Number of rows per page.
+                Defaults to 1000.
+            where (str, optional): An additional filter to be applied
+                to the table, *without* the ``WHERE`` keyword. The bind
+                parameters are to be written in colon format, with the
+                values passed via ``params``. Defaults to None.
+            params (dict, optional): Parameter key/value bindings for
+                the ``where`` filter, if applicable. Defaults to None.
+            token (str, optional): A cursor token, as yielded alongside
+                a page, from which the pagination is to be resumed.
+                Defaults to None, which starts from the first page.
+            raw (bool, optional): Return each page in 'raw' (tuple)
+                format rather than as a formatted DataFrame. Defaults to
+                True for efficiency.
+
+        :Example:
+
+            Walk a table in pages of 10,000 rows, saving the token
+            after each page is processed::
+
+                >>> for page, token in dbi.paginate('mytable',
+                                                    key_columns=['id'],
+                                                    page_size=10000):
+                        process(page)
+                        save(token)
+
+            Resume the walk from a saved token::
+
+                >>> for page, token in dbi.paginate('mytable',
+                                                    key_columns=['id'],
+                                                    page_size=10000,
+                                                    token=load()):
+                        ...
+
+        Raises:
+            sqlalchemy.exc.SQLAlchemyError: If a page's query fails (e.g.
+                the table does not exist); rather than the failure being
+                reported and the pagination ending as if complete.
+
+        Yields:
+            tuple[list | pd.DataFrame, str]: A tuple containing the page
+            of data and the cursor token which resumes the pagination
+            from the *following* page, as::
+
+                (page, token)
+
+        """
+        # pylint: disable=protected-access  # Row._fields/_mapping are public API.
+        params = dict(params or {})
+        cols = [self._engine.dialect.identifier_preparer.quote(c) for c in key_columns]
+        order = ', '.join(cols)
+        last = self._token_decode(token=token) if token else None
+        while True:
+            filters = [f'({where})'] if where else []
+            if last is not None:
+                filters.append(f'({self._keyset_predicate(columns=cols)})')
+                params.update({f'_pg_k{i}': v for i, v in enumerate(last)})
+            stmt = self._select_limited(table=table,
+                                        where=' AND '.join(filters),
+                                        order_by=order,
+                                        n=page_size)
+            rows = self.execute_query(stmt, params=params, raw=True, raise_errors=True)
+            if not rows:
+                return
+            fields = {f.lower(): f for f in rows[-1]._fields}
+            last = [rows[-1]._mapping[fields.get(c.lower(), c)] for c in key_columns]
+            token = self._token_encode(values=last)
+            yield (rows if raw else pd.DataFrame(rows, columns=rows[0]._fields)), token
+            if len(rows) < page_size:
+                return
+
+    @contextlib.contextmanager
+    def transaction(self, priority: str=None) -> Generator[_DBIBase, None, None]:
+        """Run a block of statements as a single unit of work.
+
+        A single connection is checked out and *pinned* to the current
+        thread for the duration of the block. The interface's
+        :meth:`execute_query`, :meth:`iter_query` and
+        ``call_procedure*`` methods, called from this thread within the
+        block, run on the pinned connection and do not commit.
+
+        On leaving the block, the transaction is committed once; or, if
+        an error is raised, rolled back. Within a transaction, errors are
+        *raised* rather than reported, so a failed statement rolls back
+        the whole unit of work.
+
+        Transactions may be nested, in which case the inner block is run
+        within a ``SAVEPOINT``. An error raised by the inner block rolls
+        back to the savepoint only, provided the error is handled by the
+        outer block.
+
+        Note:
+            Operations within a transaction are not retried, as the
+            earlier statements of the transaction would be lost with
+            the connection.
+
+        :Example:
+
+            Insert many rows with a single checkout and COMMIT::
+
+                >>> with dbi.transaction() as tx:
+                        for row in rows:
+                            tx.execute_query(stmt, params=row)
+
+
+            Roll back part of a transaction using a savepoint::
+
+                >>> with dbi.transaction() as tx:
+                        tx.execute_query(stmt1)
+                        try:
+                            with tx.transaction():
+                                tx.execute_query(stmt2)
+                        except Exception:
+                            pass  # stmt2 is rolled back; stmt1 is kept.
+
+        Yields:
+            _DBIBase: This interface object.
+
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            with conn.begin_nested():
+                yield self
+            return
+        with self._admit(priority=priority), self._engine.connect() as conn:
+            self._local.conn = conn
+            try:
+                with conn.begin():
+                    yield self
+            finally:
+                self._local.conn = None
+                self._last_write = time.monotonic()
+
+    def upsert(self,
+               table_name: str,
+               data: pd.DataFrame | list[dict],
+               keys: list | str,
+               *,
+               update: list=None,
+               database_name: str=None,
+               chunksize: int=10000,
+               priority: str=None) -> dict:
+        """Insert new rows into a table, and update existing rows, in bulk.
+
+        The rows are bulk-loaded into a temporary *staging* table, in
+        batches of ``chunksize`` rows. Then a single set-based statement
+        merges the staging table into the target table. The statement is
+        database-specific:
+
+            - MSSQL and Oracle: ``MERGE``
+            - MySQL: ``INSERT ... ON DUPLICATE KEY UPDATE``
+            - SQLite: ``INSERT ... ON CONFLICT DO UPDATE``
+
+        The load and merge are run within a single :meth:`transaction`,
+        so the upsert either succeeds or fails as a whole.
+
+        Args:
+            table_name (str): Name of the target table.
+            data (pd.DataFrame | list[dict]): The rows to be upserted,
+                as a DataFrame, or a list of dictionaries keyed by
+                column name. The column names must match the target
+                table's.
+            keys (list | str): The column(s) identifying a row. The
+                target table must have a primary key, or a unique
+                constraint, on these columns. The keys must be unique
+                within ``data``.
+            update (list, optional): The columns updated for an
+                existing row. Defaults to None, which updates all
+                non-key columns. If empty, existing rows are left
+                unchanged.
+            database_name (str, optional): Database (or schema) of the
+                target table. Defaults to None.
+            chunksize (int, optional): Number of rows loaded into the
+                staging table per batch. Defaults to 10000.
+            priority (str, optional): The upsert's priority class, used
+                by the admission policy. Defaults to None.
+
+        :Example:
+
+            Upsert a DataFrame of prices, keyed on the product ID::
+
+                >>> counts = dbi.upsert('prices', df, keys=['product_id'])
+                >>> counts
+                {'inserted': 120, 'updated': 9880}
+
+        Raises:
+            ValueError: If a key or update column is not found in the
+                data.
+
+        Returns:
+            dict: The number of rows inserted, and the number of
+            existing rows matched (and therefore updated) as::
+
+                {'inserted': int, 'updated': int}
+
+        """
+        # pylint: disable=too-many-locals
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        if isinstance(data, pd.DataFrame):
+            columns = list(data.columns)
+            # Object dtype converts the values to Python types, and NaN to None.
+            rows = list(data.astype(object)
+                        .where(data.notna(), None)
+                        .itertuples(index=False, name=None))
+        else:
+            columns = list(data[0]) if data else []
+            rows = [tuple(row[c] for c in columns) for row in data]
+        if not rows:
+            return {'inserted': 0, 'updated': 0}
+        update = [c for c in columns if c not in keys] if update is None else list(update)
+        if missing := set(keys + update).difference(columns):
+            raise ValueError(f'Column(s) not found in the data: {sorted(missing)}')
+        quote = self._engine.dialect.identifier_preparer.quote
+        target = self._qualified_name(table_name=table_name, database_name=database_name)
+        cols = [quote(c) for c in columns]
+        staging, create, drop = self._staging_table(target=target, columns=cols)
+        binds = ', '.join(f':up_{i}' for i in range(len(cols)))
+        load = sa.text(f'INSERT INTO {staging} ({", ".join(cols)}) VALUES ({binds})')
+        match = ' AND '.join(f'tgt.{quote(k)} = src.{quote(k)}' for k in keys)
+        count = sa.text(f'SELECT COUNT(*) FROM {staging} src '
+                        f'WHERE EXISTS (SELECT 1 FROM {target} tgt WHERE {match})')
+        merge = sa.text(self._upsert_stmt(target=target,
+                                          staging=staging,
+                                          columns=cols,
+                                          keys=[quote(k) for k in keys],
+                                          update=[quote(c) for c in update]))
+        with self.transaction(priority=priority):
+            conn = self._local.conn
+            conn.execute(sa.text(create))
+            for i in range(0, len(rows), chunksize):
+                conn.execute(load, [{f'up_{j}': v for j, v in enumerate(row)}
+                                    for row in rows[i:i+chunksize]])
+            matched = conn.execute(count).scalar()
+            conn.execute(merge)
+            if drop:
+                conn.execute(sa.text(drop))
+        return {'inserted': len(rows) - matched, 'updated': matched}
+
+    def _acquire_engine(self, connstr: str) -> sa.engine.base.Engine:
+        """Acquire an engine for the given connection string.
+
+        If the engine is shareable, it is acquired from the process-wide
+        engine registry, and released when the interface is closed or
+        garbage collected. Otherwise, a new engine is created, and
+        disposed when the interface is closed or garbage collected.
+
+        Args:
+            connstr (str): The connection string; either the primary's,
+                or a replica's.
+
+        Returns:
+            sa.engine.base.Engine: The engine.
+
+        """
+        # The finalizers must not reference the instance.
+        if not self._shareable():
+            engine = self._create_engine(connstr=connstr)
+            self._finalizers.append(weakref.finalize(self, engine.dispose))
+            return engine
+        key = self._engine_key(connstr=connstr)
+        engine = _REGISTRY.acquire(key=key,
+                                   factory=functools.partial(self._create_engine, connstr=connstr))
+        self._finalizers.append(weakref.finalize(self, _REGISTRY.release, key))
+        return engine
+
+    def _admit(self, priority: str=None) -> contextlib.AbstractContextManager:
+        """Admit a unit of work per the interface's admission policy.
+
+        Args:
+            priority (str, optional): The unit of work's priority class.
+                Defaults to None, which uses the interface's priority.
+
+        Returns:
+            contextlib.AbstractContextManager: A context manager which
+            holds the admission for the block; or, if no admission
+            policy is set, a null context.
+
+        """
+        if self._admission is None:
+            return contextlib.nullcontext()
+        return self._admission.admit(priority=priority or self._priority)
+
+    def _block_checksum_stmt(self,
+                             table_name: str,
+                             database_name: str,
+                             key: str,
+                             block_size: int,
+                             where: str) -> str:
+        """Build the statement used to calculate block checksums.
+
+        This method is to be overridden by the database-specific classes,
+        using the database's hashing functions.
+
+        Args:
+            table_name (str): Name of the table.
+            database_name (str): Database (or schema) of the table, or
+                None.
+            key (str): The quoted key column.
+            block_size (int): Key range spanned by each block.
+            where (str): The ``WHERE`` clause (including the keyword),
+                or an empty string.
+
+        Raises:
+            NotImplementedError: If block checksums are not implemented
+                for the database.
+
+        Returns:
+            str: A statement returning a
+            ``(block, min_key, max_key, row_count, checksum)`` row for
+            each block.
+
+        """
+        # pylint: disable=unused-argument  # Implemented by the subclasses.
+        raise NotImplementedError('Block checksums are not implemented for this database.')
+
+    def _block_checksums(self,
+                         table_name: str,
+                         key_column: str,
+                         block_size: int,
+                         database_name: str=None,
+                         ranges: list=None) -> dict[int, tuple]:
+        """Calculate the block checksums, optionally within key ranges.
+
+        Args:
+            table_name (str): Name of the table.
+            key_column (str): Name of the integer key column.
+            block_size (int): Key range spanned by each block.
+            database_name (str, optional): Database (or schema) of the
+                table. Defaults to None.
+            ranges (list, optional): A list of inclusive
+                ``(min_key, max_key)`` ranges to which the calculation
+                is restricted. A None bound is open-ended. Defaults to
+                None, for the full table.
+
+        Returns:
+            dict[int, tuple]: A dictionary of
+            ``{block: (min_key, max_key, row_count, checksum)}`` items.
+
+        """
+        key = self._engine.dialect.identifier_preparer.quote(key_column)
+        conds, params = [], {}
+        for i, (lo, hi) in enumerate(ranges or []):
+            bounds = []
+            if lo is not None:
+                bounds.append(f'{key} >= :_lo{i}')
+                params[f'_lo{i}'] = lo
+            if hi is not None:
+                bounds.append(f'{key} <= :_hi{i}')
+                params[f'_hi{i}'] = hi
+            conds.append(f'({" AND ".join(bounds)})')
+        where = f'WHERE {" OR ".join(conds)}' if conds else ''
+        stmt = self._block_checksum_stmt(table_name=table_name,
+                                         database_name=database_name,
+                                         key=key,
+                                         block_size=int(block_size),
+                                         where=where)
+        # A table which cannot be read must not appear to have no blocks.
+        rows = self.execute_query(stmt, params=params, raise_errors=True)
+        return {int(r[0]): tuple(r[1:]) for r in rows}
+
+    def _check_backend(self, backend: str) -> str:
+        """Verify a DataFrame backend is valid, and its library available.
+
+        Args:
+            backend (str): Name of the backend.
+
+        Raises:
+            ValueError: If the backend is not supported.
+            ModuleNotFoundError: If the backend's library is not
+                installed.
+
+        Returns:
+            str: The name of the backend.
+
+        """
+        if backend not in self._BACKENDS:
+            raise ValueError(f'Invalid backend: {backend}. Expected one of: {tuple(self._BACKENDS)}.')
+        library = self._BACKENDS[backend]
+        if not utils.testimport(library, verbose=False):
+            raise ModuleNotFoundError(f'The {library} library is required for the {backend} backend.')
+        return backend
+
+    @contextlib.contextmanager
+    def _connect(self,
+                 read: bool=False,
+                 priority: str=None) -> Generator[sa.engine.base.Connection, None, None]:
+        """Provide a connection for a unit of work.
+
+        If the current thread is within a :meth:`transaction` block, the
+        transaction's pinned connection is provided, and is left open.
+        Otherwise, the unit of work is admitted per the admission policy
+        (see :meth:`_admit`), then a connection is checked out of the
+        pool (of a replica, per :meth:`_route`, if this is a read), and
+        returned to the pool on exit.
+
+        Args:
+            read (bool, optional): The unit of work only reads, and may
+                be routed to a replica. Otherwise, the unit of work is
+                treated as a write, which opens the read-your-writes
+                window. Defaults to False.
+            priority (str, optional): The unit of work's priority class.
+                Defaults to None, which uses the interface's priority.
+
+        Yields:
+            sa.engine.base.Connection: The connection.
+
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+        with self._admit(priority=priority):
+            idx = self._route() if read else None
+            if idx is not None:
+                try:
+                    with self._replicas[idx].connect() as conn:
+                        yield conn
+                finally:
+                    with self._route_lock:
+                        self._outstanding[idx] -= 1
+                return
+            try:
+                with self._engine.connect() as conn:
+                    yield conn
+            finally:
+                if not read:
+                    self._last_write = time.monotonic()
+
+    def _create_engine(self, connstr: str, **kwargs) -> sa.engine.base.Engine:
+        """Create a database engine using the provided environment.
+
+        Args:
+            connstr (str): The connection string; either the primary's,
+                or a replica's.
+            **kwargs (object): Additional (dialect-specific) keyword
+                arguments passed into ``sqlalchemy.create_engine``.
+
+        Returns:
+            sqlalchemy.engine.base.Engine: A sqlalchemy database engine
+            object.
+
+        """
+        # The pool_* arguments to prevent MySQL timeout which causes
+        # a broken pipe and lost connection errors.
+        return sa.create_engine(url=connstr,
+                                poolclass=sa.pool.QueuePool,
+                                pool_size=20,
+                                pool_recycle=3600,
+                                pool_timeout=30,
+                                pool_pre_ping=True,
+                                max_overflow=0,
+                                **kwargs)
+
+    def _drill_blocks(self,
+                      table_name: str,
+                      other_table: str,
+                      key_column: str,
+                      database_name: str,
+                      other_database: str,
+                      lo: int,
+                      hi: int,
+                      block_size: int,
+                      min_block_size: int) -> list[tuple]:
+        """Drill into a mismatched block to locate the differing ranges.
+
+        The block's key range is compared in sub-blocks of 1/16th of the
+        block size, recursing into each mismatched sub-block until the
+        minimum block size is reached.
+
+        Args:
+            table_name (str): Name of the source table.
+            other_table (str): Name of the other table.
+            key_column (str): Name of the integer key column.
+            database_name (str): Database (or schema) of the source
+                table.
+            other_database (str): Database (or schema) of the other
+                table.
+            lo (int): Smallest key of the mismatched block.
+            hi (int): Largest key of the mismatched block.
+            block_size (int): Size of the mismatched block.
+            min_block_size (int): Block size at which to stop drilling.
+
+        Returns:
+            list[tuple]: A list of ``(min_key, max_key)`` ranges which
+            differ.
+
+        """
+        if block_size <= min_block_size:
+            return [(lo, hi)]
+        size = max(min_block_size, block_size // 16)
+        kwargs = {'key_column': key_column, 'block_size': size, 'ranges': [(lo, hi)]}
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            f1 = pool.submit(self._block_checksums,
+                             table_name=table_name,
+                             database_name=database_name,
+                             **kwargs)
+            f2 = pool.submit(self._block_checksums,
+                             table_name=other_table,
+                             database_name=other_database,
+                             **kwargs)
+            src, dst = f1.result(), f2.result()
+        diffs = []
+        for blk in sorted(set(src) | set(dst)):
+            a, b = src.get(blk), dst.get(blk)
+            if not (a and b and a[2:] == b[2:]):
+                diffs.extend(self._drill_blocks(table_name=table_name,
+                                                other_table=other_table,
+                                                key_column=key_column,
+                                                database_name=database_name,
+                                                other_database=other_database,
+                                                lo=max(lo, blk * size),
+                                                hi=min(hi, (blk + 1) * size - 1),
+                                                block_size=size,
+                                                min_block_size=min_block_size))
+        return diffs
+
+    def _engine_key(self, connstr: str) -> tuple:
+        """Build an engine's registry key.
+
+        The key is made of the normalised connection URL and the engine
+        options (per :meth:`_engine_options`). The URL's driver and host
+        names are lower-cased, and the query parameters are sorted.
+
+        Args:
+            connstr (str): The engine's connection string.
+
+        Returns:
+            tuple: The registry key.
+
+        """
+        url = sa.engine.make_url(connstr)
+        url = url.set(drivername=url.drivername.lower(),
+                      host=url.host.lower() if url.host else url.host,
+                      query=dict(sorted(url.query.items())))
+        options = tuple(sorted((k, repr(v)) for k, v in self._engine_options().items()))
+        return (type(self).__name__, url.render_as_string(hide_password=False), options)
+
+    def _engine_options(self) -> dict:
+        """Return the interface options which affect the engine.
+
+        Interfaces share an engine only if these options are equal. This
+        method is overridden by the database-specific classes which
+        configure their engines.
+
+        Returns:
+            dict: The engine options.
+
+        """
+        return {}
+
+    def _execute(self,
+                 stmt: str,
+                 params: dict,
+                 raw: bool,
+                 commit: bool,
+                 timeout: float=None,
+                 read: bool=False,
+                 priority: str=None,
+                 output: str=None,
+                 flat: bool=False,
+                 backend: str='pandas',
+                 budget: MemoryBudget=None) -> list | dict | np.ndarray | pd.DataFrame | SpilledResult | None:
+        """Execute a statement on a new connection.
+
+        This is the worker method for :meth:`execute_query`.
+
+        Args:
+            stmt (str): Statement to be executed.
+            params (dict): Parameter key/value bindings, or None.
+            raw (bool): Return raw results rather than a DataFrame.
+            commit (bool): Call COMMIT after the statement.
+            timeout (float, optional): Statement timeout, in seconds.
+                Defaults to None.
+            read (bool, optional): The statement is a read, which may be
+                routed to a replica. Defaults to False.
+            priority (str, optional): The statement's priority class.
+                Defaults to None.
+            output (str, optional): The columnar output mode, per
+                :meth:`_result_to_output`. Defaults to None.
+            flat (bool, optional): For an output mode, return the first
+                column only. Defaults to False.
+            backend (str, optional): The DataFrame backend, per
+                :meth:`_result_to_frame`. Defaults to 'pandas'.
+            budget (MemoryBudget, optional): The memory budget enforced
+                while fetching the results. Defaults to None.
+
+        Returns:
+            list | pd.DataFrame | None: The results, if the statement
+            returns rows. Otherwise, None.
+
+        """
+        rtn = None
+        with self._connect(read=read, priority=priority) as conn:
+            with self._timeout(conn=conn, timeout=timeout):
+                result = conn.execute(sa.text(stmt), params)
+                # ???: Added for SQL Server support (v0.5.0.dev1).
+                #       Does this work for other engines?
+                if result.returns_rows:
+                    if budget is not None:
+                        rtn = self._fetch_budgeted(result=result,
+                                                   budget=budget,
+                                                   raw=raw,
+                                                   output=output,
+                                                   flat=flat,
+                                                   backend=backend)
+                    elif output:
+                        rtn = self._result_to_output(batches=self._iter_batches(result=result),
+                                                     keys=list(result.keys()),
+                                                     output=output,
+                                                     flat=flat)
+                    elif raw:
+                        rtn = result.fetchall()
+                    else:
+                        rtn = self._result_to_frame__cursor(result=result, backend=backend)
+            if commit and not self.in_transaction:
+                conn.commit()
+        return rtn
+
+    def _execute_lazy(self,
+                      stmt: str,
+                      params: dict,
+                      commit: bool,
+                      timeout: float=None,
+                      read: bool=False,
+                      priority: str=None) -> LazyResult | None:
+        """Execute a statement, holding the connection open for a
+        :class:`LazyResult`.
+
+        This is the worker method for :meth:`execute_query`, if the
+        ``lazy`` argument is True. Refer to :meth:`_execute` for the
+        argument descriptions.
+
+        If the statement returns rows, the connection (and the COMMIT,
+        if applicable) is handed to the :class:`LazyResult`, to be
+        released with the result. Otherwise, the connection is released
+        immediately.
+
+        Returns:
+            LazyResult | None: The lazy result, if the statement returns
+            rows. Otherwise, None.
+
+        """
+        stack = contextlib.ExitStack()
+        try:
+            conn = stack.enter_context(self._connect(read=read, priority=priority))
+            with self._timeout(conn=conn, timeout=timeout):
+                result = conn.execute(sa.text(stmt), params)
+            if commit and not self.in_transaction:
+                # Called (in LIFO order) before the connection is released.
+                stack.callback(conn.commit)
+        except BaseException:
+            stack.close()
+            raise
+        if not result.returns_rows:
+            stack.close()
+            return None
+        return LazyResult(result=result, stack=stack, fetch_size=self._FETCH_SIZE)
+
+    def _extract_partition(self, part: int, stmt: str, params: dict, sink, chunksize: int,
+                           raw: bool) -> int | None:
+        """Stream a single partition into the sink.
+
+        This is the worker method for :meth:`parallel_extract`.
+
+        Args:
+            part (int): Index of the partition.
+            stmt (str): The partition's ``SELECT`` statement.
+            params (dict): The partition's boundary parameters.
+            sink (_sinks._Sink): The sink adaptor.
+            chunksize (int): Number of rows per chunk.
+            raw (bool): Pass raw chunks rather than DataFrames.
+
+        Returns:
+            int | None: The number of rows extracted, or None if an
+            error occurred.
+
+        """
+        # pylint: disable=protected-access  # Row._fields is public API.
+        n = 0
+        try:
+            with self._connect(read=True) as conn:
+                for chunk in self._stream(conn=conn,
+                                          stmt=stmt,
+                                          params=params,
+                                          chunksize=chunksize,
+                                          raw=raw):
+                    keys = list(chunk[0]._fields) if raw else list(chunk.columns)
+                    sink.write(part, chunk, keys)
+                    n += len(chunk)
+            return n
+        except Exception as err:
+            reporterror(err)
+            return None
+        finally:
+            sink.close(part)
+
+    def _fetch_budgeted(self,
+                        result: sa.engine.cursor.CursorResult,
+                        budget: MemoryBudget,
+                        raw: bool,
+                        output: str,
+                        flat: bool,
+                        backend: str) -> list | dict | np.ndarray | pd.DataFrame | SpilledResult:
+        """Fetch a ``CursorResult`` object within a memory budget.
+
+        The rows are fetched in batches, and the budget is checked as
+        each batch is fetched. If the budget is exceeded, a
+        :class:`MemoryBudgetError` is raised, or the result is spilled
+        to disk via :meth:`_spill`. Otherwise, the batches are converted
+        into the requested format.
+
+        Args:
+            result (sqlalchemy.engine.cursor.CursorResult): Object to
+                be fetched.
+            budget (MemoryBudget): The memory budget.
+            raw (bool): Return the rows, rather than a DataFrame.
+            output (str): The columnar output mode, or None.
+            flat (bool): For an output mode, return the first column
+                only.
+            backend (str): The DataFrame backend.
+
+        Raises:
+            MemoryBudgetError: If the budget is exceeded, and the budget
+                does not spill.
+
+        Returns:
+            list | dict | np.ndarray | pd.DataFrame | SpilledResult: The
+            results, in the requested format; or as a
+            :class:`SpilledResult`, if spilled.
+
+        """
+        keys = list(result.keys())
+        # Fetch no more than one row beyond the row limit.
+        size = min(self._FETCH_SIZE, budget.max_rows + 1) if budget.max_rows is not None else None
+        batches, rows, nbytes = [], 0, 0
+        for batch in self._iter_batches(result=result, size=size):
+            batches.append(batch)
+            rows += len(batch)
+            nbytes += budget.measure(rows=batch)
+            if budget.exceeded(rows=rows, nbytes=nbytes):
+                if budget.spill:
+                    return self._spill(result=result, keys=keys, batches=batches, budget=budget)
+                raise MemoryBudgetError(f'The result exceeds the memory budget, at {rows} rows '
+                                        f'(~{nbytes} bytes).')
+        if output:
+            return self._result_to_output(batches=batches, keys=keys, output=output, flat=flat)
+        if raw:
+            return [row for batch in batches for row in batch]
+        return self._result_to_frame(batches=batches, columns=keys, backend=backend)
+
+    @staticmethod
+    def _is_dangerous(stmt: str) -> bool:
+        """Perform a dirty security check for injection attempts.
+
+        Args:
+            stmt (str): SQL statement to be potentially executed.
+
+        Raises:
+            SecurityWarning: If there are multiple semi-colons (``;``)
+                in the statement, or any comment delimiters (``--``).
+
+        Returns:
+            bool: False if the checks pass.
+
+        """
+        if stmt.count(';') > 1:
+            msg = 'Multiple statements are disallowed for security reasons.'
+            raise SecurityWarning(msg)
+        if '--' in stmt:
+            msg = 'Comments are not allowed in the statement for security reasons.'
+            raise SecurityWarning(msg)
+        return False
+
+    def _is_read(self, stmt: str) -> bool:
+        """Test if a statement is a read (query) statement.
+
+        Args:
+            stmt (str): The SQL statement.
+
+        Returns:
+            bool: True if the statement starts with a read keyword (e.g.
+            ``SELECT``), contains no write keyword (e.g. ``DELETE``,
+            ``INTO``, ``FOR UPDATE``) and is not a ``PRAGMA`` assignment,
+            otherwise False. The test is deliberately conservative; any
+            doubt routes the statement to the primary.
+
+        """
+        match = self._RE_READ.match(stmt)
+        if not match or self._RE_WRITE.search(stmt):
+            return False
+        return not (match.group(1).lower() == 'pragma' and '=' in stmt)
+
+    def _is_timeout(self, error: Exception) -> bool:
+        """Test if an error was raised by a statement timeout.
+
+        Args:
+            error (Exception): The error raised by the statement.
+
+        Returns:
+            bool: True if the DBAPI error message contains one of the
+            database-specific ``_TIMEOUT_ERRORS`` markers, otherwise
+            False.
+
+        """
+        msg = str(getattr(error, 'orig', None) or error)
+        return any(m in msg for m in self._TIMEOUT_ERRORS)
+
+    def _is_transient(self, error: Exception) -> bool:
+        """Test if an error is transient, and the operation can be retried.
+
+        An error is transient if SQLAlchemy reports the connection was
+        invalidated (i.e. lost), or the DBAPI error message contains one
+        of the database-specific ``_TRANSIENT_ERRORS`` markers.
+
+        Args:
+            error (Exception): The error raised by the operation.
+
+        Returns:
+            bool: True if the error is transient, otherwise False.
+
+        """
+        if getattr(error, 'connection_invalidated', False):
+            return True
+        msg = str(getattr(error, 'orig', None) or error)
+        return any(m in msg for m in self._TRANSIENT_ERRORS)
+
+    def _iter_batches(self,
+                      result: sa.engine.cursor.CursorResult,
+                      size: int=None) -> Generator[list, None, None]:
+        """Iterate over a ``CursorResult`` object in batches.
+
+        Args:
+            result (sqlalchemy.engine.cursor.CursorResult): Object to
+                be fetched.
+            size (int, optional): Number of rows per batch. Defaults to
+                None, which uses :attr:`_FETCH_SIZE`.
+
+        Returns:
+            Generator[list, None, None]: An iterator yielding each
+            (non-empty) batch of rows.
+
+        """
+        return iter(functools.partial(result.fetchmany, size or self._FETCH_SIZE), [])
+
+    def _iter_incremental(self,
+                          table: str,
+                          watermark_column: str,
+                          key_columns: list | tuple,
+                          state: str,
+                          where: str,
+                          params: dict,
+                          chunksize: int) -> Generator[tuple[list, list]]:
+        """Stream the rows beyond the high-water mark.
+
+        This is the worker generator for the :meth:`extract_incremental`
+        and :meth:`iter_incremental` methods. The state is *not* updated
+        by this generator.
+
+        Args:
+            table (str): Name of the table to be extracted.
+            watermark_column (str): Name of the watermark column.
+            key_columns (list | tuple): The unique key column(s).
+            state (str): Path to the JSON state file.
+            where (str): An additional filter, or None.
+            params (dict): Parameter bindings for the filter, or None.
+            chunksize (int): Number of rows per chunk.
+
+        Yields:
+            tuple[list, list]: A chunk of raw rows, and the
+            (watermark, key) values of the chunk's last row, as::
 
-        Important:
-            The following are *not* allowed to be executed by this
-            method:
+                (rows, last)
 
-                - Statements containing multiple semi-colons (``;``).
-                - Statements containing a comment delimiter (``--``).
+        """
+        # pylint: disable=protected-access  # Row._mapping is public API.
+        params = dict(params or {})
+        names = [watermark_column, *key_columns]
+        cols = [self._engine.dialect.identifier_preparer.quote(c) for c in names]
+        filters = [f'({where})'] if where else []
+        hwm = self._state_load(path=state, name=table)
+        if hwm is not None:
+            filters.append(f'({self._keyset_predicate(columns=cols)})')
+            params.update({f'_pg_k{i}': v for i, v in enumerate(hwm)})
+        where = f' WHERE {" AND ".join(filters)}' if filters else ''
+        stmt = f'SELECT * FROM {table}{where} ORDER BY {", ".join(cols)}'
+        with self._connect(read=True) as conn:
+            for chunk in self._stream(conn=conn,
+                                      stmt=stmt,
+                                      params=params,
+                                      chunksize=chunksize,
+                                      raw=True):
+                fields = {f.lower(): f for f in chunk[-1]._fields}
+                yield chunk, [chunk[-1]._mapping[fields.get(c.lower(), c)] for c in names]
 
-            If found, a :class:`SecurityWarning` will be raised by the
-            :meth:`_is_dangerous` method.
+    @staticmethod
+    def _json_decode_hook(obj: dict) -> object:
+        """Restore the values encoded by :meth:`_json_encode_default`.
 
         Args:
-            stmt (str): Statement to be executed. The parameter bindings
-                are to be written in colon format.
-            params (dict, optional): Parameter key/value bindings as a
-                dictionary, if applicable. Defaults to None.
-            raw (bool, optional): Return the data in 'raw' (tuple)
-                format rather than as a formatted DataFrame.
-                Defaults to True for efficiency.
-            flat (bool, optional): Flatten the response. This is useful
-                if the expected response is a collection of *single
-                elements*. If True, this will return a flattened tuple of
-                elements, rather than a list of tuples, as is the default
-                behaviour. Note (1): If true, and the return is a list of
-                multi-value tuples, only the first element in each tuple
-                will be returned. Note (2): This argument should only be
-                used if ``raw=True``. Defaults to False.
-            commit (bool, optional): Call COMMIT after the transaction
-                is complete. Defaults to True (for backwards
-                compatibility).
-            ignore_unsafe (bool, optional): Bypass the 'is dangerous'
-              check and the run query anyway. This may be required if
-              a script contains multiple statements. Defaults to False.
+            obj (dict): A decoded JSON object.
 
-              WARNING: **HC SVNT DRACONES**
+        Returns:
+            object: The restored value, or the object itself if it is
+            not an encoded value.
 
-        If the query did not return results and the ``raw`` argument is
-        False, an empty DataFrame containing the column names only, is
-        returned.
+        """
+        if '__datetime__' in obj:
+            return dt.datetime.fromisoformat(obj['__datetime__'])
+        if '__date__' in obj:
+            return dt.date.fromisoformat(obj['__date__'])
+        if '__bytes__' in obj:
+            return bytes.fromhex(obj['__bytes__'])
+        return obj
 
-        Note:
-            In the SQL query, the bind parameters are specified by name,
-            using the format ``:bind_name``. The ``params`` dictionary
-            argument must contain the associated parameter name/value
-            bindings.
+    @staticmethod
+    def _json_encode_default(obj: object) -> object:
+        """Encode key/watermark values which are not JSON serialisable.
 
-        Warning:
+        Dates and datetimes are stored as tagged ISO strings and bytes
+        (e.g. MSSQL rowversion values) as tagged hex strings, so they can
+        be restored to their original type by :meth:`_json_decode_hook`.
+        Any other value is stored as a string.
 
-            1) Generally, whatever statement is passed into this method
-               **will be executed**, and may have *destructive
-               implications.*
+        Args:
+            obj (object): The value to be encoded.
 
-            2) This method contains a ``commit`` call, and the option to
-               disable the COMMIT.
+        Returns:
+            object: A JSON serialisable representation of the value.
 
-            If a statement is passed into this method, and the user has
-            the appropriate permissions - the change
-            **will be committed**.
+        """
+        if isinstance(obj, dt.datetime):
+            return {'__datetime__': obj.isoformat()}
+        if isinstance(obj, dt.date):
+            return {'__date__': obj.isoformat()}
+        if isinstance(obj, (bytes, bytearray)):
+            return {'__bytes__': bytes(obj).hex()}
+        if hasattr(obj, 'item'):  # NumPy scalars.
+            return obj.item()
+        return str(obj)
 
-            **... HC SVNT DRACONES.**
+    @staticmethod
+    def _keyset_predicate(columns: list) -> str:
+        """Build the seek predicate for keyset pagination.
 
-        Returns:
-            list | pd.DataFrame | None: If the ``raw`` parameter is
-            True, a list of tuples containing values is returned.
-            Otherwise, a ``pandas.DataFrame`` object containing the
-            returned data is returned.
+        The predicate is expanded (rather than using a row-value
+        comparison) as row-values are not supported by all dialects.
+        For example, for keys ``(a, b)`` the predicate is::
 
-            If this method is called with a script which does not return
-            results, for example a CREATE script, None is returned;
-            regardless of the value passed to the ``raw`` parameter.
+            a > :_pg_k0 OR (a = :_pg_k0 AND b > :_pg_k1)
+
+        Args:
+            columns (list): The (quoted) key column names, in order.
+
+        Returns:
+            str: The seek predicate, with bind parameters named
+            ``_pg_k0`` through ``_pg_kN``.
 
         """
-        # pylint: disable=line-too-long     # Kept for clarity.
-        # pylint: disable=no-else-return    # Additional else and return used for clarity.
-        # pylint: disable=no-member         # The error does have a _message member.
-        try:
-            rtn = None
-            # Perform a cursory 'security check.'
-            if ignore_unsafe or not self._is_dangerous(stmt=stmt):
-                with self._engine.connect() as conn:
-                    result = conn.execute(sa.text(stmt), params)
-                    # ???: Added for SQL Server support (v0.5.0.dev1).
-                    #       Does this work for other engines?
-                    if result.returns_rows:
-                        rtn = result.fetchall() if raw else self._result_to_df__cursor(result=result)
-                    if commit:
-                        conn.commit()
-                    conn.close()
-        except SecurityWarning:
-            print(traceback.format_exc())
-        except Exception as err:
-            if 'object does not return rows' not in err._message():
-                reporterror(err)
-        return next(zip(*rtn)) if flat else rtn
+        terms = []
+        for i, col in enumerate(columns):
+            eqs = [f'{c} = :_pg_k{j}' for j, c in enumerate(columns[:i])]
+            terms.append('(' + ' AND '.join([*eqs, f'{col} > :_pg_k{i}']) + ')')
+        return ' OR '.join(terms)
 
-    def _create_engine(self) -> sa.engine.base.Engine:
-        """Create a database engine using the provided environment.
+    def _metric(self, name: str, value: int | float=1):
+        """Increment an instrumentation counter.
 
-        Returns:
-            sqlalchemy.engine.base.Engine: A sqlalchemy database engine
-            object.
+        Args:
+            name (str): Name of the counter.
+            value (int | float, optional): Value to be added to the
+                counter. Defaults to 1.
 
         """
-        # The pool_* arguments to prevent MySQL timeout which causes
-        # a broken pipe and lost connection errors.
-        return sa.create_engine(url=self._connstr,
-                                poolclass=sa.pool.QueuePool,
-                                pool_size=20,
-                                pool_recycle=3600,
-                                pool_timeout=30,
-                                pool_pre_ping=True,
-                                max_overflow=0)
+        with self._metrics_lock:
+            self._metrics[name] = self._metrics.get(name, 0) + value
 
-    @staticmethod
-    def _is_dangerous(stmt: str) -> bool:
-        """Perform a dirty security check for injection attempts.
+    def _partition_edges(self, table: str, column: str, n: int, method: str) -> list:
+        """Compute the inner boundaries used to range-partition a table.
 
         Args:
-            stmt (str): SQL statement to be potentially executed.
+            table (str): Name of the table.
+            column (str): The (quoted) partition column.
+            n (int): Number of partitions.
+            method (str): Either ``'minmax'`` or ``'quantile'``.
 
         Raises:
-            SecurityWarning: If there are multiple semi-colons (``;``)
-                in the statement, or any comment delimiters (``--``).
+            ValueError: If the method is not recognised.
+            sqlalchemy.exc.SQLAlchemyError: If the boundary query fails.
 
         Returns:
-            bool: False if the checks pass.
+            list: The ``n - 1`` (or fewer) sorted, unique inner
+            boundaries. Each partition contains the rows where
+            ``lower < column <= upper``.
 
         """
-        if stmt.count(';') > 1:
-            msg = 'Multiple statements are disallowed for security reasons.'
-            raise SecurityWarning(msg)
-        if '--' in stmt:
-            msg = 'Comments are not allowed in the statement for security reasons.'
-            raise SecurityWarning(msg)
-        return False
+        if method == 'minmax':
+            stmt = f'SELECT MIN({column}), MAX({column}) FROM {table}'
+            lo, hi = self.execute_query(stmt, raise_errors=True)[0]
+            if lo is None:
+                return []
+            step = (hi - lo) / n
+            edges = [lo + step * i for i in range(1, n)]
+        elif method == 'quantile':
+            stmt = (f'SELECT MAX({column}) FROM '
+                    f'(SELECT {column}, NTILE({int(n)}) OVER (ORDER BY {column}) tile '
+                    f'FROM {table} WHERE {column} IS NOT NULL) x '
+                    'GROUP BY tile ORDER BY 1')
+            edges = [r[0] for r in self.execute_query(stmt, raise_errors=True)[:-1]]
+        else:
+            raise ValueError(f'Invalid partition method: {method}')
+        return sorted(set(edges))
+
+    @contextlib.contextmanager
+    def _primary_only(self) -> Generator[None, None, None]:
+        """Route the current thread's reads to the primary, for the
+        duration of the block.
+
+        This is used by operations which must not read stale data from
+        a lagging replica; for example, a backup resuming from the
+        greatest key already copied.
+
+        """
+        prev = getattr(self._local, 'primary', False)
+        self._local.primary = True
+        try:
+            yield
+        finally:
+            self._local.primary = prev
+
+    def _qualified_name(self, table_name: str, database_name: str=None) -> str:
+        """Qualify a table name with its database (or schema) name.
+
+        Args:
+            table_name (str): Name of the table.
+            database_name (str, optional): Name of the database (or
+                schema). Defaults to None.
+
+        Returns:
+            str: The quoted, qualified table name.
+
+        """
+        quote = self._engine.dialect.identifier_preparer.quote
+        if database_name:
+            return f'{quote(database_name)}.{quote(table_name)}'
+        return quote(table_name)
 
     def _report_sa_error(self, msg: str, error: SQLAlchemyError):  # pragma: nocover
         """Report SQLAlchemy error to the terminal.
@@ -319,3 +2831,543 @@ class _DBIBase:
         except Exception as err:
             reporterror(err)
         return df
+
+    @staticmethod
+    def _result_to_frame(batches: Generator[list[tuple], None, None],
+                         columns: list,
+                         backend: str) -> pd.DataFrame | object:
+        """Build a DataFrame (or table) from batches of fetched rows.
+
+        For the polars and Arrow backends, each batch is converted to
+        the backend's columnar format as it is fetched, so the rows are
+        not held as Python tuples beyond a single batch.
+
+        If no rows were fetched, an empty frame containing the column
+        names only, is returned.
+
+        Args:
+            batches (Generator[list[tuple], None, None]): An iterable of
+                row batches.
+            columns (list): The column names.
+            backend (str): The DataFrame backend; ``'pandas'``,
+                ``'polars'`` or ``'arrow'``.
+
+        Returns:
+            pd.DataFrame | polars.DataFrame | pyarrow.Table: The rows
+            as a frame of the backend's type.
+
+        """
+        # pylint: disable=import-outside-toplevel  # Optional dependencies.
+        columns = list(columns)
+        if backend == 'polars':
+            import polars as pl
+            frames = [pl.DataFrame(rows, schema=columns, orient='row') for rows in batches if rows]
+            if not frames:
+                return pl.DataFrame(schema=columns)
+            return pl.concat(frames, how='vertical_relaxed', rechunk=True)
+        if backend == 'arrow':
+            import pyarrow as pa
+            tables = [pa.table([pa.array(c) for c in zip(*rows)], names=columns)
+                      for rows in batches if rows]
+            if not tables:
+                return pa.table({c: pa.array([], type=pa.null()) for c in columns})
+            # The batches' types may differ; e.g. a column of only nulls.
+            return pa.concat_tables(tables, promote_options='permissive').combine_chunks()
+        return pd.DataFrame.from_records([row for rows in batches for row in rows], columns=columns)
+
+    def _result_to_frame__cursor(self,
+                                 result: sa.engine.cursor.CursorResult,
+                                 backend: str) -> pd.DataFrame | object:
+        """Convert a ``CursorResult`` object to a frame of the given backend.
+
+        For the polars and Arrow backends, the rows are fetched in
+        batches of :attr:`_FETCH_SIZE` rows, per :meth:`_result_to_frame`.
+
+        Args:
+            result (sqlalchemy.engine.cursor.CursorResult): Object to
+                be converted.
+            backend (str): The DataFrame backend.
+
+        Returns:
+            pd.DataFrame | polars.DataFrame | pyarrow.Table: The cursor's
+            data.
+
+        """
+        if backend == 'pandas':
+            return self._result_to_df__cursor(result=result)
+        return self._result_to_frame(batches=self._iter_batches(result=result),
+                                     columns=list(result.keys()),
+                                     backend=backend)
+
+    @staticmethod
+    def _result_to_output(batches: Generator[list, None, None],
+                          keys: list,
+                          output: str,
+                          flat: bool) -> list | dict | np.ndarray:
+        """Transpose batches of rows into a columnar format.
+
+        Each batch is transposed into the columns as it is fetched, so
+        the full set of rows is never held in memory at once.
+
+        Args:
+            batches (Generator[list, None, None]): An iterable of row
+                batches; for example, from :meth:`_iter_batches`.
+            keys (list): The column names.
+            output (str): The output mode; ``'columns'``, ``'arrays'``
+                or ``'numpy'``.
+            flat (bool): Return the first column only; as a list for
+                the ``'columns'`` mode, otherwise as a 1-D NumPy array.
+
+        Returns:
+            list | dict | np.ndarray: The columns, as a dictionary of
+            ``{name: values}`` pairs, or as a NumPy structured array.
+            If the ``flat`` argument is True, the first column only.
+
+        """
+        keys = keys[:1] if flat else list(keys)
+        cols = [[] for _ in keys]
+        for rows in batches:
+            for col, values in zip(cols, zip(*rows)):
+                col.extend(values)
+        if output == 'columns':
+            return cols[0] if flat else dict(zip(keys, cols))
+        arrays = [np.array(col) for col in cols]
+        if flat:
+            return arrays[0]
+        if output == 'arrays':
+            return dict(zip(keys, arrays))
+        rec = np.empty(len(arrays[0]) if arrays else 0,
+                       dtype=[(k, a.dtype) for k, a in zip(keys, arrays)])
+        for key, array in zip(keys, arrays):
+            rec[key] = array
+        return rec
+
+    def _route(self) -> int | None:
+        """Select the replica to which a read is routed.
+
+        :Rules:
+
+            - If no replicas are configured, a write was made within
+              the ``read_your_writes`` window, or the current thread is
+              within a :meth:`_primary_only` block, the read is routed
+              to the primary.
+            - For ``'round-robin'`` routing, the replicas are selected
+              in turn.
+            - For ``'least-outstanding'`` routing, the replica with the
+              fewest connections checked out is selected. Ties are
+              broken in turn.
+
+        The selected replica's outstanding count is incremented; the
+        caller must decrement it once the connection is returned.
+
+        Returns:
+            int | None: Index of the selected replica, or None if the
+            read is routed to the primary.
+
+        """
+        if not self._replicas or getattr(self._local, 'primary', False):
+            return None
+        if (self._last_write is not None
+                and time.monotonic() - self._last_write < self._read_your_writes):
+            return None
+        n = len(self._replicas)
+        with self._route_lock:
+            start = next(self._next)
+            order = [(start + i) % n for i in range(n)]
+            if self._routing == 'round-robin':
+                idx = order[0]
+            else:
+                idx = min(order, key=self._outstanding.__getitem__)
+            self._outstanding[idx] += 1
+        return idx
+
+    @staticmethod
+    def _select_limited(table: str, where: str, order_by: str, n: int) -> str:
+        """Build an ordered ``SELECT`` statement returning at most *n* rows.
+
+        This method uses the ``LIMIT`` syntax (MySQL, SQLite) and is
+        to be overridden by the database-specific classes using other
+        syntax.
+
+        Args:
+            table (str): Name of the table to be queried.
+            where (str): The filter, *without* the ``WHERE`` keyword. May
+                be an empty string.
+            order_by (str): The ``ORDER BY`` column list.
+            n (int): Maximum number of rows to be returned.
+
+        Returns:
+            str: The limited ``SELECT`` statement.
+
+        """
+        where = f' WHERE {where}' if where else ''
+        return f'SELECT * FROM {table}{where} ORDER BY {order_by} LIMIT {int(n)}'
+
+    def _shareable(self) -> bool:
+        """Test if the interface's engine can be shared.
+
+        Returns:
+            bool: True if the ``shared`` argument is True. The
+            database-specific classes may add further restrictions.
+
+        """
+        return self._shared
+
+    def _spill(self,
+               result: sa.engine.cursor.CursorResult,
+               keys: list,
+               batches: list,
+               budget: MemoryBudget) -> SpilledResult:
+        """Spill a result to a temporary Arrow IPC file.
+
+        The batches already fetched are written first, and released.
+        Then, the remaining rows are fetched and written one batch at a
+        time, so only a single batch is held in memory.
+
+        Args:
+            result (sqlalchemy.engine.cursor.CursorResult): The
+                partially fetched result.
+            keys (list): The column names.
+            batches (list): The batches already fetched. This list is
+                cleared once written.
+            budget (MemoryBudget): The memory budget, which provides the
+                spill directory.
+
+        Returns:
+            SpilledResult: The spilled result.
+
+        """
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel  # Optional.
+        # The column types are inferred from the batches in memory, and are
+        # promoted if a later batch requires it; for example, if a column
+        # has only held nulls so far.
+        table = self._result_to_frame(batches=batches, columns=keys, backend='arrow')
+        batches.clear()
+        tables = itertools.chain([table],
+                                 (self._result_to_frame(batches=[batch], columns=keys, backend='arrow')
+                                  for batch in self._iter_batches(result=result)))
+        schema, path = table.schema, None
+        try:
+            while True:
+                new, table = self._spill_write(path=path,
+                                               schema=schema,
+                                               tables=tables,
+                                               spill_dir=budget.spill_dir)
+                if path:
+                    os.remove(path)
+                path = new
+                if table is None:
+                    break
+                schema = pa.unify_schemas([schema, table.schema], promote_options='permissive')
+                tables = itertools.chain([table], tables)
+        except Exception:
+            if path:
+                os.remove(path)
+            raise
+        return SpilledResult(path=path)
+
+    @staticmethod
+    def _spill_write(path: str | None,
+                     schema: object,
+                     tables: Generator[object],
+                     spill_dir: str) -> tuple[str, object | None]:
+        """Write tables to a new Arrow IPC spill file, until a table is
+        found whose schema requires the file's schema to be promoted.
+
+        This is the worker method for :meth:`_spill`.
+
+        Args:
+            path (str | None): Path to a previously spilled file, whose
+                batches are copied into the new file first (cast to the
+                schema), or None.
+            schema (pyarrow.Schema): The new file's schema.
+            tables (Generator[pyarrow.Table]): The tables to be written.
+            spill_dir (str): Directory in which the file is created.
+
+        Returns:
+            tuple[str, pyarrow.Table | None]: The path to the new file,
+            and the table requiring a promoted schema; or None if all
+            tables were written, as::
+
+                (path, table)
+
+        """
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel  # Optional.
+        fd, new = tempfile.mkstemp(prefix='dbilib_spill_', suffix='.arrow', dir=spill_dir)
+        os.close(fd)
+        try:
+            with pa.OSFile(new, 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+                if path:
+                    with pa.memory_map(path) as src:
+                        reader = pa.ipc.open_file(src)
+                        for i in range(reader.num_record_batches):
+                            writer.write_table(pa.Table.from_batches([reader.get_batch(i)])
+                                               .cast(schema))
+                for table in tables:
+                    if not table.schema.equals(schema):
+                        if not pa.unify_schemas([schema, table.schema],
+                                                promote_options='permissive').equals(schema):
+                            return new, table
+                        table = table.cast(schema)
+                    writer.write_table(table)
+            return new, None
+        except Exception:
+            os.remove(new)
+            raise
+
+    def _staging_table(self, target: str, columns: list) -> tuple[str, str, str | None]:
+        """Build the statements used to create and drop an upsert's
+        staging table.
+
+        This method uses the ``CREATE TEMPORARY TABLE ... AS`` syntax
+        (MySQL, SQLite) and is to be overridden by the database-specific
+        classes using other syntax. The staging table is given a unique
+        name, as a temporary table lives as long as its (pooled)
+        connection.
+
+        Args:
+            target (str): The qualified name of the target table.
+            columns (list): The quoted columns to be staged.
+
+        Returns:
+            tuple[str, str, str | None]: The name of the staging table,
+            the ``CREATE`` statement and the ``DROP`` statement, as::
+
+                (name, create, drop)
+
+            The ``DROP`` statement is None if the table is dropped by
+            the database on COMMIT.
+
+        """
+        name = f'dbilib_stage_{uuid.uuid4().hex[:16]}'
+        return (name,
+                f'CREATE TEMPORARY TABLE {name} AS SELECT {", ".join(columns)} FROM {target} WHERE 1 = 0',
+                f'DROP TABLE {name}')
+
+    @staticmethod
+    def _state_load(path: str, name: str) -> list | None:
+        """Load a table's high-water mark from the JSON state file.
+
+        Args:
+            path (str): Path to the state file.
+            name (str): Name of the table.
+
+        Returns:
+            list | None: The (watermark, key) values of the last row
+            consumed, or None if no state exists for the table.
+
+        """
+        if not os.path.isfile(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f, object_hook=_DBIBase._json_decode_hook)
+        return state.get(name)
+
+    @staticmethod
+    def _state_save(path: str, name: str, values: list):
+        """Store a table's high-water mark into the JSON state file.
+
+        The file is written to a temporary file and then moved into
+        place, so a failure part-way through a write cannot corrupt the
+        existing state.
+
+        Args:
+            path (str): Path to the state file.
+            name (str): Name of the table.
+            values (list): The (watermark, key) values of the last row
+                consumed.
+
+        """
+        state = {}
+        if os.path.isfile(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        state[name] = json.loads(json.dumps(values, default=_DBIBase._json_encode_default))
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=4)
+        os.replace(tmp, path)
+
+    @contextlib.contextmanager
+    def _statement_timeout(self, conn: sa.engine.base.Connection, timeout: float):
+        """Apply a statement timeout to a connection.
+
+        This context manager is implemented by the database-specific
+        classes, using the database's own cancellation mechanism.
+
+        Args:
+            conn (sa.engine.base.Connection): The connection to which the
+                timeout is applied.
+            timeout (float): The timeout, in seconds.
+
+        Raises:
+            NotImplementedError: Statement timeouts are not supported by
+                this database interface.
+
+        """
+        raise NotImplementedError('Statement timeouts are not supported for this database.')
+        yield  # pylint: disable=unreachable
+
+    @staticmethod
+    def _stream(conn: sa.engine.base.Connection,
+                stmt: str,
+                params: dict,
+                chunksize: int,
+                raw: bool) -> Generator[list | pd.DataFrame]:
+        """Execute a statement and yield the results in chunks.
+
+        Args:
+            conn (sqlalchemy.engine.base.Connection): Connection on which
+                the statement is executed.
+            stmt (str): Statement to be executed.
+            params (dict): Parameter key/value bindings.
+            chunksize (int): Number of rows per chunk.
+            raw (bool): Yield raw chunks rather than DataFrames.
+
+        Yields:
+            list | pd.DataFrame: A chunk of (at most) ``chunksize`` rows.
+
+        """
+        result = conn.execution_options(stream_results=True).execute(sa.text(stmt), params)
+        if result.returns_rows:
+            keys = list(result.keys())
+            for chunk in result.partitions(chunksize):
+                yield chunk if raw else pd.DataFrame(chunk, columns=keys)
+
+    @contextlib.contextmanager
+    def _timeout(self, conn: sa.engine.base.Connection, timeout: float | None):
+        """Run the enclosed statement(s) under a statement timeout.
+
+        If a statement is cancelled by the timeout, the connection is
+        invalidated (via :meth:`_timeout_invalidate`), so it is
+        discarded rather than returned to the pool, and the error is
+        re-raised.
+
+        Args:
+            conn (sa.engine.base.Connection): The connection on which the
+                statement(s) are executed.
+            timeout (float | None): The timeout, in seconds. If None (or
+                zero), no timeout is applied.
+
+        """
+        if not timeout:
+            yield
+            return
+        try:
+            with self._statement_timeout(conn=conn, timeout=timeout):
+                yield
+        except Exception as err:
+            if self._is_timeout(error=err):
+                self._metric('timeouts')
+                self._timeout_invalidate(conn=conn)
+            raise
+
+    def _timeout_invalidate(self, conn: sa.engine.base.Connection):
+        """Invalidate a connection on which a statement timed out.
+
+        Args:
+            conn (sa.engine.base.Connection): The connection.
+
+        """
+        conn.invalidate()
+
+    @staticmethod
+    def _token_decode(token: str) -> list:
+        """Decode a pagination cursor token into its key values.
+
+        Args:
+            token (str): Token, as created by :meth:`_token_encode`.
+
+        Returns:
+            list: The key values of the last row of the previous page.
+
+        """
+        return json.loads(base64.urlsafe_b64decode(token.encode()),
+                          object_hook=_DBIBase._json_decode_hook)
+
+    @staticmethod
+    def _token_encode(values: list) -> str:
+        """Encode the key values of a row into a pagination cursor token.
+
+        Args:
+            values (list): The key values of the last row of a page.
+
+        Returns:
+            str: A URL-safe token which can be persisted and passed back
+            into :meth:`paginate` to resume the pagination.
+
+        """
+        return base64.urlsafe_b64encode(
+            json.dumps(values, default=_DBIBase._json_encode_default).encode()
+        ).decode()
+
+    @staticmethod
+    def _upsert_stmt(target: str, staging: str, columns: list, keys: list, update: list) -> str:
+        """Build the statement which merges the staging table into the
+        target table.
+
+        This method uses the ANSI ``MERGE`` syntax (Oracle) and is to
+        be overridden by the database-specific classes using other
+        syntax.
+
+        Args:
+            target (str): The qualified name of the target table.
+            staging (str): The name of the staging table.
+            columns (list): The quoted columns to be inserted.
+            keys (list): The quoted key columns.
+            update (list): The quoted columns to be updated for an
+                existing row. If empty, existing rows are not updated.
+
+        Returns:
+            str: The ``MERGE`` statement.
+
+        """
+        match = ' AND '.join(f'tgt.{k} = src.{k}' for k in keys)
+        sets = ', '.join(f'tgt.{c} = src.{c}' for c in update)
+        matched = f' WHEN MATCHED THEN UPDATE SET {sets}' if update else ''
+        return (f'MERGE INTO {target} tgt USING {staging} src ON ({match}){matched} '
+                f'WHEN NOT MATCHED THEN INSERT ({", ".join(columns)}) '
+                f'VALUES ({", ".join(f"src.{c}" for c in columns)})')
+
+    def _with_retry(self, func: callable, *args, idempotent__: bool=True, **kwargs) -> object:
+        """Call a function, retrying on transient errors per the retry policy.
+
+        The function is retried only if a retry policy is set, the
+        operation is idempotent (or the policy retries writes), the
+        error is transient, and the retries are not exhausted.
+        Otherwise, the error is raised to the caller.
+
+        Args:
+            func (callable): The function to be called. The function
+                must be *complete*; i.e. it must open (and close) its own
+                connection, so a retry starts afresh.
+            *args (object): Positional arguments passed to the function.
+            idempotent__ (bool, optional): The operation is safe to be
+                retried. (Named to avoid clashing with the function's
+                keyword arguments.) Defaults to True.
+            **kwargs (object): Keyword arguments passed to the function.
+
+        Returns:
+            object: The function's return value.
+
+        """
+        policy = self._retry
+        attempt = 0
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as err:
+                if (policy is None
+                        or self.in_transaction
+                        or not (idempotent__ or policy.retry_writes)
+                        or not self._is_transient(error=err)):
+                    raise
+                if attempt >= policy.retries:
+                    self._metric('retries_exhausted')
+                    raise
+                delay = policy.delay(attempt=attempt)
+                attempt += 1
+                self._metric('retries')
+                if policy.on_retry:
+                    policy.on_retry(attempt, delay, err)
+                time.sleep(delay)
@@ -24,7 +24,11 @@
 
 from __future__ import annotations
 
+import contextlib
+import math
 import sqlalchemy as sa
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy.exc import SQLAlchemyError
 from utils4.reporterror import reporterror
 from utils4.user_interface import ui
@@ -82,6 +86,11 @@ class _DBIMSSQL(_DBIBase):
 
     """
 
+    # Deadlock victim, serialisation failure, communication link failure.
+    _TRANSIENT_ERRORS = ('(1205)', '40001', '08S01')
+    # Query timeout expired.
+    _TIMEOUT_ERRORS = ('HYT00',)
+
     # The __init__ method is implemented in the parent class.
 
     def backup(self, table_name: str, verbose: bool=True) -> ExitCode:
@@ -118,15 +127,103 @@ class _DBIMSSQL(_DBIBase):
         """
         bkdb = f'__bak__{self.database_name}'
         s1, s2, s3 = False, False, False
-        s1 = self.table_exists(table_name=table_name, verbose=verbose)
-        if s1: s2 = self.database_exists(database_name=bkdb, verbose=verbose)
-        if s2: s3 = self._backup(table_name=table_name, bkdb_name=bkdb)
+        # A lagging replica must not be read for the copy or its verification.
+        with self._primary_only():
+            s1 = self.table_exists(table_name=table_name, verbose=verbose)
+            if s1: s2 = self.database_exists(database_name=bkdb, verbose=verbose)
+            if s2: s3 = self._backup(table_name=table_name, bkdb_name=bkdb)
         if verbose: self._print_summary(success=all((s1, s2, s3)))
         if not s1: return ExitCode.ERR_BKUP_TBNEX
         if not s2: return ExitCode.ERR_BKUP_DBNEX
         if not s3: return ExitCode.ERR_BKUP_CKSUM
         return ExitCode.OK
 
+    def backup_many(self,
+                    tables: list | tuple,
+                    max_workers: int=4,
+                    *,
+                    key_columns: dict=None,
+                    chunk_rows: int=1000000,
+                    resume: bool=False,
+                    verbose: bool=True) -> dict[str, ExitCode]:
+        """Backup many tables to the backup database, concurrently.
+
+        Each table is backed up on its own worker, using the same
+        checks and verification as the :meth:`backup` method. However,
+        the source and backup checksums are calculated concurrently,
+        and the backup database's existence is tested only once.
+
+        :Chunked Copies:
+
+            Tables having more than ``chunk_rows`` rows, and a
+            single-column key (either the primary key, or as provided
+            via the ``key_columns`` argument), are copied in key-range
+            chunks of ``chunk_rows`` rows. Each chunk is committed
+            independently, so if the run is interrupted, it can be
+            continued by calling this method again with
+            ``resume=True``. Smaller tables are copied using a single
+            ``SELECT * INTO`` statement.
+
+        Args:
+            tables (list | tuple): Names of the tables to be backed up.
+            max_workers (int, optional): Number of tables to be backed
+                up concurrently. As each worker uses two connections
+                while verifying, this value is capped at half the
+                connection pool size. Defaults to 4.
+            key_columns (dict, optional): A dictionary of
+                ``{table_name: key_column}`` pairs, for tables whose
+                chunking key is not the primary key. Defaults to None.
+            chunk_rows (int, optional): Row count above which a table is
+                copied in chunks, and the number of rows per chunk.
+                Defaults to 1000000.
+            resume (bool, optional): Continue a chunked copy from the
+                greatest key already in the backup table, rather than
+                starting over. Defaults to False.
+            verbose (bool, optional): Display the status of each table's
+                backup. Defaults to True.
+
+        .. important::
+            As with the :meth:`backup` method, the backup database
+            **must** exist.
+
+        :Example:
+
+            Backup the release tables, four at a time::
+
+                >>> dbi.backup_many(['customers', 'orders', 'items'])
+                {'customers': <ExitCode.OK: 0>,
+                 'orders': <ExitCode.OK: 0>,
+                 'items': <ExitCode.ERR_BKUP_TBNEX: 110>}
+
+        Returns:
+            dict[str, ExitCode]: A dictionary of ``{table_name: ExitCode}``
+            pairs, reporting the status of each table's backup.
+
+        """
+        bkdb = f'__bak__{self.database_name}'
+        key_columns = key_columns or {}
+        if not self.database_exists(database_name=bkdb, verbose=verbose):
+            report = dict.fromkeys(tables, ExitCode.ERR_BKUP_DBNEX)
+        else:
+            max_workers = max(1, min(max_workers, self._engine.pool.size() // 2))
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futs = {t: pool.submit(self._backup_one,
+                                       table_name=t,
+                                       bkdb_name=bkdb,
+                                       key_column=key_columns.get(t),
+                                       chunk_rows=chunk_rows,
+                                       resume=resume,
+                                       verbose=verbose)
+                        for t in tables}
+                report = {t: f.result() for t, f in futs.items()}
+        if verbose:
+            for table, code in report.items():
+                if code == ExitCode.OK:
+                    ui.print_normal(f'Table backup successful: {table}')
+                else:
+                    ui.print_warning(f'Table backup failed: {table} ({code.name})')
+        return report
+
     # pylint: disable=line-too-long
     def call_procedure(self,
                        proc: str,
@@ -134,7 +231,9 @@ class _DBIMSSQL(_DBIBase):
                        params: dict | tuple=None,
                        paramnames: list | tuple=None,
                        raw: bool=True,
-                       return_status: bool=False) -> pd.DataFrame | tuple[pd.DataFrame | tuple, bool]:  # noqa  # pylint: disable=undefined-variable
+                       return_status: bool=False,
+                       timeout: float=None,
+                       backend: str=None) -> pd.DataFrame | tuple[pd.DataFrame | tuple, bool]:  # noqa  # pylint: disable=undefined-variable
         """Call a stored procedure, and return as a DataFrame.
 
         Args:
@@ -154,6 +253,13 @@ class _DBIMSSQL(_DBIBase):
                 for efficiency.
             return_status (bool, optional): Return the method's success
                 status. Defaults to False.
+            timeout (float, optional): Cancel the procedure if it has
+                not completed within this number of seconds, via the
+                ODBC query timeout. Defaults to None.
+            backend (str, optional): The DataFrame library used if
+                ``raw=False``; ``'pandas'``, ``'polars'`` or
+                ``'arrow'``. Defaults to None, which uses the
+                interface's backend.
 
         Returns:
             pd.DataFrame | tuple[pd.DataFrame | tuple, bool]:
@@ -166,27 +272,30 @@ class _DBIMSSQL(_DBIBase):
 
         """
         # pylint: disable=consider-using-f-string  # No, need the formatter.
+        backend = self._check_backend(backend=backend or self._backend)
         data = None
         success = False
         try:
             # Collect parameter names for the EXEC call if not provided.
             if not paramnames:
                 paramnames = self.get_parameter_names(proc=proc)
-            paramdef = ', '.join(map(':{}'.format, paramnames))
-            with self.engine.connect() as con:
-                resp = con.execute(sa.text(f'EXEC {proc} {paramdef}'), params)
-                if resp.returns_rows:
-                    if raw:
-                        data = resp.fetchall()
-                        success = bool(data)
-                    else:
-                        data = self._result_to_df__cursor(result=resp)
-                        success = not data.empty
-                con.close()
+            data = self._with_retry(self._exec_proc,
+                                    proc=proc,
+                                    paramnames=paramnames,
+                                    params=params,
+                                    raw=raw,
+                                    timeout=timeout,
+                                    backend=backend)
+            if data is not None:
+                success = bool(len(data))
         except SQLAlchemyError as err:
+            if self.in_transaction:
+                raise
             msg = f'Error occurred while running the USP: {proc}.'
             self._report_sa_error(msg=msg, error=err)
         except Exception as err:
+            if self.in_transaction:
+                raise
             reporterror(error=err)
         return (data, success) if return_status else data
 
@@ -239,15 +348,17 @@ class _DBIMSSQL(_DBIBase):
             # Collect parameter names for the EXEC call if not provided.
             if not paramnames:
                 paramnames = self.get_parameter_names(proc=proc)
-            params = ', '.join(map(':{}'.format, paramnames))
-            with self.engine.connect() as con:
-                resp = con.execute(sa.text(f'EXEC {proc} {params}'), data)
-                if resp.returns_rows:
-                    rowid = resp.fetchall()
-                con.commit()
-                con.close()
-                success = True
+            rowid = self._with_retry(self._exec_proc,
+                                     proc=proc,
+                                     paramnames=paramnames,
+                                     params=data,
+                                     raw=True,
+                                     commit=True,
+                                     idempotent__=False)
+            success = True
         except Exception as err:
+            if self.in_transaction:
+                raise
             if 'Cannot insert duplicate key' in repr(err):
                 msg = f'{self._PREFIXW.strip()} Duplicate record detected, skipping.'
                 rowid = [(-1,)]  # Match format of a returned row ID.
@@ -335,11 +446,12 @@ class _DBIMSSQL(_DBIBase):
         # Collect parameter names for the EXEC call if not provided.
         if not paramnames:
             paramnames = self.get_parameter_names(proc=proc)
-        params = ', '.join(map(':{}'.format, paramnames))
-        with self.engine.connect() as con:
-            _ = con.execute(sa.text(f'EXEC {proc} {params}'), data)
-            con.commit()
-            con.close()
+        self._with_retry(self._exec_proc,
+                         proc=proc,
+                         paramnames=paramnames,
+                         params=data,
+                         commit=True,
+                         idempotent__=False)
 
     def checksum(self, table_name: str, database_name: str=None) -> int | None:
         """Calculate a hash (checksum) on the given table.
@@ -473,9 +585,224 @@ class _DBIMSSQL(_DBIBase):
         if all((not self._is_dangerous(stmt=stmt1), not self._is_dangerous(stmt=stmt2))):
             self.execute_query(stmt1)
             self.execute_query(stmt2)
-        ck1 = self.checksum(table_name=table_name, database_name=self.database_name)
-        ck2 = self.checksum(table_name=table_name, database_name=bkdb_name)
-        return ck1 == ck2
+        return self._verify_backup(table_name=table_name, bkdb_name=bkdb_name)
+
+    def _backup_chunked(self,
+                        table_name: str,
+                        bkdb_name: str,
+                        key_column: str,
+                        chunk_rows: int,
+                        resume: bool):
+        """Copy a table to the backup database in committed key-range
+        chunks.
+
+        If ``resume`` is True and the backup table exists, the copy
+        continues from the greatest key in the backup table. Otherwise,
+        the backup table is (re)created empty, using the source table's
+        structure, and the copy starts from the first key.
+
+        Args:
+            table_name (str): Name of the table to be backed up.
+            bkdb_name (str): Name of the backup database.
+            key_column (str): Name of the unique, single-column key on
+                which the chunks are ranged.
+            chunk_rows (int): Number of rows per chunk.
+            resume (bool): Continue from the greatest key already in the
+                backup table.
+
+        """
+        src = f'[dbo].[{table_name}]'
+        dst = f'[{bkdb_name}].[dbo].[{table_name}]'
+        key = f'[{key_column}]'
+        lo = None
+        if resume and self.table_exists(table_name=table_name, database_name=bkdb_name):
+            lo = self.execute_query(f'SELECT MAX({key}) FROM {dst}', primary=True)[0][0]
+        else:
+            self.execute_query(f'DROP TABLE IF EXISTS {dst}')
+            self.execute_query(f'SELECT TOP (0) * INTO {dst} FROM {src}')
+        cols = self.execute_query('SELECT [name] FROM [sys].[columns] '
+                                  'WHERE [object_id] = OBJECT_ID(:table) '
+                                  'AND [is_computed] = 0 '
+                                  'ORDER BY [column_id]',
+                                  params={'table': src},
+                                  flat=True,
+                                  primary=True)
+        cols = ', '.join(f'[{c}]' for c in cols)
+        identity = self.execute_query('SELECT OBJECTPROPERTY(OBJECT_ID(:table), '
+                                      '\'TableHasIdentity\')',
+                                      params={'table': src},
+                                      primary=True)[0][0]
+        stmt_hi = (f'SELECT MAX({key}) FROM (SELECT TOP ({int(chunk_rows)}) {key} '
+                   f'FROM {src} {{where}} ORDER BY {key}) x')
+        while True:
+            where = f'WHERE {key} > :lo' if lo is not None else ''
+            hi = self.execute_query(stmt_hi.format(where=where),
+                                    params={'lo': lo},
+                                    primary=True)[0][0]
+            if hi is None:
+                break
+            bounds = f'{where} {"AND" if where else "WHERE"} {key} <= :hi'
+            with self._connect() as conn:
+                if identity:
+                    conn.execute(sa.text(f'SET IDENTITY_INSERT {dst} ON'))
+                stmt = f'INSERT INTO {dst} ({cols}) SELECT {cols} FROM {src} {bounds}'
+                conn.execute(sa.text(stmt), {'lo': lo, 'hi': hi})
+                if identity:
+                    conn.execute(sa.text(f'SET IDENTITY_INSERT {dst} OFF'))
+                # A transaction's pinned connection is committed by the transaction.
+                if not self.in_transaction:
+                    conn.commit()
+            lo = hi
+
+    def _backup_one(self,
+                    table_name: str,
+                    bkdb_name: str,
+                    key_column: str,
+                    chunk_rows: int,
+                    resume: bool,
+                    verbose: bool) -> ExitCode:
+        """Backup a single table; the worker method for :meth:`backup_many`.
+
+        Args:
+            table_name (str): Name of the table to be backed up.
+            bkdb_name (str): Name of the backup database.
+            key_column (str): Name of the chunking key column. If None,
+                the table's primary key is used, if it is a single
+                column.
+            chunk_rows (int): Row count above which the table is copied
+                in chunks, and the number of rows per chunk.
+            resume (bool): Continue a chunked copy from the greatest key
+                already in the backup table.
+            verbose (bool): Display a message if the table does not
+                exist.
+
+        Returns:
+            ExitCode: The exit code enumerator object associated to the
+            status of the table's backup.
+
+        """
+        try:
+            # A lagging replica must not be read for the copy or its verification.
+            with self._primary_only():
+                if not self.table_exists(table_name=table_name, verbose=verbose):
+                    return ExitCode.ERR_BKUP_TBNEX
+                key_column = key_column or self._primary_key(table_name=table_name)
+                nrows = self.execute_query(f'SELECT COUNT_BIG(*) FROM [dbo].[{table_name}]',
+                                           primary=True)[0][0]
+                if key_column and nrows > chunk_rows:
+                    self._backup_chunked(table_name=table_name,
+                                         bkdb_name=bkdb_name,
+                                         key_column=key_column,
+                                         chunk_rows=chunk_rows,
+                                         resume=resume)
+                    if not self._verify_backup(table_name=table_name, bkdb_name=bkdb_name):
+                        return ExitCode.ERR_BKUP_CKSUM
+                elif not self._backup(table_name=table_name, bkdb_name=bkdb_name):
+                    return ExitCode.ERR_BKUP_CKSUM
+        except Exception as err:
+            reporterror(err)
+            return ExitCode.ERR_BKUP_CKSUM
+        return ExitCode.OK
+
+    def _block_checksum_stmt(self,
+                             table_name: str,
+                             database_name: str,
+                             key: str,
+                             block_size: int,
+                             where: str) -> str:
+        """Build the statement used to calculate block checksums.
+
+        This method wraps the ``CHECKSUM_AGG`` and ``BINARY_CHECKSUM``
+        MSSQL functions, as used by the :meth:`checksum` method.
+
+        Args:
+            table_name (str): Name of the table.
+            database_name (str): Database of the table, or None.
+            key (str): The quoted key column.
+            block_size (int): Key range spanned by each block.
+            where (str): The ``WHERE`` clause (including the keyword),
+                or an empty string.
+
+        Returns:
+            str: A statement returning a
+            ``(block, min_key, max_key, row_count, checksum)`` row for
+            each block.
+
+        """
+        table = self._qualified_name(table_name=table_name, database_name=database_name)
+        blk = f'{key} / {block_size}'
+        return (f'SELECT {blk}, MIN({key}), MAX({key}), COUNT_BIG(*), '
+                f'CHECKSUM_AGG(BINARY_CHECKSUM(*)) FROM {table} {where} GROUP BY {blk}')
+
+    def _exec_proc(self,
+                   proc: str,
+                   paramnames: list | tuple,
+                   params: dict,
+                   raw: bool=True,
+                   commit: bool=False,
+                   timeout: float=None,
+                   backend: str='pandas') -> list | pd.DataFrame | None:  # noqa  # pylint: disable=undefined-variable
+        """Execute a stored procedure on a new connection.
+
+        This is the worker method for the ``call_procedure*`` methods,
+        and is designed to be wrapped by the retry handler.
+
+        Args:
+            proc (str): Name of the stored procedure to call.
+            paramnames (list | tuple): The procedure's parameter names,
+                in order.
+            params (dict): The parameter values, keyed by parameter
+                name.
+            raw (bool, optional): Return the data in 'raw' (tuple)
+                format rather than as a DataFrame. Defaults to True.
+            commit (bool, optional): Call COMMIT after the procedure,
+                unless within a :meth:`transaction` block. Defaults to
+                False.
+            timeout (float, optional): Statement timeout, in seconds.
+                Defaults to None.
+            backend (str, optional): The DataFrame backend, if
+                ``raw=False``. Defaults to 'pandas'.
+
+        Returns:
+            list | pd.DataFrame | None: The procedure's results, if rows
+            are returned. Otherwise, None.
+
+        """
+        # pylint: disable=consider-using-f-string  # No, need the formatter.
+        data = None
+        paramdef = ', '.join(map(':{}'.format, paramnames))
+        with self._connect() as con:
+            with self._timeout(conn=con, timeout=timeout):
+                resp = con.execute(sa.text(f'EXEC {proc} {paramdef}'), params)
+                if resp.returns_rows:
+                    if raw:
+                        data = resp.fetchall()
+                    else:
+                        data = self._result_to_frame__cursor(result=resp, backend=backend)
+            if commit and not self.in_transaction:
+                con.commit()
+        return data
+
+    def _primary_key(self, table_name: str) -> str | None:
+        """Collect the name of a table's single-column primary key.
+
+        Args:
+            table_name (str): Name of the table.
+
+        Returns:
+            str | None: The name of the primary key column. If the table
+            has no primary key, or a composite primary key, None is
+            returned.
+
+        """
+        stmt = ('SELECT [c].[name] FROM [sys].[indexes] [i] '
+                'JOIN [sys].[index_columns] [ic] '
+                'ON [ic].[object_id] = [i].[object_id] AND [ic].[index_id] = [i].[index_id] '
+                'JOIN [sys].[columns] [c] '
+                'ON [c].[object_id] = [ic].[object_id] AND [c].[column_id] = [ic].[column_id] '
+                'WHERE [i].[is_primary_key] = 1 AND [i].[object_id] = OBJECT_ID(:table)')
+        cols = self.execute_query(stmt, params={'table': f'[dbo].[{table_name}]'}, primary=True)
+        return cols[0][0] if cols and len(cols) == 1 else None
 
     @staticmethod
     def _print_summary(success: bool) -> None:
@@ -493,3 +820,135 @@ class _DBIMSSQL(_DBIBase):
             ui.print_normal('Table backup successful.')
         else:
             ui.print_warning('Table backup failed.')
+
+    def _qualified_name(self, table_name: str, database_name: str=None) -> str:
+        """Qualify a table name with its database name and the ``dbo``
+        schema.
+
+        Args:
+            table_name (str): Name of the table.
+            database_name (str, optional): Name of the database.
+                Defaults to None.
+
+        Returns:
+            str: The qualified table name.
+
+        """
+        if database_name:
+            return f'[{database_name}].[dbo].[{table_name}]'
+        return f'[dbo].[{table_name}]'
+
+    @staticmethod
+    def _select_limited(table: str, where: str, order_by: str, n: int) -> str:
+        """Build an ordered ``SELECT`` statement returning at most *n* rows.
+
+        This method overrides the base class' ``LIMIT`` syntax with the
+        MSSQL ``TOP`` syntax.
+
+        Args:
+            table (str): Name of the table to be queried.
+            where (str): The filter, *without* the ``WHERE`` keyword. May
+                be an empty string.
+            order_by (str): The ``ORDER BY`` column list.
+            n (int): Maximum number of rows to be returned.
+
+        Returns:
+            str: The limited ``SELECT`` statement.
+
+        """
+        where = f' WHERE {where}' if where else ''
+        return f'SELECT TOP ({int(n)}) * FROM {table}{where} ORDER BY {order_by}'
+
+    def _staging_table(self, target: str, columns: list) -> tuple[str, str, str]:
+        """Build the statements used to create and drop an upsert's
+        staging table.
+
+        This method overrides the base class' ``CREATE TEMPORARY TABLE``
+        syntax with a ``SELECT ... INTO`` a local (``#``) temporary
+        table.
+
+        Args:
+            target (str): The qualified name of the target table.
+            columns (list): The quoted columns to be staged.
+
+        Returns:
+            tuple[str, str, str]: The name of the staging table, the
+            ``CREATE`` statement and the ``DROP`` statement.
+
+        """
+        name = f'#dbilib_stage_{uuid.uuid4().hex[:16]}'
+        return (name,
+                f'SELECT TOP 0 {", ".join(columns)} INTO {name} FROM {target}',
+                f'DROP TABLE {name}')
+
+    @contextlib.contextmanager
+    def _statement_timeout(self, conn: sa.engine.base.Connection, timeout: float):
+        """Apply a statement timeout to a connection.
+
+        The pyodbc connection's query timeout is set for the duration of
+        the block, and restored on exit. Note: The ODBC timeout is in
+        whole seconds; therefore, the timeout is rounded up.
+
+        Args:
+            conn (sa.engine.base.Connection): The connection to which the
+                timeout is applied.
+            timeout (float): The timeout, in seconds.
+
+        """
+        dbapi_conn = conn.connection.dbapi_connection
+        orig = dbapi_conn.timeout
+        dbapi_conn.timeout = max(1, math.ceil(timeout))
+        try:
+            yield
+        finally:
+            if not conn.invalidated:
+                dbapi_conn.timeout = orig
+
+    @staticmethod
+    def _upsert_stmt(target: str, staging: str, columns: list, keys: list, update: list) -> str:
+        """Build the statement which merges the staging table into the
+        target table.
+
+        This method extends the base class' ``MERGE`` statement with
+        the terminating semi-colon required by MSSQL.
+
+        Args:
+            target (str): The qualified name of the target table.
+            staging (str): The name of the staging table.
+            columns (list): The quoted columns to be inserted.
+            keys (list): The quoted key columns.
+            update (list): The quoted columns to be updated for an
+                existing row. If empty, existing rows are not updated.
+
+        Returns:
+            str: The ``MERGE`` statement.
+
+        """
+        return _DBIBase._upsert_stmt(target=target,
+                                     staging=staging,
+                                     columns=columns,
+                                     keys=keys,
+                                     update=update) + ';'
+
+    def _verify_backup(self, table_name: str, bkdb_name: str) -> bool:
+        """Verify the origin and backup tables' checksums match.
+
+        The two checksums are calculated concurrently, on separate
+        connections to the primary.
+
+        Args:
+            table_name (str): Name of the table which was backed up.
+            bkdb_name (str): Name of the backup database.
+
+        Returns:
+            bool: True if the checksums match, otherwise False.
+
+        """
+        def _checksum(database_name: str) -> int | None:
+            with self._primary_only():
+                return self.checksum(table_name=table_name, database_name=database_name)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            ck1 = pool.submit(_checksum, database_name=self.database_name)
+            ck2 = pool.submit(_checksum, database_name=bkdb_name)
+            return ck1.result() == ck2.result()
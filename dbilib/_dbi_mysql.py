@@ -23,8 +23,12 @@
 # Silence the spurious IDE-based error.
 # pylint: disable=import-error
 
+import contextlib
 import pandas as pd
+import sqlalchemy as sa
+import threading
 import warnings
+from collections.abc import Generator
 from mysql.connector.errors import IntegrityError
 from sqlalchemy.exc import SQLAlchemyError
 from utils4.reporterror import reporterror
@@ -68,12 +72,26 @@ class _DBIMySQL(_DBIBase):
 
     """
 
+    # Lock wait timeout, deadlock, server gone away, lost connection.
+    _TRANSIENT_ERRORS = ('1205 (', '1213 (', '2006 (', '2013 (', '2055')
+    # Query execution was interrupted (KILL QUERY); maximum statement
+    # execution time exceeded (MySQL, MariaDB).
+    _TIMEOUT_ERRORS = ('1317 (', '3024 (', '1969 (')
+    # Seconds after a statement timeout before the statement is killed.
+    _KILL_GRACE = 0.5
+
     # The __init__ method is implemented in the parent class.
 
     def call_procedure(self,
                        proc: str,
                        params: list | tuple = None,
-                       return_status: bool=False) -> pd.DataFrame | tuple[pd.DataFrame | bool]:
+                       return_status: bool=False,
+                       *,
+                       timeout: float=None,
+                       result_sets: str='last',
+                       as_arrow: bool=False,
+                       chunksize: int=10000,
+                       backend: str=None) -> pd.DataFrame | tuple[pd.DataFrame | bool] | list | Generator:
         """Call a stored procedure, and return as a DataFrame.
 
         Args:
@@ -82,35 +100,109 @@ class _DBIMySQL(_DBIBase):
                 parameters to pass into the procedure. Defaults to None.
             return_status (bool, optional): Return the method's success
                 status. Defaults to False.
+            timeout (float, optional): Cancel the procedure (via
+                ``KILL QUERY``) if it has not completed within this
+                number of seconds. Defaults to None.
+            result_sets (str, optional): Which of the procedure's result
+                sets are returned. Options are:
+
+                    - ``'last'``: Only the last result set, as a
+                      DataFrame.
+                    - ``'all'``: All result sets, as a list; one item
+                      per result set.
+                    - ``'stream'``: A generator which streams the result
+                      sets from an *unbuffered* cursor. Refer to the
+                      Yields section below.
+
+                Defaults to 'last' (for backwards compatibility).
+            as_arrow (bool, optional): Return ``pyarrow.Table`` objects
+                rather than DataFrames. Equivalent to
+                ``backend='arrow'``. Defaults to False.
+            chunksize (int, optional): For the ``'stream'`` option, the
+                maximum number of rows per chunk. Defaults to 10000.
+            backend (str, optional): The DataFrame library used for the
+                result sets; ``'pandas'``, ``'polars'`` or ``'arrow'``.
+                Defaults to None, which uses the interface's backend.
+
+        :Example:
+
+            Collect each of a procedure's result sets::
+
+                >>> guitars, summary = dbi.call_procedure('sp_get_guitars_summary',
+                                                          params=['black'],
+                                                          result_sets='all')
+
+
+            Stream a procedure's (large) result sets in chunks, with
+            bounded memory::
+
+                >>> for idx, chunk in dbi.call_procedure('sp_get_history',
+                                                         result_sets='stream'):
+                        process(idx, chunk)
 
         Returns:
-            pd.DataFrame | tuple[pd.DataFrame | bool]:
+            pd.DataFrame | tuple[pd.DataFrame | bool] | list:
             If the ``return_status`` argument is True, a tuple of the
             data and the method's return status is returned as::
 
                 (df, status)
 
-            Otherwise, only the data is returned, as a pd.DataFrame.
+            Otherwise, only the data is returned, as a pd.DataFrame
+            (or a list, for the ``'all'`` option).
+
+        Yields:
+            tuple[int, pd.DataFrame | pyarrow.Table]: For the
+            ``'stream'`` option, a tuple containing the (zero-based)
+            index of the result set, and a chunk of the result set, as::
+
+                (idx, chunk)
+
+            At least one (possibly empty) chunk is yielded for each
+            result set. The ``return_status`` argument is ignored, and
+            errors are raised, rather than reported.
 
         """
+        # pylint: disable=too-many-arguments
+        if result_sets not in ('last', 'all', 'stream'):
+            raise ValueError(f'Invalid result_sets option: {result_sets}')
+        backend = self._check_backend(backend='arrow' if as_arrow else backend or self._backend)
+        if result_sets == 'stream':
+            return self._iter_result_sets(proc=proc,
+                                          params=params,
+                                          chunksize=chunksize,
+                                          backend=backend,
+                                          timeout=timeout)
         warnings.simplefilter('ignore')
-        df = pd.DataFrame()
+        df = pd.DataFrame() if result_sets == 'last' else []
         success = False
         try:
-            # Use a context manager in an attempt to alleviate the
-            # '2055 Lost Connection' and System Error 32 BrokenPipeError.
-            with self.engine.connect() as conn:
-                cur = conn.connection.cursor(buffered=True)
-                cur.callproc(proc, params)
-                result = cur.stored_results()
-                conn.connection.connection.commit()
-                cur.close()
-            df = self._result_to_df__stored(result=result)
-            success = not df.empty
+            result = self._with_retry(self._callproc,
+                                      proc=proc,
+                                      params=params,
+                                      stored=True,
+                                      timeout=timeout)
+            if result_sets == 'all':
+                df = [self._result_to_frame(batches=[x.fetchall()], columns=x.column_names, backend=backend)
+                      for x in result]
+                success = bool(df)
+            elif backend == 'pandas':
+                df = self._result_to_df__stored(result=result)
+                success = not df.empty
+            else:
+                # Only the last result set is kept.
+                for x in result:
+                    df = self._result_to_frame(batches=[x.fetchall()],
+                                               columns=x.column_names,
+                                               backend=backend)
+                success = bool(len(df))
         except SQLAlchemyError as err:
+            if self.in_transaction:
+                raise
             msg = f'Error occurred while running the USP: {proc}.'
             self._report_sa_error(msg=msg, error=err)
         except Exception as err:
+            if self.in_transaction:
+                raise
             reporterror(error=err)
         return (df, success) if return_status else df
 
@@ -147,26 +239,21 @@ class _DBIMySQL(_DBIBase):
         try:
             rowid = None
             success = False
-            # Use a context manager in an attempt to alleviate the
-            # '2055 Lost Connection' and System Error 32 BrokenPipeError.
-            with self.engine.connect() as conn:
-                cur = conn.connection.cursor()
-                cur.callproc(proc, params)
-                conn.connection.connection.commit()
-                if return_id:
-                    # The cur.lastrowid is zero as the mysql_insert_id()
-                    # function call applied to a CALL and not the statement
-                    # within the procedure. Therefore, it must be manually
-                    # obtained here:
-                    cur.execute('SELECT LAST_INSERT_ID()')
-                    rowid = cur.fetchone()[0]
-                cur.close()
-                success = True
+            rowid = self._with_retry(self._callproc,
+                                     proc=proc,
+                                     params=params,
+                                     return_id=return_id,
+                                     idempotent__=False)
+            success = True
         except IntegrityError as ierr:
+            if self.in_transaction:
+                raise
             # Duplicate entry: errno = 1062
             msg = f'{self._PREFIX} {ierr}'
             ui.print_alert(text=msg)
         except Exception as err:
+            if self.in_transaction:
+                raise
             reporterror(err)
         return (rowid, success) if return_id else success
 
@@ -190,20 +277,27 @@ class _DBIMySQL(_DBIBase):
             iterable (list | tuple): List of items to be loaded into
                 the database.
 
+        If the interface's retry policy retries writes, a transient
+        error resumes the load from the first item which was not
+        committed, as each item is committed individually.
+
         Returns:
             bool: True if the update was successful, otherwise False.
 
         """
         try:
             success = False
-            with self.engine.connect() as conn:
-                cur = conn.connection.cursor()
-                for i in iterable:
-                    cur.callproc(proc, [*args, i])
-                    conn.connection.connection.commit()
-                cur.close()
-                success = True
+            done = [0]  # Number of items committed; shared across retries.
+            self._with_retry(self._callproc_many,
+                             *args,
+                             proc=proc,
+                             items=list(iterable),
+                             done=done,
+                             idempotent__=False)
+            success = True
         except Exception as err:
+            if self.in_transaction:
+                raise
             reporterror(err)
         return success
 
@@ -229,11 +323,32 @@ class _DBIMySQL(_DBIBase):
                 the USP. Defaults to None.
 
         """
-        with self._engine.connect() as conn:
-            cur = conn.connection.cursor(buffered=True)
-            cur.callproc(proc, params)
-            conn.connection.connection.commit()
-            cur.close()
+        self._with_retry(self._callproc, proc=proc, params=params, idempotent__=False)
+
+    def checksum(self, table_name: str, database_name: str=None) -> int | None:
+        """Calculate a hash (checksum) on the given table.
+
+        Args:
+            table_name (str) Name of the table against which the checksum
+                is to be calculated.
+            database_name (str) Name of the database (schema) to use.
+                This argument can be used if the table resides in a
+                different database than the one to which the engine
+                object already points. Defaults to None.
+
+        This method wraps the MySQL ``CHECKSUM TABLE`` statement.
+
+        Returns:
+            int | None: An integer representation of the table's hash
+            value, if the table exists. Otherwise, None.
+
+        """
+        table = self._qualified_name(table_name=table_name, database_name=database_name)
+        stmt = f'CHECKSUM TABLE {table}'
+        if not self._is_dangerous(stmt=stmt):
+            rtn = self.execute_query(stmt)
+            return rtn[0][1] if rtn else None
+        return None  # pragma: nocover  # Unreachable
 
     def table_exists(self, table_name: str, verbose: bool=False) -> bool:
         """Using the ``engine`` object, test if the given table exists.
@@ -257,3 +372,294 @@ class _DBIMySQL(_DBIBase):
             msg = f'Table does not exist: {self._engine.url.database}.{table_name}'
             ui.print_warning(text=msg)
         return exists
+
+    def _block_checksum_stmt(self,
+                             table_name: str,
+                             database_name: str,
+                             key: str,
+                             block_size: int,
+                             where: str) -> str:
+        """Build the statement used to calculate block checksums.
+
+        Each row is hashed using ``CRC32`` over its delimited column
+        values (with NULLs made explicit), and the hashes are summed per
+        block. A sum is used rather than ``BIT_XOR``, so duplicate rows
+        do not cancel each other out.
+
+        Args:
+            table_name (str): Name of the table.
+            database_name (str): Database (schema) of the table, or None.
+            key (str): The quoted key column.
+            block_size (int): Key range spanned by each block.
+            where (str): The ``WHERE`` clause (including the keyword),
+                or an empty string.
+
+        Returns:
+            str: A statement returning a
+            ``(block, min_key, max_key, row_count, checksum)`` row for
+            each block.
+
+        """
+        params = {'schema': database_name or self._engine.url.database,
+                  'table_name': table_name}
+        stmt = ('select column_name from information_schema.columns '
+                'where table_schema = :schema '
+                'and table_name = :table_name '
+                'order by ordinal_position')
+        cols = [r[0] for r in self.execute_query(stmt, params=params) or []]
+        quote = self._engine.dialect.identifier_preparer.quote
+        values = ', '.join(f"IFNULL({quote(c)}, '<NULL>')" for c in cols)
+        table = self._qualified_name(table_name=table_name, database_name=database_name)
+        return (f'SELECT FLOOR({key} / {block_size}), MIN({key}), MAX({key}), COUNT(*), '
+                f"CAST(SUM(CRC32(CONCAT_WS('|', {values}))) AS UNSIGNED) "
+                f'FROM {table} {where} GROUP BY 1')
+
+    def _callproc(self,
+                  proc: str,
+                  params: list=None,
+                  *,
+                  stored: bool=False,
+                  return_id: bool=False,
+                  timeout: float=None) -> object:
+        """Call a stored procedure, and commit (unless within a
+        transaction).
+
+        This is the worker method for the ``call_procedure*`` methods,
+        and is designed to be wrapped by the retry handler.
+
+        Args:
+            proc (str): Name of the stored procedure to call.
+            params (list, optional): A list of parameters to pass into
+                the USP. Defaults to None.
+            stored (bool, optional): Return the procedure's stored
+                results. Defaults to False.
+            return_id (bool, optional): Return the ID of the last
+                inserted row. Defaults to False.
+            timeout (float, optional): Statement timeout, in seconds.
+                Defaults to None.
+
+        Returns:
+            object: The stored results iterator if ``stored`` is True,
+            the last inserted row ID if ``return_id`` is True, otherwise
+            None.
+
+        """
+        rtn = None
+        # Use a context manager in an attempt to alleviate the
+        # '2055 Lost Connection' and System Error 32 BrokenPipeError.
+        with self._connect() as conn:
+            cur = conn.connection.cursor(buffered=True)
+            with self._timeout(conn=conn, timeout=timeout):
+                cur.callproc(proc, params)
+            if stored:
+                rtn = cur.stored_results()
+            if not self.in_transaction:
+                conn.connection.connection.commit()
+            if return_id:
+                # The cur.lastrowid is zero as the mysql_insert_id()
+                # function call applied to a CALL and not the statement
+                # within the procedure. Therefore, it must be manually
+                # obtained here:
+                cur.execute('SELECT LAST_INSERT_ID()')
+                rtn = cur.fetchone()[0]
+            cur.close()
+        return rtn
+
+    def _callproc_many(self, *args, proc: str, items: list, done: list):
+        """Call a stored procedure for each item, committing each call
+        (unless within a transaction).
+
+        Args:
+            *args (str | int | float): Positional arguments to be
+                passed into the USP, in front of each item.
+            proc (str): Name of the stored procedure to call.
+            items (list): Items to be loaded into the database.
+            done (list): A single-element list holding the number of
+                items already committed. The element is updated after
+                each commit, so a retry resumes from the first item
+                which was not committed.
+
+        """
+        with self._connect() as conn:
+            cur = conn.connection.cursor()
+            for i in items[done[0]:]:
+                cur.callproc(proc, [*args, i])
+                if not self.in_transaction:
+                    conn.connection.connection.commit()
+                done[0] += 1
+            cur.close()
+
+    def _iter_result_sets(self,
+                          proc: str,
+                          params: list | tuple,
+                          chunksize: int,
+                          backend: str,
+                          timeout: float=None) -> Generator[tuple[int, pd.DataFrame], None, None]:
+        """Stream a procedure's result sets from an unbuffered cursor.
+
+        The ``CALL`` statement is executed directly (rather than via
+        ``cursor.callproc``, which buffers each result set), and each
+        result set is fetched in chunks before moving to the next via
+        ``cursor.nextset``. Therefore, only a single chunk is held in
+        memory at a time.
+
+        This is the worker method for the :meth:`call_procedure`
+        ``'stream'`` option. Refer to that method for the argument
+        descriptions.
+
+        Yields:
+            tuple[int, pd.DataFrame | pyarrow.Table]: The result set
+            index, and a chunk of the result set.
+
+        """
+        params = tuple(params or ())
+        stmt = f'CALL {proc}({", ".join(["%s"] * len(params))})'
+        with self._connect() as conn:
+            cur = conn.connection.cursor(buffered=False)
+            try:
+                with self._timeout(conn=conn, timeout=timeout):
+                    cur.execute(stmt, params)
+                    idx = 0
+                    while True:
+                        # The final 'result' of a CALL is its status, which has no columns.
+                        if cur.description:
+                            columns = [c[0] for c in cur.description]
+                            first = True
+                            while True:
+                                rows = cur.fetchmany(chunksize)
+                                if rows or first:
+                                    yield idx, self._result_to_frame(batches=[rows],
+                                                                     columns=columns,
+                                                                     backend=backend)
+                                first = False
+                                if len(rows) < chunksize:
+                                    break
+                            idx += 1
+                        if not cur.nextset():
+                            break
+                if not self.in_transaction:
+                    conn.connection.connection.commit()
+            finally:
+                cur.close()
+
+    def _kill_query(self, connection_id: int):
+        """Kill the statement running on the given connection.
+
+        The ``KILL QUERY`` statement is issued from a dedicated DBAPI
+        connection, created outside the pool; so the kill neither waits
+        on, nor is refused by, an exhausted pool. The connection being
+        killed is left open.
+
+        Args:
+            connection_id (int): The server's connection (thread) ID.
+
+        """
+        dialect = self._engine.dialect
+        try:
+            cargs, cparams = dialect.create_connect_args(self._engine.url)
+            with contextlib.closing(dialect.connect(*cargs, **cparams)) as conn:
+                with contextlib.closing(conn.cursor()) as cur:
+                    cur.execute(f'KILL QUERY {int(connection_id)}')
+        except Exception as err:
+            reporterror(err)
+
+    def _staging_table(self, target: str, columns: list) -> tuple[str, str, str]:
+        """Build the statements used to create and drop an upsert's
+        staging table.
+
+        This method overrides the base class' ``DROP`` statement with
+        ``DROP TEMPORARY TABLE``, which does not cause an implicit
+        COMMIT.
+
+        Args:
+            target (str): The qualified name of the target table.
+            columns (list): The quoted columns to be staged.
+
+        Returns:
+            tuple[str, str, str]: The name of the staging table, the
+            ``CREATE`` statement and the ``DROP`` statement.
+
+        """
+        name, create, _ = super()._staging_table(target=target, columns=columns)
+        return name, create, f'DROP TEMPORARY TABLE {name}'
+
+    @contextlib.contextmanager
+    def _statement_timeout(self, conn: sa.engine.base.Connection, timeout: float):
+        """Apply a statement timeout to a connection.
+
+        The session's ``max_execution_time`` (in milliseconds; or
+        ``max_statement_time``, in seconds, for MariaDB) is set for the
+        duration of the block, and restored on exit; which lets the
+        server cancel the statement itself. As MySQL only applies this
+        variable to ``SELECT`` statements, a timer also issues a
+        ``KILL QUERY`` for the connection, shortly after the timeout has
+        elapsed; which cancels DML statements and procedure calls.
+
+        The timer and the block are coordinated by a lock, so the kill
+        is only issued while the block is still running; and the block
+        does not exit (freeing the connection for its next statement)
+        while a kill is in flight.
+
+        Args:
+            conn (sa.engine.base.Connection): The connection to which the
+                timeout is applied.
+            timeout (float): The timeout, in seconds.
+
+        """
+        dbapi_conn = conn.connection.dbapi_connection
+        cid = dbapi_conn.connection_id
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def _kill():
+            with lock:
+                if not done.is_set():
+                    self._kill_query(connection_id=cid)
+
+        if self._engine.dialect.is_mariadb:
+            var, value = 'max_statement_time', round(timeout, 6)
+        else:
+            var, value = 'max_execution_time', max(1, int(timeout * 1000))
+        with contextlib.closing(dbapi_conn.cursor()) as cur:
+            cur.execute(f'SELECT @@SESSION.{var}')
+            orig = cur.fetchone()[0]
+            cur.execute(f'SET SESSION {var} = {value}')
+        # Allow the server to cancel the statement before resorting to the kill.
+        timer = threading.Timer(timeout + self._KILL_GRACE, _kill)
+        timer.daemon = True
+        timer.start()
+        try:
+            yield
+        finally:
+            with lock:
+                done.set()
+            timer.cancel()
+            if not conn.invalidated:
+                with contextlib.closing(dbapi_conn.cursor()) as cur:
+                    cur.execute(f'SET SESSION {var} = {orig}')
+
+    @staticmethod
+    def _upsert_stmt(target: str, staging: str, columns: list, keys: list, update: list) -> str:
+        """Build the statement which merges the staging table into the
+        target table.
+
+        This method overrides the base class' ``MERGE`` syntax with the
+        MySQL ``INSERT ... ON DUPLICATE KEY UPDATE`` syntax.
+
+        Args:
+            target (str): The qualified name of the target table.
+            staging (str): The name of the staging table.
+            columns (list): The quoted columns to be inserted.
+            keys (list): The quoted key columns.
+            update (list): The quoted columns to be updated for an
+                existing row. If empty, existing rows are not updated.
+
+        Returns:
+            str: The ``INSERT ... ON DUPLICATE KEY UPDATE`` statement.
+
+        """
+        cols = ', '.join(columns)
+        # If no columns are updated, a key is set to itself; which is a no-op.
+        sets = ', '.join(f'{target}.{c} = src.{c}' for c in update or keys[:1])
+        return (f'INSERT INTO {target} ({cols}) SELECT {cols} FROM {staging} src '
+                f'ON DUPLICATE KEY UPDATE {sets}')
@@ -9,7 +9,11 @@
 :Developer: J Berendt
 :Email:     support@s3dev.uk
 
-:Comments:  n/a
+:Comments:  Both the ``python-oracledb`` (``oracle+oracledb://``) and
+            the legacy ``cx_Oracle`` (``oracle+cx_oracle://``) drivers
+            are supported, as selected by the connection string. The
+            driver module is collected from the engine's dialect, as
+            the two drivers share the same API.
 
 :Example:
 
@@ -23,8 +27,15 @@
 # Silence the spurious IDE-based error.
 # pylint: disable=import-error
 
-import cx_Oracle
+from __future__ import annotations
+
+import contextlib
+import functools
 import pandas as pd
+import sqlalchemy as sa
+import uuid
+from collections.abc import Generator
+from typing import TYPE_CHECKING
 from utils4.reporterror import reporterror
 from utils4.user_interface import ui
 # locals
@@ -33,6 +44,9 @@ try:
 except ImportError:
     from _dbi_base import _DBIBase
 
+if TYPE_CHECKING:  # pragma: nocover
+    import oracledb
+
 
 class _DBIOracle(_DBIBase):
     """This *private* class holds the methods and properties which are
@@ -49,6 +63,37 @@ class _DBIOracle(_DBIBase):
     Args:
         connstr (str): The database-specific SQLAlchemy connection
             string.
+        arraysize (int, optional): Number of rows fetched per round-trip
+            to the database. The driver's default (100) costs a
+            round-trip for every 100 rows. Defaults to 1000.
+        prefetchrows (int, optional): Number of rows returned with the
+            execute (or procedure call) round-trip itself. Defaults to
+            1000.
+        native_types (bool, optional): Register an output type handler
+            on the procedure cursors, which fetches CLOBs (and BLOBs) as
+            ``str`` (and ``bytes``) rather than LOB locators, and NUMBERs
+            as native ``int`` or ``float`` values, in the driver. Note:
+            LOBs larger than 1 GB cannot be fetched this way. Defaults to
+            True.
+        native_pool (bool | dict, optional): Serve the connections from
+            a ``python-oracledb`` native session pool
+            (``oracledb.create_pool``), rather than the SQLAlchemy pool.
+            If a dictionary is provided, it is passed into
+            ``create_pool``; for example, ``{'min': 2, 'max': 20}``.
+            This option requires the ``oracledb`` driver. Defaults to
+            False.
+        stmtcachesize (int, optional): Size of each connection's
+            statement cache. Repeated statements (and procedure calls)
+            found in the cache are not re-parsed. Defaults to None,
+            which uses the driver's default (20).
+        thick_mode (bool | dict, optional): For the ``oracledb`` driver,
+            enable *thick* mode (which requires the Oracle Client
+            libraries). If a dictionary is provided, it is passed into
+            ``oracledb.init_oracle_client``. Defaults to None, which
+            uses *thin* mode; this requires no client libraries, and
+            connects faster.
+        **kwargs (object): Keyword arguments passed into the base
+            class. For example, ``retry``.
 
     :Example Use:
 
@@ -60,7 +105,7 @@ class _DBIOracle(_DBIBase):
             class MyDB(DBInterface):
 
                 def __init__(self, connstr: str):
-                    super().__init__(connstr=('oracle+cx_oracle://'
+                    super().__init__(connstr=('oracle+oracledb://'
                                               '<user>:<pwd>'
                                               '@(DESCRIPTION=(ADDRESS='
                                               '(PROTOCOL=TCP)'
@@ -69,25 +114,84 @@ class _DBIOracle(_DBIBase):
                                               '(CONNECT_DATA='
                                               '(SERVICE_NAME=<svcname>)))'))
 
-    """
 
-    _ERROR_NI = ('Due to restrictions on the development environment, '
-                 'this method is currently not implemented.')
+        Connect in thin mode, using a native session pool with a
+        larger statement cache as::
+
+            >>> dbi = DBInterface(connstr=('oracle+oracledb://<user>:<pwd>@<host>:<port>/'
+                                           '?service_name=<svcname>'),
+                                  native_pool={'min': 2, 'max': 20},
+                                  stmtcachesize=100)
+
+    """
 
-    # The __init__ method is implemented in the parent class.
+    # Lost connection (end-of-file on channel, not connected, connection
+    # lost contact, connect timeout) and deadlock.
+    _TRANSIENT_ERRORS = ('ORA-03113', 'ORA-03114', 'ORA-03135', 'ORA-12170', 'ORA-00060')
+    # Call timeout exceeded.
+    _TIMEOUT_ERRORS = ('DPI-1067', 'ORA-03156')
+    # Errors raised by the call itself rather than by a row: a PL/SQL
+    # compilation error (invalid procedure or arguments; which carries the
+    # PLS- errors), an invalid procedure name, and missing privileges.
+    _CALL_ERRORS = ('ORA-06550', 'ORA-06576', 'ORA-01031')
+
+    def __init__(self,
+                 connstr: str,
+                 *,
+                 arraysize: int=1000,
+                 prefetchrows: int=1000,
+                 native_types: bool=True,
+                 native_pool: bool | dict=False,
+                 stmtcachesize: int=None,
+                 thick_mode: bool | dict=None,
+                 **kwargs):
+        """Oracle database interface initialiser."""
+        self._arraysize = arraysize
+        self._prefetchrows = prefetchrows
+        self._native_types = native_types
+        self._native_pool = native_pool
+        self._stmtcachesize = stmtcachesize
+        self._thick_mode = thick_mode
+        self._pools = []  # Native session pools; one per engine.
+        super().__init__(connstr=connstr, **kwargs)
+
+    @property
+    def dbapi(self) -> object:
+        """Accessor to the driver (DBAPI) module; either ``oracledb``
+        or ``cx_Oracle``.
+        """
+        return self._engine.dialect.dbapi
 
     def call_procedure(self,
                        proc: str,
                        params: list | tuple = None,
-                       return_status: bool=False) -> pd.DataFrame | tuple[pd.DataFrame | bool]:
+                       return_status: bool=False,
+                       *,
+                       timeout: float=None,
+                       as_arrow: bool=False,
+                       backend: str=None) -> pd.DataFrame | tuple[pd.DataFrame | bool]:
         """Call a stored procedure, and return as a DataFrame.
 
+        The procedure's *last* parameter must be an ``OUT SYS_REFCURSOR``,
+        which is fetched in batches of ``arraysize`` rows, and each batch
+        is converted to columns.
+
         Args:
             proc (str): Name of the stored procedure to call.
             params (list | tuple, optional): A list (or tuple) of
                 parameters to pass into the procedure. Defaults to None.
             return_status (bool, optional): Return the method's success
                 status. Defaults to False.
+            timeout (float, optional): Cancel the procedure if it has
+                not completed within this number of seconds, via the
+                connection's ``call_timeout``. Defaults to None.
+            as_arrow (bool, optional): Return a ``pyarrow.Table`` rather
+                than a DataFrame. Equivalent to ``backend='arrow'``.
+                Defaults to False.
+            backend (str, optional): The DataFrame library used for the
+                results; ``'pandas'``, ``'polars'`` or ``'arrow'``. Each
+                fetched batch is converted by the backend. Defaults to
+                None, which uses the interface's backend.
 
         Returns:
             pd.DataFrame | tuple[pd.DataFrame | bool]:
@@ -96,73 +200,190 @@ class _DBIOracle(_DBIBase):
 
                 (df, status)
 
-            Otherwise, only the data is returned, as a pd.DataFrame.
+            Otherwise, only the data is returned, as a frame of the
+            selected backend's type.
 
         """
+        backend = self._check_backend(backend='arrow' if as_arrow else backend or self._backend)
         df = pd.DataFrame()
         success = False
         try:
-            with self.engine.connect() as conn:
-                cur = conn.connection.cursor()
-                refcur = conn.connection.cursor()
-                cur.callproc(proc, params + [refcur])
-                conn.connection.connection.commit()
-            df = self._result_to_df__refcursor(refcur=refcur)
-            cur.close()
-            refcur.close()
-            success = not df.empty
-        except cx_Oracle.DatabaseError as err:
+            df = self._with_retry(self._callproc_refcursor,
+                                  proc=proc,
+                                  params=params,
+                                  timeout=timeout,
+                                  backend=backend)
+            success = bool(len(df))
+        except self.dbapi.DatabaseError as err:
+            if self.in_transaction:
+                raise
             msg = f'Error occurred while running the USP: {proc}.'
             self._report_cxo_error(msg=msg, error=err)
         except Exception as err:
+            if self.in_transaction:
+                raise
             reporterror(error=err)
         return (df, success) if return_status else df
 
-    def call_procedure_update(self):
+    def call_procedure_update(self,
+                              proc: str,
+                              params: list=None,
+                              return_id: bool=False) -> bool | tuple:
         """Call an *update* or *insert* stored procedure.
 
-        Warning:
-            Due to the restrictions on the Oracle development
-            environment, database UPDATE-like methods are not allowed.
-            Therefore, this method is *currently* not implemented.
+        Note:
+            Results are *not* returned from this call, only a boolean
+            status flag and the optional last row ID.
+
+            If results are desired, please use the
+            :meth:`~call_procedure` method.
 
-        Raises:
-            NotImplementedError: Warn the user that this method is
-            currently not implemented.
+        Args:
+            proc (str): Name of the stored procedure to call.
+            params (list, optional): A list of parameters to pass into
+                the USP. Defaults to None.
+            return_id (bool, optional): Return the ID of the inserted
+                row. As Oracle has no 'last insert ID' function, the ID
+                **must be provided by the USP** via an ``OUT NUMBER``
+                parameter, which is appended as the *last* parameter.
+                Defaults to False.
+
+        Returns:
+            bool | tuple: If ``return_id`` is False, True is
+            returned if the procedure completed  successfully, otherwise
+            False. If ``return_id`` is True, a tuple containing the
+            ID of the inserted row and the execution success flag are
+            returned as::
+
+                (id, success_flag)
 
         """
-        raise NotImplementedError(self._ERROR_NI)
+        try:
+            rowid = None
+            success = False
+            rowid = self._with_retry(self._callproc,
+                                     proc=proc,
+                                     params=params,
+                                     return_id=return_id,
+                                     idempotent__=False)
+            success = True
+        except self.dbapi.IntegrityError as ierr:
+            if self.in_transaction:
+                raise
+            # Unique constraint violated: ORA-00001
+            msg = f'{self._PREFIX} {ierr}'
+            ui.print_alert(text=msg)
+        except Exception as err:
+            if self.in_transaction:
+                raise
+            reporterror(err)
+        return (rowid, success) if return_id else success
+
+    def call_procedure_update_many(self,
+                                   *args,
+                                   proc: str,
+                                   iterable: list | tuple,
+                                   batch_size: int=10000,
+                                   return_errors: bool=False) -> bool | tuple[bool, list]:
+        r"""Call an *update* or *insert* stored procedure for an iterable.
+
+        The procedure is called for each item using array binding
+        (``cursor.executemany``), so each batch of calls costs a single
+        round-trip to the database, rather than one round-trip per item.
+        Each batch is committed once.
+
+        A failed call does not abort the batch. The error is collected,
+        and the batch is resumed from the item *following* the failed
+        item, using the error's row offset.
 
-    def call_procedure_update_many(self):
-        """Call an *update* or *insert* stored procedure for an iterable.
+        Note:
+            The arguments are passed into the USP in the following order:
 
-        Warning:
-            Due to the restrictions on the Oracle development
-            environment, database UPDATE-like methods are not allowed.
-            Therefore, this method is *currently* not implemented.
+                \*args, iterable_item
 
-        Raises:
-            NotImplementedError: Warn the user that this method is
-            currently not implemented.
+            Ensure the USP is designed to accept the iterable item as
+            the *last* parameter.
 
-        """
-        raise NotImplementedError(self._ERROR_NI)
+        Args:
+            *args (str | int | float): Positional arguments to be
+                passed into the USP, in front of each iterable item.
+                Note: The parameters are passed into the USP in the
+                order received, followed by the iterable item.
+            proc (str): Name of the stored procedure to call.
+            iterable (list | tuple): List of items to be loaded into
+                the database.
+            batch_size (int, optional): Number of calls per round-trip
+                (and COMMIT). Defaults to 10000.
+            return_errors (bool, optional): Also return the per-item
+                errors. Defaults to False.
+
+        Returns:
+            bool | tuple[bool, list]: True if all items were loaded
+            successfully, otherwise False. If ``return_errors`` is True,
+            a tuple containing the success flag and a list of
+            ``(item_index, error_message)`` tuples is returned as::
+
+                (success, errors)
+
+            If the call itself fails (e.g. the procedure does not
+            compile), the items before the last error's index were
+            committed (excepting their own errors), and the items from
+            that index onward were not loaded.
 
-    def call_procedure_update_raw(self):
+        """
+        errors = []
+        done = [0]  # Number of items committed; shared across retries.
+        try:
+            success = False
+            self._with_retry(self._callproc_many,
+                             *args,
+                             proc=proc,
+                             items=list(iterable),
+                             batch_size=batch_size,
+                             done=done,
+                             errors=errors,
+                             idempotent__=False)
+            success = not errors
+        except Exception as err:
+            if self.in_transaction:
+                raise
+            reporterror(err)
+            # The items from the first uncommitted batch onward were not
+            # loaded; the error is reported against the first such item.
+            errors[:] = [e for e in errors if e[0] < done[0]]
+            errors.append((done[0], str(err)))
+        return (success, errors) if return_errors else success
+
+    def call_procedure_update_raw(self, proc: str, params: list=None):
         """Call an *update* or *insert* stored procedure, without error
         handling.
 
-        Warning:
-            Due to the restrictions on the Oracle development
-            environment, database UPDATE-like methods are not allowed.
-            Therefore, this method is *currently* not implemented.
+        .. warning::
+            This method is **unprotected**, perhaps use
+            :meth:`~call_procedure_update` instead.
 
-        Raises:
-            NotImplementedError: Warn the user that this method is
-            currently not implemented.
+            This 'raw' method *does not* contain an error handler. It is
+            (by design) the responsibility of the caller to contain and
+            control the errors.
+
+        The purpose of this raw method is to enable the caller method to
+        contain and control the errors which might be generated from a
+        USP call, for example a **duplicate key** error.
+
+        Args:
+            proc (str): Name of the stored procedure to call.
+            params (list, optional): A list of parameters to pass into
+                the USP. Defaults to None.
 
         """
-        raise NotImplementedError(self._ERROR_NI)
+        self._with_retry(self._callproc, proc=proc, params=params, idempotent__=False)
+
+    def close(self):
+        """Close the interface, its engines and any native session pools."""
+        super().close()
+        for pool in self._pools:
+            pool.close()
+        self._pools = []
 
     def table_exists(self, table_name: str, verbose: bool=False) -> bool:
         """Using the ``engine`` object, test if the given table exists.
@@ -188,13 +409,332 @@ class _DBIOracle(_DBIBase):
             ui.print_warning(text=msg)
         return exists
 
-    def _report_cxo_error(self, msg: str, error: cx_Oracle.DatabaseError):
-        """Report cx_Oracle error to the terminal.
+    def _callproc(self, proc: str, params: list=None, *, return_id: bool=False) -> int | None:
+        """Call a stored procedure, and commit (unless within a
+        transaction).
+
+        This is the worker method for the ``call_procedure_update*``
+        methods, and is designed to be wrapped by the retry handler.
+
+        Args:
+            proc (str): Name of the stored procedure to call.
+            params (list, optional): A list of parameters to pass into
+                the USP. Defaults to None.
+            return_id (bool, optional): Append an ``OUT NUMBER``
+                parameter, and return its value. Defaults to False.
+
+        Returns:
+            int | None: The value of the ``OUT`` parameter if
+            ``return_id`` is True, otherwise None.
+
+        """
+        with self._connect() as conn:
+            cur = conn.connection.cursor()
+            rowid = cur.var(int) if return_id else None
+            cur.callproc(proc, [*(params or []), *([rowid] if return_id else [])])
+            if not self.in_transaction:
+                conn.connection.connection.commit()
+            cur.close()
+        return rowid.getvalue() if return_id else None
+
+    def _callproc_many(self,
+                       *args,
+                       proc: str,
+                       items: list,
+                       batch_size: int,
+                       done: list,
+                       errors: list):
+        """Call a stored procedure for each item, using array binding.
+
+        Each batch is executed as an anonymous PL/SQL block via
+        ``cursor.executemany``, and committed (unless within a
+        transaction).
+
+        Note:
+            The ``batcherrors`` option only applies to DML statements.
+            For PL/SQL, execution stops at the first failed call, and
+            the error's ``offset`` identifies the failed row. Therefore,
+            the error is collected and the batch is resumed from the
+            following row.
+
+            Errors which cannot be attributed to a row are raised, rather
+            than collected against each item in turn. These are
+            identified by their error code; refer to ``_CALL_ERRORS``.
+
+        Args:
+            *args (str | int | float): Positional arguments to be
+                passed into the USP, in front of each item.
+            proc (str): Name of the stored procedure to call.
+            items (list): Items to be loaded into the database.
+            batch_size (int): Number of items per ``executemany`` call.
+            done (list): A single-element list holding the number of
+                items already committed. The element is updated after
+                each commit, so a retry resumes from the first batch
+                which was not committed.
+            errors (list): A list into which ``(item_index,
+                error_message)`` tuples are collected.
+
+        """
+        # Discard errors from an uncommitted batch, which is re-run on retry.
+        errors[:] = [e for e in errors if e[0] < done[0]]
+        binds = ', '.join(f':{i}' for i in range(1, len(args) + 2))
+        stmt = f'BEGIN {proc}({binds}); END;'
+        with self._connect() as conn:
+            cur = conn.connection.cursor()
+            while done[0] < len(items):
+                start = done[0]
+                batch = [(*args, i) for i in items[start:start + batch_size]]
+                pos = 0
+                while pos < len(batch):
+                    try:
+                        cur.executemany(stmt, batch[pos:])
+                        pos = len(batch)
+                    except self.dbapi.DatabaseError as err:
+                        if self._is_transient(error=err) or self._is_call_error(error=err):
+                            raise
+                        offset = getattr(err.args[0], 'offset', 0)
+                        errors.append((start + pos + offset, err.args[0].message))
+                        pos += offset + 1
+                if not self.in_transaction:
+                    conn.connection.connection.commit()
+                done[0] = start + len(batch)
+            cur.close()
+
+    def _callproc_refcursor(self,
+                            proc: str,
+                            params: list | tuple=None,
+                            timeout: float=None,
+                            backend: str='pandas') -> pd.DataFrame:
+        """Call a stored procedure which returns a ref cursor.
+
+        This is the worker method for the :meth:`call_procedure` method,
+        and is designed to be wrapped by the retry handler.
+
+        Args:
+            proc (str): Name of the stored procedure to call.
+            params (list | tuple, optional): A list (or tuple) of
+                parameters to pass into the procedure. The ref cursor is
+                appended as the last parameter. Defaults to None.
+            timeout (float, optional): Statement timeout, in seconds.
+                Defaults to None.
+            backend (str, optional): The DataFrame backend, per
+                :meth:`_result_to_frame`. Defaults to 'pandas'.
+
+        Returns:
+            pd.DataFrame | polars.DataFrame | pyarrow.Table: The
+            contents of the ref cursor.
+
+        """
+        with self._connect() as conn:
+            cur = self._tune_cursor(cur=conn.connection.cursor())
+            # The fetch settings must be applied to the ref cursor
+            # *before* it is returned by the procedure.
+            refcur = self._tune_cursor(cur=conn.connection.cursor())
+            with self._timeout(conn=conn, timeout=timeout):
+                cur.callproc(proc, [*(params or []), refcur])
+                if not self.in_transaction:
+                    conn.connection.connection.commit()
+                df = self._result_to_frame(batches=self._iter_refcursor(refcur=refcur),
+                                           columns=[i[0] for i in refcur.description],
+                                           backend=backend)
+            cur.close()
+            refcur.close()
+        return df
+
+    def _create_engine(self, connstr: str, **kwargs) -> sa.engine.base.Engine:
+        """Create a database engine using the provided environment.
+
+        The engine's ``arraysize`` is set, so the results of
+        :meth:`execute_query` calls are also fetched in batches of
+        ``arraysize`` rows.
+
+        For the ``oracledb`` driver, the ``thick_mode`` option is
+        applied and, if requested, the engine is created over a native
+        session pool via :meth:`_create_engine__native_pool`.
+
+        Args:
+            connstr (str): The connection string; either the primary's,
+                or a replica's.
+            **kwargs (object): Additional keyword arguments passed into
+                ``sqlalchemy.create_engine``.
+
+        Returns:
+            sqlalchemy.engine.base.Engine: A sqlalchemy database engine
+            object.
+
+        """
+        url = sa.engine.make_url(connstr)
+        kwargs['arraysize'] = self._arraysize
+        if url.get_driver_name() == 'oracledb':
+            if self._thick_mode is not None:
+                kwargs['thick_mode'] = self._thick_mode
+            if self._native_pool:
+                return self._create_engine__native_pool(url=url, **kwargs)
+        elif self._native_pool:
+            raise ValueError('The native_pool option requires the oracledb driver.')
+        engine = super()._create_engine(connstr=connstr, **kwargs)
+        if self._stmtcachesize is not None:
+            # The listener must not reference the instance, as the engine
+            # may be shared.
+            sa.event.listen(engine,
+                            'connect',
+                            functools.partial(self._on_connect,
+                                              stmtcachesize=self._stmtcachesize))
+        return engine
+
+    def _create_engine__native_pool(self, url: sa.URL, **kwargs) -> sa.engine.base.Engine:
+        """Create a database engine over a native ``oracledb`` session pool.
+
+        The connection arguments are built by the SQLAlchemy dialect
+        from the connection string, and used to create the session pool.
+        The engine then acquires its connections from (and releases
+        them to) the session pool, so SQLAlchemy's own pooling is
+        disabled.
+
+        Args:
+            url (sa.URL): The connection string's URL object.
+            **kwargs (object): Additional keyword arguments passed into
+                ``sqlalchemy.create_engine``.
+
+        Returns:
+            sqlalchemy.engine.base.Engine: A sqlalchemy database engine
+            object.
+
+        """
+        # The dialect is only used to build the connection arguments;
+        # no connection is made by this engine.
+        engine = sa.create_engine(url=url, **kwargs)
+        cargs, cparams = engine.dialect.create_connect_args(engine.url)
+        dbapi = engine.dialect.dbapi
+        engine.dispose()
+        opts = {'min': 1, 'max': 20, 'increment': 1}
+        if isinstance(self._native_pool, dict):
+            opts |= self._native_pool
+        if self._stmtcachesize is not None:
+            opts['stmtcachesize'] = self._stmtcachesize
+        pool = dbapi.create_pool(*cargs, **cparams, **opts)
+        self._pools.append(pool)
+        return sa.create_engine(url=url,
+                                creator=pool.acquire,
+                                poolclass=sa.pool.NullPool,
+                                **kwargs)
+
+    def _engine_options(self) -> dict:
+        """Return the interface options which affect the engine.
+
+        Returns:
+            dict: The engine options.
+
+        """
+        return {'arraysize': self._arraysize,
+                'stmtcachesize': self._stmtcachesize,
+                'thick_mode': self._thick_mode}
+
+    @staticmethod
+    def _iter_refcursor(refcur: oracledb.Cursor) -> Generator[list[tuple], None, None]:
+        """Fetch a cursor's rows in batches of ``arraysize`` rows.
+
+        Each batch costs (at most) a single round-trip to the database.
+
+        Args:
+            refcur (oracledb.Cursor): The cursor to be fetched.
+
+        Yields:
+            list[tuple]: A batch of rows.
+
+        """
+        while rows := refcur.fetchmany(refcur.arraysize):
+            yield rows
+
+    def _is_call_error(self, error: Exception) -> bool:
+        """Test if an error was raised by a procedure call itself, rather
+        than by one of its rows.
+
+        Args:
+            error (Exception): The error raised by the call.
+
+        Returns:
+            bool: True if the error's code is one of the
+            ``_CALL_ERRORS``, otherwise False.
+
+        """
+        err = error.args[0] if error.args else None
+        # The cx_Oracle driver only provides the numeric code.
+        code = getattr(err, 'full_code', None)
+        if code is None and isinstance(getattr(err, 'code', None), int):
+            code = f'ORA-{err.code:05d}'
+        return code in self._CALL_ERRORS
+
+    @staticmethod
+    def _on_connect(dbapi_conn, conn_record, stmtcachesize: int):
+        """Prepare each new DBAPI connection; the ``connect`` event listener.
+
+        Sets the connection's statement cache size.
+
+        Args:
+            dbapi_conn (oracledb.Connection): The new DBAPI connection.
+            conn_record (sqlalchemy.pool._ConnectionRecord): The pool's
+                connection record. (Unused)
+            stmtcachesize (int): The statement cache size.
+
+        """
+        # pylint: disable=unused-argument  # Listener signature.
+        dbapi_conn.stmtcachesize = stmtcachesize
+
+    def _output_type_handler(self, cursor: oracledb.Cursor, *args) -> object:
+        """Define the fetch type of a column; the output type handler.
+
+        :Conversions:
+
+            - ``CLOB`` / ``NCLOB``: Fetched as ``str``, rather than a LOB
+              locator requiring a round-trip per value.
+            - ``BLOB``: Fetched as ``bytes``.
+            - ``NUMBER``: Fetched as a native ``float`` if the column is
+              a ``FLOAT`` of up to 53 bits, or a decimal (scale > 0) of up
+              to 15 digits; both of which are exactly representable as a
+              double. Integer, unconstrained and wider decimal columns
+              keep the driver's default (exact) conversion.
+
+        Args:
+            cursor (oracledb.Cursor): The cursor being fetched.
+            *args (object): The column's description. The
+                ``python-oracledb`` driver passes a single
+                ``FetchInfo`` object, while the ``cx_Oracle`` driver
+                passes the ``(name, default_type, size, precision,
+                scale)`` values.
+
+        Returns:
+            object: A cursor variable for the column, or None to use the
+            driver's default conversion.
+
+        """
+        # pylint: disable=too-many-return-statements
+        if len(args) == 1:
+            info = args[0]
+            default_type, precision, scale = info.type_code, info.precision, info.scale
+        else:
+            _, default_type, _, precision, scale = args
+        dbapi = self.dbapi
+        if default_type == dbapi.DB_TYPE_CLOB:
+            return cursor.var(dbapi.DB_TYPE_LONG, arraysize=cursor.arraysize)
+        if default_type == dbapi.DB_TYPE_NCLOB:
+            return cursor.var(dbapi.DB_TYPE_LONG_NVARCHAR, arraysize=cursor.arraysize)
+        if default_type == dbapi.DB_TYPE_BLOB:
+            return cursor.var(dbapi.DB_TYPE_LONG_RAW, arraysize=cursor.arraysize)
+        if default_type == dbapi.DB_TYPE_NUMBER:
+            precision, scale = precision or 0, scale or 0
+            # A FLOAT column reports a scale of -127 and a binary precision.
+            if (scale == -127 and 0 < precision <= 53) or (scale > 0 and precision <= 15):
+                return cursor.var(dbapi.DB_TYPE_BINARY_DOUBLE, arraysize=cursor.arraysize)
+        return None
+
+    def _report_cxo_error(self, msg: str, error: oracledb.DatabaseError):
+        """Report an Oracle driver error to the terminal.
 
         Args:
             msg (str): Additional error to be displayed. This message
                 will be automatically prefixed with '[DatabaseError]: '
-            error (cx_Oracle.DatabaseError): Caught error object from the
+            error (oracledb.DatabaseError): Caught error object from the
                 try/except block.
 
         """
@@ -204,18 +744,96 @@ class _DBIOracle(_DBIBase):
         ui.print_alert(text=errr)
 
     @staticmethod
-    def _result_to_df__refcursor(refcur: cx_Oracle.Cursor) -> pd.DataFrame:
-        """Convert a ``cx_Oracle.Cursor`` object to a DataFrame.
+    def _select_limited(table: str, where: str, order_by: str, n: int) -> str:
+        """Build an ordered ``SELECT`` statement returning at most *n* rows.
+
+        This method overrides the base class' ``LIMIT`` syntax with the
+        Oracle (12c+) ``FETCH FIRST`` syntax.
+
+        Args:
+            table (str): Name of the table to be queried.
+            where (str): The filter, *without* the ``WHERE`` keyword. May
+                be an empty string.
+            order_by (str): The ``ORDER BY`` column list.
+            n (int): Maximum number of rows to be returned.
+
+        Returns:
+            str: The limited ``SELECT`` statement.
+
+        """
+        where = f' WHERE {where}' if where else ''
+        return f'SELECT * FROM {table}{where} ORDER BY {order_by} FETCH FIRST {int(n)} ROWS ONLY'
+
+    def _shareable(self) -> bool:
+        """Test if the interface's engine can be shared.
+
+        An engine created over a native session pool is not shared, as
+        the pool is owned (and closed) by the interface.
+
+        Returns:
+            bool: True if the engine can be shared, otherwise False.
+
+        """
+        return super()._shareable() and not self._native_pool
+
+    def _staging_table(self, target: str, columns: list) -> tuple[str, str, None]:
+        """Build the statement used to create an upsert's staging table.
+
+        This method overrides the base class' ``CREATE TEMPORARY TABLE``
+        syntax with an Oracle (18c+) *private* temporary table, which is
+        dropped by the database on COMMIT.
+
+        Args:
+            target (str): The qualified name of the target table.
+            columns (list): The quoted columns to be staged.
+
+        Returns:
+            tuple[str, str, None]: The name of the staging table, the
+            ``CREATE`` statement and None, as no ``DROP`` statement is
+            required.
+
+        """
+        name = f'ORA$PTT_DBILIB_{uuid.uuid4().hex[:16].upper()}'
+        return (name,
+                (f'CREATE PRIVATE TEMPORARY TABLE {name} ON COMMIT DROP DEFINITION '
+                 f'AS SELECT {", ".join(columns)} FROM {target} WHERE 1 = 0'),
+                None)
+
+    @contextlib.contextmanager
+    def _statement_timeout(self, conn: sa.engine.base.Connection, timeout: float):
+        """Apply a statement timeout to a connection.
+
+        The connection's ``call_timeout`` (in milliseconds) is set for
+        the duration of the block, and restored on exit. The timeout
+        applies to each round-trip to the database.
+
+        Args:
+            conn (sa.engine.base.Connection): The connection to which the
+                timeout is applied.
+            timeout (float): The timeout, in seconds.
+
+        """
+        dbapi_conn = conn.connection.dbapi_connection
+        orig = dbapi_conn.call_timeout
+        dbapi_conn.call_timeout = max(1, int(timeout * 1000))
+        try:
+            yield
+        finally:
+            if not conn.invalidated:
+                dbapi_conn.call_timeout = orig
 
-        If the cursor did not return results, an empty DataFrame
-        containing the column names only, is returned.
+    def _tune_cursor(self, cur: oracledb.Cursor) -> oracledb.Cursor:
+        """Apply the fetch tuning settings to a cursor.
 
         Args:
-            refcur (cx_Oracle.Cursor): Object to be converted.
+            cur (oracledb.Cursor): The cursor to be tuned.
 
         Returns:
-            pd.DataFrame: A ``pandas.DataFrame`` object containing the
-            cursor's data.
+            oracledb.Cursor: The same cursor, for convenience.
 
         """
-        return pd.DataFrame(refcur, columns=[i[0] for i in refcur.description])
+        cur.arraysize = self._arraysize
+        cur.prefetchrows = self._prefetchrows
+        if self._native_types:
+            cur.outputtypehandler = self._output_type_handler
+        return cur
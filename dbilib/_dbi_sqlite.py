@@ -22,13 +22,22 @@
 # Silence the spurious IDE-based error.
 # pylint: disable=import-error
 
+import contextlib
+import functools
+import os
+import sqlalchemy as sa
+import sqlite3
+import time
+import uuid
+import zlib
 from utils4 import utils
+from utils4.reporterror import reporterror
 from utils4.user_interface import ui
 # locals
 try:
-    from ._dbi_base import _DBIBase
+    from ._dbi_base import _DBIBase, ExitCode
 except ImportError:
-    from _dbi_base import _DBIBase
+    from _dbi_base import _DBIBase, ExitCode
 
 
 class _DBISQLite(_DBIBase):
@@ -46,6 +55,61 @@ class _DBISQLite(_DBIBase):
     Args:
         connstr (str): The database-specific SQLAlchemy connection
             string.
+        pragmas (str | dict, optional): The PRAGMA settings applied to
+            each new connection. Either the name of a preset profile (see
+            below), or a dictionary of ``{pragma: value}`` pairs. Defaults
+            to None, which uses SQLite's default settings. For a
+            read-only connection, the PRAGMAs which write to the database
+            file (e.g. ``journal_mode``) are not applied.
+        read_only (bool, optional): Open the database file in read-only
+            mode (``mode=ro``). Defaults to False.
+        immutable (bool, optional): Open the database file as
+            *immutable*, which implies read-only, and disables all
+            locking and change detection. Only use this option if the
+            file is **guaranteed** not to be changed by any process while
+            it is open. Defaults to False.
+        in_memory (bool, optional): Load the database file into a
+            shared-cache, in-memory database, and connect to that
+            instead. Changes are *not* written back to the file. This is
+            designed for hot lookup (reference) databases. Defaults to
+            False.
+        **kwargs (object): Keyword arguments passed into the base
+            class. For example, ``retry`` (the policy used to retry
+            operations which fail because the database is locked),
+            ``shared`` (private in-memory databases are never shared) or
+            ``replicas``. Refer to the :class:`_dbi_base._DBIBase` class.
+
+    :Connection Modes:
+
+        In addition to database file paths, the following connection
+        strings are supported:
+
+            - In-memory databases: ``'sqlite://'`` or
+              ``'sqlite:///:memory:'``. As each in-memory connection is
+              its own database, a single connection is shared by the
+              interface (via a ``StaticPool``).
+            - URI filenames: For example,
+              ``'sqlite:///file:/path/to/database.db?mode=ro&uri=true'``.
+              The ``read_only`` and ``immutable`` arguments build this
+              form of connection string for you.
+
+    :PRAGMA Profiles:
+
+        The following preset profiles are available:
+
+            - ``'safe'``: WAL journal with ``synchronous=FULL``. Durable
+              on power loss, while readers do not block on writers.
+            - ``'read-heavy'``: WAL journal with ``synchronous=NORMAL``,
+              a 256 MiB ``mmap_size`` and 64 MiB page cache. For lookup
+              and reporting workloads.
+            - ``'bulk-load'``: WAL journal with ``synchronous=OFF`` and
+              a 256 MiB page cache. The fastest writes; however, a
+              power loss (not an application crash) may corrupt the
+              database.
+
+        All profiles use ``temp_store=MEMORY`` and a ``busy_timeout``,
+        so a connection waits for a lock rather than failing
+        immediately.
 
     :Example Use:
 
@@ -59,12 +123,221 @@ class _DBISQLite(_DBIBase):
                 def __init__(self, connstr: str):
                     super().__init__(connstr=('sqlite:////path/to/database.db'))
 
+
+        A PRAGMA profile can be applied to the interface's connections
+        as::
+
+            >>> dbi = DBInterface(connstr='sqlite:////path/to/database.db',
+                                  pragmas='read-heavy')
+
+
+        A reference database can be loaded into memory for fast
+        lookups as::
+
+            >>> dbi = DBInterface(connstr='sqlite:////path/to/reference.db',
+                                  in_memory=True)
+
     """
 
-    def __init__(self, connstr: str):
+    _PRAGMA_PROFILES = {
+        'safe': {'journal_mode': 'WAL',
+                 'synchronous': 'FULL',
+                 'temp_store': 'MEMORY',
+                 'busy_timeout': 5000},
+        'read-heavy': {'journal_mode': 'WAL',
+                       'synchronous': 'NORMAL',
+                       'mmap_size': 268435456,    # 256 MiB
+                       'cache_size': -65536,      # 64 MiB (negative value is KiB)
+                       'temp_store': 'MEMORY',
+                       'busy_timeout': 5000},
+        'bulk-load': {'journal_mode': 'WAL',
+                      'synchronous': 'OFF',
+                      'cache_size': -262144,      # 256 MiB
+                      'temp_store': 'MEMORY',
+                      'busy_timeout': 30000},
+    }
+
+    # PRAGMAs which write to the database file; which are not applied to
+    # read-only connections.
+    _PRAGMA_WRITES = ('application_id', 'auto_vacuum', 'journal_mode', 'page_size', 'user_version')
+
+    # The database (or a table) is locked by another connection.
+    _TRANSIENT_ERRORS = ('database is locked', 'database table is locked')
+    # A statement cancelled by the progress handler.
+    _TIMEOUT_ERRORS = ('interrupted',)
+    # Number of virtual machine instructions between progress handler calls.
+    _PROGRESS_STEPS = 1000
+
+    def __init__(self,
+                 connstr: str,
+                 pragmas: str | dict=None,
+                 *,
+                 read_only: bool=False,
+                 immutable: bool=False,
+                 in_memory: bool=False,
+                 **kwargs):
         """SQLite database interface initialiser."""
-        super().__init__(connstr=connstr)
-        self._verify_db_exists()
+        self._pragmas = self._build_pragmas(pragmas=pragmas)
+        self._keeper = None
+        self._source = None
+        url = sa.engine.make_url(connstr)
+        for cstr in (connstr, *(kwargs.get('replicas') or ())):
+            self._verify_db_exists(url=sa.engine.make_url(cstr))
+        if in_memory:
+            self._source = url.database
+            connstr = f'sqlite:///file:dbilib_{uuid.uuid4().hex}?mode=memory&cache=shared&uri=true'
+        elif read_only or immutable:
+            query = {'mode': 'ro', 'uri': 'true'} | ({'immutable': '1'} if immutable else {})
+            connstr = (url.set(database=f'file:{self._file_path(url=url)}', query=query)
+                          .render_as_string(hide_password=False))
+        if read_only or immutable or url.query.get('mode') == 'ro':
+            self._pragmas = {k: v for k, v in self._pragmas.items() if k not in self._PRAGMA_WRITES}
+        super().__init__(connstr=connstr, **kwargs)
+        if in_memory:
+            self._load_into_memory()
+
+    @property
+    def pragmas(self) -> dict:
+        """Accessor to the PRAGMA settings applied to each connection."""
+        return dict(self._pragmas)
+
+    def backup(self,
+               table_name: str=None,
+               target: str=None,
+               *,
+               pages: int=256,
+               sleep: float=0.005,
+               progress: callable=None,
+               verbose: bool=True) -> ExitCode:
+        """Backup the database using SQLite's online backup API.
+
+        The database is copied ``pages`` pages at a time, releasing the
+        source database's lock (and sleeping for ``sleep`` seconds)
+        between each step, so live readers and writers are not blocked
+        for the duration of the backup. If the source database is
+        modified by another connection during the backup, SQLite
+        restarts the backup automatically.
+
+        Once complete, the backup is verified by checksum. If a table
+        name is provided, only that table's checksum is compared.
+        Otherwise, the checksum of every table in the database is
+        compared.
+
+        Args:
+            table_name (str, optional): Name of the table to be verified.
+                Note: The backup API copies the *whole* database.
+                Defaults to None, which verifies every table.
+            target (str, optional): Path to the backup file. If the file
+                exists, it is overwritten. Defaults to None, which uses
+                the database file's name prefixed with ``'__bak__'``, in
+                the same directory. Required for an in-memory database.
+            pages (int, optional): Number of pages copied per step. A
+                value of -1 (or 0) copies the database in a single step.
+                Defaults to 256.
+            sleep (float, optional): Seconds to sleep between steps.
+                Defaults to 0.005.
+            progress (callable, optional): A callable which is called
+                after each step as ``progress(status, remaining, total)``,
+                where ``remaining`` and ``total`` are page counts. This
+                can be used to report the backup's progress and
+                throughput. Defaults to None.
+            verbose (bool, optional): Display helpful text indicating the
+                status of the backup. Defaults to True.
+
+        :Example:
+
+            Backup a database, reporting the progress::
+
+                >>> def report(status, remaining, total):
+                        print(f'{total - remaining} of {total} pages copied.')
+
+                >>> dbi.backup(target='/path/to/backup.db', progress=report)
+
+        Raises:
+            ValueError: If a target is not provided for an in-memory
+                database.
+
+        Returns:
+            ExitCode: The exit code enumerator object associated to the
+            status of the backup process.
+
+        """
+        if not target:
+            # The connection string's database may be a URI filename.
+            src = self.execute_query('PRAGMA database_list', primary=True, raise_errors=True)[0][2]
+            if not src:
+                raise ValueError('A target is required to backup an in-memory database.')
+            target = os.path.join(os.path.dirname(src), f'__bak__{os.path.basename(src)}')
+        s1, s2, s3 = True, False, False
+        if table_name:
+            s1 = self.table_exists(table_name=table_name, verbose=verbose)
+        if s1: s2 = self.database_exists(database_name=os.path.dirname(target) or '.',
+                                         verbose=verbose)
+        if s2: s3 = self._backup(target=target,
+                                 table_name=table_name,
+                                 pages=pages,
+                                 sleep=sleep,
+                                 progress=progress)
+        if verbose: self._print_summary(success=all((s1, s2, s3)))
+        if not s1: return ExitCode.ERR_BKUP_TBNEX
+        if not s2: return ExitCode.ERR_BKUP_DBNEX
+        if not s3: return ExitCode.ERR_BKUP_CKSUM
+        return ExitCode.OK
+
+    def checksum(self, table_name: str, database_name: str=None) -> int | None:
+        """Calculate a hash (checksum) on the given table.
+
+        Args:
+            table_name (str) Name of the table against which the checksum
+                is to be calculated.
+            database_name (str) Name of the (attached) database schema to
+                use; for example ``'main'``, or the name given to an
+                ``ATTACH DATABASE`` statement. Defaults to None.
+
+        As SQLite does not provide a hashing function, each row is
+        hashed by the ``dbilib_hash`` function, which is registered on
+        each connection, and the hashes are summed.
+
+        Raises:
+            sqlalchemy.exc.SQLAlchemyError: If the checksum query fails.
+
+        Returns:
+            int | None: An integer representation of the table's hash
+            value, if the table exists. Otherwise, None.
+
+        """
+        cols = self._columns(table_name=table_name, database_name=database_name)
+        if not cols:
+            return None
+        table = self._qualified_name(table_name=table_name, database_name=database_name)
+        stmt = f'SELECT COALESCE(SUM(dbilib_hash({cols})), 0) FROM {table}'
+        return self.execute_query(stmt, raise_errors=True)[0][0]
+
+    def close(self):
+        """Close the interface, its engine and any in-memory database."""
+        super().close()
+        if self._keeper is not None:
+            self._keeper.close()
+            self._keeper = None
+
+    def database_exists(self, database_name: str, verbose: bool=False) -> bool:
+        """Test if the given database file (or directory) exists.
+
+        Args:
+            database_name (str): Path to the database file, or directory
+                into which a database is to be written.
+            verbose (bool, optional): Print a message if the database
+                does not exist. Defaults to False.
+
+        Returns:
+            bool: True if the given path exists, otherwise False.
+
+        """
+        exists = os.path.exists(database_name)
+        if (not exists) & verbose:
+            msg = f'Database does not exist: {database_name}'
+            ui.print_warning(text=msg)
+        return exists
 
     def table_exists(self, table_name: str, verbose: bool=False) -> bool:
         """Using the ``engine`` object, test if the given table exists.
@@ -88,12 +361,394 @@ class _DBISQLite(_DBIBase):
             ui.print_warning(text=msg)
         return exists
 
-    def _verify_db_exists(self):
+    def _backup(self,
+                target: str,
+                table_name: str,
+                pages: int,
+                sleep: float,
+                progress: callable) -> bool:
+        """Perform the database backup to the target file.
+
+        Args:
+            target (str): Path to the backup file.
+            table_name (str): Name of the table to be verified, or None
+                to verify every table.
+            pages (int): Number of pages copied per step.
+            sleep (float): Seconds to sleep between steps.
+            progress (callable): Progress callback, or None.
+
+        Returns:
+            bool: True if the backup was successful, otherwise False.
+            A successful backup is determined by verifying matching table
+            checksum values between the origin and backup databases.
+
+        """
+        try:
+            with self._engine.connect() as conn, sqlite3.connect(target) as dst:
+                conn.connection.dbapi_connection.backup(dst,
+                                                        pages=pages,
+                                                        progress=progress,
+                                                        sleep=sleep)
+            dst.close()
+            with _DBISQLite(connstr=f'sqlite:///{target}') as bak:
+                if table_name:
+                    ck1 = self.checksum(table_name=table_name)
+                    ck2 = bak.checksum(table_name=table_name)
+                else:
+                    ck1 = self._checksum_all()
+                    ck2 = bak._checksum_all()  # pylint: disable=protected-access
+            return ck1 == ck2
+        except Exception as err:
+            reporterror(err)
+        return False
+
+    def _block_checksum_stmt(self,
+                             table_name: str,
+                             database_name: str,
+                             key: str,
+                             block_size: int,
+                             where: str) -> str:
+        """Build the statement used to calculate block checksums.
+
+        Each row is hashed by the ``dbilib_hash`` function, and the
+        hashes are summed per block.
+
+        Args:
+            table_name (str): Name of the table.
+            database_name (str): Attached database schema of the table,
+                or None.
+            key (str): The quoted key column.
+            block_size (int): Key range spanned by each block.
+            where (str): The ``WHERE`` clause (including the keyword),
+                or an empty string.
+
+        Returns:
+            str: A statement returning a
+            ``(block, min_key, max_key, row_count, checksum)`` row for
+            each block.
+
+        """
+        cols = self._columns(table_name=table_name, database_name=database_name)
+        table = self._qualified_name(table_name=table_name, database_name=database_name)
+        return (f'SELECT {key} / {block_size}, MIN({key}), MAX({key}), COUNT(*), '
+                f'SUM(dbilib_hash({cols})) FROM {table} {where} GROUP BY 1')
+
+    @classmethod
+    def _build_pragmas(cls, pragmas: str | dict) -> dict:
+        """Build and validate the PRAGMA settings.
+
+        Args:
+            pragmas (str | dict): The name of a preset profile, or a
+                dictionary of ``{pragma: value}`` pairs.
+
+        Raises:
+            ValueError: If the profile name is not recognised, or a
+                pragma name or value is invalid.
+
+        Returns:
+            dict: The validated ``{pragma: value}`` settings.
+
+        """
+        if not pragmas:
+            return {}
+        if isinstance(pragmas, str):
+            if pragmas not in cls._PRAGMA_PROFILES:
+                raise ValueError(f'Invalid PRAGMA profile: {pragmas}. '
+                                 f'Options are: {list(cls._PRAGMA_PROFILES)}')
+            return dict(cls._PRAGMA_PROFILES[pragmas])
+        for key, val in pragmas.items():
+            # The values are written into the PRAGMA statement, as PRAGMAs
+            # do not accept bind parameters.
+            if not (key.isidentifier() and (isinstance(val, int) or str(val).isidentifier())):
+                raise ValueError(f'Invalid PRAGMA setting: {key} = {val}')
+        return dict(pragmas)
+
+    def _checksum_all(self) -> dict:
+        """Calculate the checksum of every table in the database.
+
+        Returns:
+            dict: A dictionary of ``{table_name: checksum}`` pairs.
+
+        """
+        stmt = ('select name from sqlite_master '
+                'where type = \'table\' '
+                'and name not like \'sqlite_%\'')
+        return {r[0]: self.checksum(table_name=r[0]) for r in self.execute_query(stmt) or []}
+
+    def _columns(self, table_name: str, database_name: str=None) -> str:
+        """Collect the table's quoted column names, as a column list.
+
+        Args:
+            table_name (str): Name of the table.
+            database_name (str, optional): Attached database schema of
+                the table. Defaults to None.
+
+        Returns:
+            str: The comma separated column list, or an empty string if
+            the table does not exist.
+
+        """
+        quote = self._engine.dialect.identifier_preparer.quote
+        schema = f'{quote(database_name)}.' if database_name else ''
+        rows = self.execute_query(f'PRAGMA {schema}table_info({quote(table_name)})') or []
+        return ', '.join(quote(r[1]) for r in rows)
+
+    def _create_engine(self, connstr: str) -> sa.engine.base.Engine:
+        """Create a database engine using the provided environment.
+
+        Private in-memory databases are served by a single, shared
+        connection, as each new connection would be a new (empty)
+        database. Shared-cache in-memory databases use the base class'
+        connection pool, as each connection sees the same database.
+        Otherwise, the engine is created by the base class.
+
+        Args:
+            connstr (str): The connection string; either the primary's,
+                or a replica's.
+
+        Returns:
+            sqlalchemy.engine.base.Engine: A sqlalchemy database engine
+            object.
+
+        """
+        url = sa.engine.make_url(connstr)
+        if not self._is_memory(url=url):
+            engine = super()._create_engine(connstr=connstr)
+        elif url.query.get('mode') == 'memory':
+            engine = sa.create_engine(url=url,
+                                      poolclass=sa.pool.QueuePool,
+                                      pool_size=20,
+                                      pool_timeout=30,
+                                      max_overflow=0,
+                                      connect_args={'check_same_thread': False})
+        else:
+            engine = sa.create_engine(url=url,
+                                      poolclass=sa.pool.StaticPool,
+                                      connect_args={'check_same_thread': False})
+        # The listeners must not reference the instance, as the engine
+        # may be shared.
+        sa.event.listen(engine, 'connect', functools.partial(self._on_connect,
+                                                             pragmas=self._pragmas))
+        sa.event.listen(engine, 'begin', self._on_begin)
+        return engine
+
+    def _engine_options(self) -> dict:
+        """Return the interface options which affect the engine.
+
+        Returns:
+            dict: The engine options.
+
+        """
+        return {'pragmas': self._pragmas}
+
+    @staticmethod
+    def _file_path(url: sa.URL) -> str:
+        """Extract the database file path from the connection URL.
+
+        Args:
+            url (sqlalchemy.URL): The connection string's URL object.
+
+        Returns:
+            str: The file path, with any ``file:`` URI prefix removed.
+
+        """
+        path = url.database
+        return path[5:] if path.startswith('file:') else path
+
+    @staticmethod
+    def _hash(*values) -> int:
+        """Hash a row's values; registered as the ``dbilib_hash`` function.
+
+        Args:
+            *values (object): The row's column values.
+
+        Returns:
+            int: The CRC32 hash of the row's values.
+
+        """
+        return zlib.crc32(repr(values).encode())
+
+    @staticmethod
+    def _is_memory(url: sa.URL) -> bool:
+        """Test if the connection URL refers to an in-memory database.
+
+        Args:
+            url (sqlalchemy.URL): The connection string's URL object.
+
+        Returns:
+            bool: True if the database is in-memory, otherwise False.
+
+        """
+        return url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+
+    def _load_into_memory(self):
+        """Load the source database file into the shared in-memory
+        database.
+
+        A 'keeper' connection is opened and held for the life of the
+        instance, as a shared-cache, in-memory database is destroyed
+        when its last connection is closed. The keeper is kept outside
+        of the connection pool, so recycling the pool's connections
+        cannot destroy the database.
+
+        """
+        url = sa.engine.make_url(self._connstr)
+        uri = f'{url.database}?mode=memory&cache=shared'
+        self._keeper = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        with sqlite3.connect(self._source) as src:
+            src.backup(self._keeper)
+        src.close()
+
+    @staticmethod
+    def _on_begin(conn: sa.engine.base.Connection):
+        """Emit the ``BEGIN`` statement; the ``begin`` event listener.
+
+        As the ``sqlite3`` library's implicit transaction handling is
+        disabled (see :meth:`_on_connect`), the transaction is started
+        explicitly, so ``SAVEPOINT`` statements (used by nested
+        transactions) are always within the transaction.
+
+        Args:
+            conn (sa.engine.base.Connection): The connection on which
+                the transaction is started.
+
+        """
+        conn.exec_driver_sql('BEGIN')
+
+    @staticmethod
+    def _on_connect(dbapi_conn, conn_record, pragmas: dict):
+        """Prepare each new DBAPI connection; the ``connect`` event listener.
+
+        :Tasks:
+            - Disable the ``sqlite3`` library's implicit transaction
+              handling, which otherwise only begins a transaction before
+              a DML statement. Transactions are started by the
+              :meth:`_on_begin` listener instead.
+            - Register the ``dbilib_hash`` function, which is used by the
+              checksum methods.
+            - Apply the PRAGMA settings.
+
+        Args:
+            dbapi_conn (sqlite3.Connection): The new DBAPI connection.
+            conn_record (sqlalchemy.pool._ConnectionRecord): The pool's
+                connection record. (Unused)
+            pragmas (dict): The PRAGMA settings to be applied.
+
+        """
+        # pylint: disable=unused-argument  # Listener signature.
+        dbapi_conn.isolation_level = None
+        dbapi_conn.create_function('dbilib_hash', -1, _DBISQLite._hash, deterministic=True)
+        cur = dbapi_conn.cursor()
+        for key, val in pragmas.items():
+            cur.execute(f'PRAGMA {key} = {val}')
+        cur.close()
+
+    @staticmethod
+    def _print_summary(success: bool) -> None:
+        """Print a short end-of-processing summary.
+
+        Args:
+            success (bool): Flag indicating if the backup was successful.
+
+        """
+        if success:
+            ui.print_normal('Database backup successful.')
+        else:
+            ui.print_warning('Database backup failed.')
+
+    def _shareable(self) -> bool:
+        """Test if the interface's engine can be shared.
+
+        A private in-memory database is not shared, as each interface
+        expects its own (empty) database.
+
+        Returns:
+            bool: True if the engine can be shared, otherwise False.
+
+        """
+        url = sa.engine.make_url(self._connstr)
+        return (super()._shareable()
+                and (url.query.get('mode') == 'memory' or not self._is_memory(url=url)))
+
+    @contextlib.contextmanager
+    def _statement_timeout(self, conn: sa.engine.base.Connection, timeout: float):
+        """Apply a statement timeout to a connection.
+
+        A progress handler is installed on the DBAPI connection, which
+        is called every :attr:`_PROGRESS_STEPS` virtual machine
+        instructions and interrupts the statement once the deadline has
+        passed. The handler is removed on exit.
+
+        Args:
+            conn (sa.engine.base.Connection): The connection to which the
+                timeout is applied.
+            timeout (float): The timeout, in seconds.
+
+        """
+        deadline = time.monotonic() + timeout
+        dbapi_conn = conn.connection.dbapi_connection
+        dbapi_conn.set_progress_handler(lambda: time.monotonic() > deadline, self._PROGRESS_STEPS)
+        try:
+            yield
+        finally:
+            dbapi_conn.set_progress_handler(None, self._PROGRESS_STEPS)
+
+    def _timeout_invalidate(self, conn: sa.engine.base.Connection):
+        """Invalidate a connection on which a statement timed out.
+
+        An interrupted SQLite connection remains usable. However, file
+        database connections are invalidated for consistency with the
+        other databases. In-memory database connections are *not*
+        invalidated, as closing the connection may destroy the database.
+
+        Args:
+            conn (sa.engine.base.Connection): The connection.
+
+        """
+        if not self._is_memory(url=conn.engine.url):
+            conn.invalidate()
+
+    @staticmethod
+    def _upsert_stmt(target: str, staging: str, columns: list, keys: list, update: list) -> str:
+        """Build the statement which merges the staging table into the
+        target table.
+
+        This method overrides the base class' ``MERGE`` syntax with the
+        SQLite (3.24+) ``INSERT ... ON CONFLICT`` syntax.
+
+        Args:
+            target (str): The qualified name of the target table.
+            staging (str): The name of the staging table.
+            columns (list): The quoted columns to be inserted.
+            keys (list): The quoted key columns.
+            update (list): The quoted columns to be updated for an
+                existing row. If empty, existing rows are not updated.
+
+        Returns:
+            str: The ``INSERT ... ON CONFLICT`` statement.
+
+        """
+        cols = ', '.join(columns)
+        sets = ', '.join(f'{c} = excluded.{c}' for c in update)
+        action = f'DO UPDATE SET {sets}' if update else 'DO NOTHING'
+        # The WHERE clause resolves the parsing ambiguity of an ON CONFLICT
+        # clause following a SELECT.
+        return (f'INSERT INTO {target} ({cols}) SELECT {cols} FROM {staging} WHERE 1 '
+                f'ON CONFLICT ({", ".join(keys)}) {action}')
+
+    def _verify_db_exists(self, url: sa.URL):
         """Verify the database file exists.
 
+        In-memory databases are not verified.
+
+        Args:
+            url (sqlalchemy.URL): The connection string's URL object.
+
         Raises:
             FileNotFoundError: Raised if the database file passed via the
             connection string does not exist.
 
         """
-        utils.fileexists(filepath=self.engine.url.database, error='raise')
+        if self._is_memory(url=url):
+            return
+        utils.fileexists(filepath=self._file_path(url=url), error='raise')
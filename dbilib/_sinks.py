@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+:Purpose:   This module contains the *sink* adaptors to which streamed
+            query results are written, for example by the
+            :meth:`_dbi_base._DBIBase.parallel_extract` method.
+
+:Platform:  Linux/Windows | Python 3.10+
+:Developer: J Berendt
+:Email:     support@s3dev.uk
+
+:Comments:  The following sinks are supported:
+
+                - A callable, which is passed each chunk.
+                - A ``queue.Queue`` object, into which each chunk is put.
+                  If the queue is bounded, a full queue *blocks* the
+                  producer, providing backpressure.
+                - A directory path (``str``), into which a Parquet file
+                  is written for each partition. This sink requires the
+                  ``pyarrow`` library, which is imported only if this
+                  sink is used.
+
+:Example:
+
+    For usage examples, please refer to the docstring for the
+    :meth:`_dbi_base._DBIBase.parallel_extract` method.
+
+"""
+# pylint: disable=import-error
+# pylint: disable=import-outside-toplevel  # Optional dependencies.
+
+from __future__ import annotations
+
+import os
+import pandas as pd
+import queue
+import threading
+from utils4 import utils
+
+
+class _Sink:
+    """Base sink class, defining the sink interface.
+
+    Each sink is written to *concurrently* by the partition workers.
+    Therefore, any sink-specific state must be keyed by partition, or
+    protected by the sink's lock.
+
+    """
+
+    def __init__(self):
+        """Sink base class initialiser."""
+        self._lock = threading.Lock()
+
+    def close(self, part: int):
+        """Notify the sink that the given partition is complete.
+
+        Args:
+            part (int): Index of the completed partition.
+
+        """
+
+    def write(self, part: int, chunk: list | pd.DataFrame, keys: list):
+        """Write a chunk of data to the sink.
+
+        Args:
+            part (int): Index of the partition to which the chunk
+                belongs.
+            chunk (list | pd.DataFrame): The chunk of data.
+            keys (list): The column names for the chunk.
+
+        """
+        raise NotImplementedError()
+
+
+class _CallbackSink(_Sink):
+    """Pass each chunk to a callable.
+
+    The callable is called with ``(part, chunk)`` arguments. Calls are
+    serialised by the sink's lock, so the callable need not be
+    thread-safe.
+
+    """
+
+    def __init__(self, func: callable):
+        """Callback sink initialiser."""
+        super().__init__()
+        self._func = func
+
+    def write(self, part: int, chunk: list | pd.DataFrame, keys: list):
+        """Pass the chunk to the callable."""
+        with self._lock:
+            self._func(part, chunk)
+
+
+class _QueueSink(_Sink):
+    """Put each chunk onto a queue, as a ``(part, chunk)`` tuple.
+
+    Once a partition is complete, a ``(part, None)`` sentinel is put
+    onto the queue.
+
+    """
+
+    def __init__(self, q: queue.Queue):
+        """Queue sink initialiser."""
+        super().__init__()
+        self._q = q
+
+    def close(self, part: int):
+        """Put the end-of-partition sentinel onto the queue."""
+        self._q.put((part, None))
+
+    def write(self, part: int, chunk: list | pd.DataFrame, keys: list):
+        """Put the chunk onto the queue, blocking if the queue is full."""
+        self._q.put((part, chunk))
+
+
+class _ParquetSink(_Sink):
+    """Write each partition to its own Parquet file.
+
+    The files are written incrementally (one row group per chunk), so
+    only a single chunk per partition is held in memory.
+
+    """
+
+    def __init__(self, path: str, stem: str):
+        """Parquet sink initialiser.
+
+        Args:
+            path (str): Directory into which the files are written.
+            stem (str): File name stem. Files are named
+                ``<stem>_part<NNNN>.parquet``.
+
+        """
+        if not utils.testimport('pyarrow', verbose=False):
+            raise ModuleNotFoundError('The pyarrow library is required for Parquet sinks.')
+        super().__init__()
+        os.makedirs(path, exist_ok=True)
+        self._path = path
+        self._stem = stem
+        self._writers = {}
+
+    def close(self, part: int):
+        """Close the partition's Parquet file."""
+        with self._lock:
+            writer = self._writers.pop(part, None)
+        if writer:
+            writer.close()
+
+    def write(self, part: int, chunk: list | pd.DataFrame, keys: list):
+        """Append the chunk to the partition's Parquet file."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if not isinstance(chunk, pd.DataFrame):
+            chunk = pd.DataFrame(chunk, columns=keys)
+        tbl = pa.Table.from_pandas(chunk, preserve_index=False)
+        with self._lock:
+            writer = self._writers.get(part)
+            if writer is None:
+                fpath = os.path.join(self._path, f'{self._stem}_part{part:04d}.parquet')
+                writer = self._writers[part] = pq.ParquetWriter(fpath, schema=tbl.schema)
+        writer.write_table(tbl.cast(writer.schema))
+
+
+def make_sink(sink: callable | queue.Queue | str, stem: str='data') -> _Sink:
+    """Create the sink adaptor appropriate for the given object.
+
+    Args:
+        sink (callable | queue.Queue | str): The object to which the
+            data is to be written. Refer to the module docstring for
+            the supported sinks.
+        stem (str, optional): File name stem used by file-based sinks.
+            Defaults to 'data'.
+
+    Raises:
+        TypeError: If the sink type is not supported.
+
+    Returns:
+        _Sink: The sink adaptor.
+
+    """
+    if isinstance(sink, _Sink):
+        return sink
+    if isinstance(sink, queue.Queue):
+        return _QueueSink(q=sink)
+    if isinstance(sink, (str, os.PathLike)):
+        return _ParquetSink(path=sink, stem=stem)
+    if callable(sink):
+        return _CallbackSink(func=sink)
+    raise TypeError(f'Unsupported sink type: {type(sink).__name__}')
@@ -16,6 +16,10 @@
     for the following classes:
 
         - :class:`DBInterface`
+        - :class:`ShardedInterface`
+
+    For copying a table between databases, please refer to the
+    docstring for the :func:`copy_table` function.
 
 """
 # This enables a single module installed test, rather than two.
@@ -23,14 +27,32 @@
 # Silence the spurious IDE-based error.
 # pylint: disable=import-error
 
+from __future__ import annotations
+
+import contextlib
+import datetime as dt
+import decimal
+import functools
+import heapq
 import os
+import pandas as pd
+import queue
 import sys
 import sqlalchemy as sa
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from utils4 import utils
+from utils4.user_interface import ui
 
 # Set syspath to enable the private modules to import their db-specific class.
 sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
 
+# Re-exported from the module object used by the interfaces, so the
+# classes match those used (and raised) by the interfaces.
+# pylint: disable=wrong-import-position
+from _dbi_base import (AdmissionError, AdmissionPolicy, LazyResult, MemoryBudget,  # noqa: E402
+                       MemoryBudgetError, RetryPolicy, SpilledResult)
+
 
 class DBInterface:
     """This class holds the methods and properties which are used across
@@ -200,7 +222,9 @@ class DBInterface:
                 from _dbi_mysql import _DBIMySQL
                 return _DBIMySQL(connstr=connstr, *args, **kwargs)
         if name == 'oracle':  # pragma: nocover
-            if utils.testimport('cx_Oracle', verbose=False):
+            # Either the python-oracledb (preferred) or cx_Oracle driver.
+            if (utils.testimport('oracledb', verbose=False)
+                    or utils.testimport('cx_Oracle', verbose=False)):
                 from _dbi_oracle import _DBIOracle
                 return _DBIOracle(connstr=connstr, *args, **kwargs)
         if name == 'sqlite':
@@ -240,3 +264,521 @@ class DBInterface:
         name = _engine.name.lower()
         _engine.dispose(close=True)
         return name
+
+
+class ShardedInterface:
+    """Database interface over a set of identically structured databases
+    (shards), which runs each query on the shards concurrently.
+
+    Each shard is served by its own :class:`DBInterface` object (and
+    therefore, its own engine), and a query is executed on all, or a
+    selected subset of the shards, concurrently. The results are then
+    merged into a single result.
+
+    Args:
+        shards (dict | list | tuple): The shards' connection strings. If
+            a dictionary is provided, it is ``{name: connstr}`` pairs.
+            Otherwise, each shard is named by its index in the sequence.
+        max_workers (int, optional): Maximum number of shards queried
+            concurrently. Defaults to None, which queries all shards
+            concurrently.
+        **kwargs (object): Keyword arguments passed into each shard's
+            :class:`DBInterface`; for example ``retry``.
+
+    :Merging:
+
+        The per-shard results are merged using the ``merge`` argument of
+        the :meth:`execute_query` method, as either:
+
+            - ``'concat'``: The results are concatenated, in shard order.
+            - ``'ordered'``: The results, each of which *must already be
+              sorted* on the ``key`` (e.g. by an ``ORDER BY`` clause),
+              are merged into a single sorted result.
+            - A callable: A reducer, which is called as
+              ``merge(accumulated, result)`` to combine the results, in
+              shard order; as with ``functools.reduce``.
+
+    :Partial Failure:
+
+        If a query fails on a shard, the error is reported and the
+        shard's result is excluded from the merge, while the results of
+        the other shards are returned. The errors can be returned along
+        with the result, via the ``return_errors`` argument.
+
+    :Example Use:
+
+        Create a sharded interface over three MySQL databases::
+
+            >>> from dbilib.database import ShardedInterface
+
+            >>> shi = ShardedInterface(shards={'eu': connstr_eu,
+                                               'us': connstr_us,
+                                               'ap': connstr_ap})
+
+
+        Count the customers on all shards::
+
+            >>> shi.execute_query('select count(*) from customers',
+                                  merge=lambda a, b: [(a[0][0] + b[0][0],)])
+            [(42042,)]
+
+
+        Merge the sorted orders from the EU and US shards::
+
+            >>> df, errors = shi.execute_query(('select * from orders '
+                                                'order by order_date'),
+                                               raw=False,
+                                               shards=['eu', 'us'],
+                                               merge='ordered',
+                                               key='order_date',
+                                               return_errors=True)
+
+    """
+
+    _MERGES = ('concat', 'ordered')
+
+    def __init__(self, shards: dict | list | tuple, max_workers: int=None, **kwargs):
+        """Sharded database interface initialiser."""
+        if not isinstance(shards, dict):
+            shards = dict(enumerate(shards))
+        if not shards:
+            raise ValueError('At least one shard is required.')
+        self._max_workers = max_workers
+        self._shards = {name: DBInterface(connstr=connstr, **kwargs)
+                        for name, connstr in shards.items()}
+
+    def __enter__(self) -> ShardedInterface:
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Exit the context manager, and close the shards' interfaces."""
+        self.close()
+
+    @property
+    def shards(self) -> dict:
+        """Accessor to the shards' interfaces, as ``{name: interface}``."""
+        return dict(self._shards)
+
+    def close(self):
+        """Close each shard's interface."""
+        for dbi in self._shards.values():
+            dbi.close()
+
+    def execute_query(self,
+                      stmt: str,
+                      params: dict=None,
+                      *,
+                      raw: bool=True,
+                      shards: list | tuple=None,
+                      merge: str | callable='concat',
+                      key: str | int | callable=None,
+                      descending: bool=False,
+                      return_errors: bool=False,
+                      **kwargs) -> list | pd.DataFrame | tuple | None:
+        """Execute a query statement on the shards, and merge the results.
+
+        Args:
+            stmt (str): Statement to be executed on each shard.
+            params (dict, optional): Parameter key/value bindings.
+                Defaults to None.
+            raw (bool, optional): Return the data in 'raw' (list of
+                tuples) format, rather than as a DataFrame. Defaults to
+                True.
+            shards (list | tuple, optional): Names of the shards to be
+                queried. Defaults to None, which queries all shards.
+            merge (str | callable, optional): How the per-shard results
+                are merged. Refer to the class docstring. Defaults to
+                'concat'.
+            key (str | int | callable, optional): For an ``'ordered'``
+                merge, the sort key; a column name for DataFrames, a
+                column index for raw results, or a callable which is
+                passed each row. Defaults to None.
+            descending (bool, optional): For an ``'ordered'`` merge, the
+                results are sorted in descending order. Defaults to
+                False.
+            return_errors (bool, optional): Return the errors raised by
+                any failed shards. Defaults to False.
+            **kwargs (object): Keyword arguments passed into each shard's
+                :meth:`~_dbi_base._DBIBase.execute_query` method; for
+                example ``timeout``.
+
+        Raises:
+            KeyError: If a requested shard does not exist.
+            ValueError: If the merge method is not valid, or an
+                ``'ordered'`` merge is requested without a key.
+
+        Returns:
+            list | pd.DataFrame | tuple | None: The merged result, or
+            None if the query returned no results (or failed) on all
+            shards. If the ``return_errors`` argument is True, a tuple
+            of the merged result and the errors is returned as::
+
+                (result, {shard_name: error})
+
+        """
+        if not callable(merge) and merge not in self._MERGES:
+            raise ValueError(f'Invalid merge: {merge}. Expected one of: {self._MERGES}, '
+                             'or a callable.')
+        if merge == 'ordered' and key is None:
+            raise ValueError('A key is required for an ordered merge.')
+        names = list(self._shards) if shards is None else list(shards)
+        if missing := set(names) - set(self._shards):
+            raise KeyError(f'Shard(s) not found: {sorted(missing, key=str)}')
+        results, errors = {}, {}
+        with ThreadPoolExecutor(max_workers=self._max_workers or len(names)) as pool:
+            futures = {name: pool.submit(self._shards[name].execute_query,
+                                         stmt,
+                                         params=params,
+                                         raw=raw,
+                                         raise_errors=True,
+                                         **kwargs)
+                       for name in names}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as err:
+                    errors[name] = err
+                    ui.print_warning(text=f'\n[ShardError]: Shard {name!r} failed: {err}')
+        rtn = self._merge(results=[r for r in results.values() if r is not None],
+                          merge=merge,
+                          key=key,
+                          descending=descending)
+        return (rtn, errors) if return_errors else rtn
+
+    @staticmethod
+    def _merge(results: list,
+               merge: str | callable,
+               key: str | int | callable,
+               descending: bool) -> list | pd.DataFrame | None:
+        """Merge the per-shard results.
+
+        Args:
+            results (list): The shards' results, in shard order.
+            merge (str | callable): The merge method.
+            key (str | int | callable): The ordered merge's sort key.
+            descending (bool): Sort the ordered merge in descending order.
+
+        Returns:
+            list | pd.DataFrame | None: The merged result, or None if
+            there are no results to merge.
+
+        """
+        if not results:
+            return None
+        if callable(merge):
+            return functools.reduce(merge, results)
+        if isinstance(results[0], pd.DataFrame):
+            df = pd.concat(results, ignore_index=True)
+            if merge == 'ordered':
+                # A stable sort preserves the shard order of equal keys.
+                df = (df.sort_values(key, ascending=not descending, kind='stable')
+                        .reset_index(drop=True))
+            return df
+        if merge == 'ordered':
+            if callable(key):
+                keyfunc = key
+            elif isinstance(key, str):
+                keyfunc = lambda row: row._mapping[key]  # pylint: disable=protected-access
+            else:
+                keyfunc = lambda row: row[key]
+            return list(heapq.merge(*results, key=keyfunc, reverse=descending))
+        return [row for result in results for row in result]
+
+
+# Column types of a SELECT source, inferred from the Python type of the
+# first non-null value in each column.
+_PY_TYPES = {bool: sa.Boolean,
+             int: sa.BigInteger,
+             float: sa.Float,
+             decimal.Decimal: sa.Numeric,
+             str: sa.Text,
+             bytes: sa.LargeBinary,
+             dt.datetime: sa.DateTime,
+             dt.date: sa.Date,
+             dt.time: sa.Time}
+_IF_EXISTS = ('append', 'replace', 'fail')
+
+
+def copy_table(src_dbi: DBInterface,
+               dst_dbi: DBInterface,
+               table: str,
+               *,
+               source: str=None,
+               params: dict=None,
+               dst_table: str=None,
+               if_exists: str='append',
+               dtypes: dict=None,
+               chunksize: int=10000,
+               queue_size: int=4) -> int:
+    """Copy a table (or the result of a query) from one database to
+    another, as a pipeline.
+
+    The source is streamed via :meth:`~_dbi_base._DBIBase.iter_query`
+    on a reader thread, which puts each chunk onto a bounded queue. The
+    calling thread takes each chunk from the queue and bulk-inserts it
+    into the destination table, so the read and write run concurrently.
+    If the writer falls behind, the full queue blocks the reader, so at
+    most ``queue_size`` chunks are held in memory.
+
+    The rows are written within a single
+    :meth:`~_dbi_base._DBIBase.transaction` on the destination, so a
+    failed copy is rolled back.
+
+    :Type Mapping:
+
+        If the destination table does not exist (or is replaced), it is
+        created from the source's column types, compiled for the
+        destination database:
+
+            - For a table source, the source table's columns are
+              reflected, and each type is converted to its generic
+              SQLAlchemy type (e.g. MSSQL ``NVARCHAR(50)`` to
+              ``String(50)``). The primary key is retained.
+            - For a ``SELECT`` source, the types are inferred from the
+              first non-null value of each column in the first chunk.
+
+        Any column's type can be set explicitly via ``dtypes``.
+
+    Args:
+        src_dbi (DBInterface): Interface to the source database.
+        dst_dbi (DBInterface): Interface to the destination database.
+        table (str): Name of the source table. This is also the name of
+            the destination table, unless ``dst_table`` is provided.
+        source (str, optional): A ``SELECT`` statement used as the
+            source, rather than the full table. The parameter bindings
+            are to be written in colon format. Defaults to None.
+        params (dict, optional): Parameter key/value bindings for the
+            ``source`` statement. Defaults to None.
+        dst_table (str, optional): Name of the destination table.
+            Defaults to None, which uses ``table``.
+        if_exists (str, optional): Action taken if the destination
+            table exists; ``'append'``, ``'replace'`` (drop and
+            re-create) or ``'fail'``. Defaults to 'append'.
+        dtypes (dict, optional): A dictionary of
+            ``{column: sqlalchemy type}`` pairs, overriding the mapped
+            column types. Defaults to None.
+        chunksize (int, optional): Number of rows per chunk. Defaults
+            to 10000.
+        queue_size (int, optional): Maximum number of chunks held on
+            the queue. Defaults to 4.
+
+    :Example:
+
+        Copy a table from MSSQL into SQLite::
+
+            >>> from dbilib.database import DBInterface, copy_table
+
+            >>> src = DBInterface(connstr=connstr_mssql)
+            >>> dst = DBInterface(connstr='sqlite:////path/to/local.db')
+            >>> copy_table(src, dst, 'customers')
+            42042
+
+
+        Copy the last week's orders into a new table::
+
+            >>> copy_table(src, dst, 'orders',
+                           source='select * from orders where order_date >= :start',
+                           params={'start': start},
+                           dst_table='orders_recent',
+                           if_exists='replace')
+            1234
+
+    Raises:
+        ValueError: If the ``if_exists`` option is not valid, or the
+            destination table exists and ``if_exists='fail'``.
+
+    Returns:
+        int: The number of rows copied.
+
+    """
+    # pylint: disable=too-many-locals
+    if if_exists not in _IF_EXISTS:
+        raise ValueError(f'Invalid if_exists: {if_exists}. Expected one of: {_IF_EXISTS}.')
+    dst_table = dst_table or table
+    columns = None if source else _copy_columns__reflect(engine=src_dbi.engine, table=table)
+    if source is None:
+        quote = src_dbi.engine.dialect.identifier_preparer.quote
+        source = f'SELECT {", ".join(quote(c.name) for c in columns)} FROM {quote(table)}'
+    chunks = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    reader = threading.Thread(target=_copy_read,
+                              kwargs={'dbi': src_dbi,
+                                      'stmt': source,
+                                      'params': params,
+                                      'chunksize': chunksize,
+                                      'chunks': chunks,
+                                      'stop': stop},
+                              name='dbilib-copy-reader',
+                              daemon=True)
+    reader.start()
+    total = 0
+    try:
+        rows = _copy_get(chunks=chunks)
+        if columns is None:
+            if rows is None:
+                # An empty SELECT source; the types cannot be inferred.
+                return 0
+            columns = _copy_columns__infer(rows=rows)
+        if dtypes:
+            columns = [sa.Column(c.name, dtypes.get(c.name, c.type),
+                                 primary_key=c.primary_key,
+                                 nullable=c.nullable,
+                                 autoincrement=False)
+                       for c in columns]
+        _copy_create(engine=dst_dbi.engine, table=dst_table, columns=columns, if_exists=if_exists)
+        quote = dst_dbi.engine.dialect.identifier_preparer.quote
+        binds = ', '.join(f':c{i}' for i in range(len(columns)))
+        insert = (f'INSERT INTO {quote(dst_table)} ({", ".join(quote(c.name) for c in columns)}) '
+                  f'VALUES ({binds})')
+        with dst_dbi.transaction():
+            while rows is not None:
+                dst_dbi.execute_query(insert,
+                                      params=[{f'c{i}': v for i, v in enumerate(row)} for row in rows],
+                                      raise_errors=True)
+                total += len(rows)
+                rows = _copy_get(chunks=chunks)
+    finally:
+        # Release the reader, if blocked on a full queue.
+        stop.set()
+        reader.join()
+    return total
+
+
+def _copy_columns__infer(rows: list) -> list[sa.Column]:
+    """Infer the column definitions of a ``SELECT`` source.
+
+    Args:
+        rows (list): The first chunk of rows, as ``sqlalchemy`` ``Row``
+            objects.
+
+    Returns:
+        list[sa.Column]: The column definitions. Columns having only
+        null values in the chunk are defined as ``Text``.
+
+    """
+    # pylint: disable=protected-access  # Row._fields is public API.
+    columns = []
+    for i, name in enumerate(rows[0]._fields):
+        value = next((row[i] for row in rows if row[i] is not None), None)
+        columns.append(sa.Column(name, _PY_TYPES.get(type(value), sa.Text)()))
+    return columns
+
+
+def _copy_columns__reflect(engine: sa.engine.base.Engine, table: str) -> list[sa.Column]:
+    """Reflect the column definitions of a source table.
+
+    Args:
+        engine (sa.engine.base.Engine): The source database's engine.
+        table (str): Name of the source table.
+
+    Returns:
+        list[sa.Column]: The column definitions, using the generic
+        SQLAlchemy type of each column. Types having no generic
+        equivalent are defined as ``Text``.
+
+    """
+    insp = sa.inspect(engine)
+    pkey = set(insp.get_pk_constraint(table).get('constrained_columns') or ())
+    columns = []
+    for col in insp.get_columns(table):
+        try:
+            type_ = col['type'].as_generic()
+        except NotImplementedError:
+            type_ = sa.Text()
+        # Autoincrement is disabled so the source's key values are kept.
+        columns.append(sa.Column(col['name'], type_,
+                                 primary_key=col['name'] in pkey,
+                                 nullable=col['nullable'],
+                                 autoincrement=False))
+    return columns
+
+
+def _copy_create(engine: sa.engine.base.Engine, table: str, columns: list, if_exists: str):
+    """Create the destination table, per the ``if_exists`` option.
+
+    Args:
+        engine (sa.engine.base.Engine): The destination database's
+            engine.
+        table (str): Name of the destination table.
+        columns (list): The column definitions.
+        if_exists (str): Action taken if the table exists.
+
+    Raises:
+        ValueError: If the table exists and ``if_exists='fail'``.
+
+    """
+    exists = sa.inspect(engine).has_table(table)
+    if exists and if_exists == 'fail':
+        raise ValueError(f'Table {table!r} already exists.')
+    tbl = sa.Table(table, sa.MetaData(), *columns)
+    if exists and if_exists == 'replace':
+        tbl.drop(engine)
+    if not exists or if_exists == 'replace':
+        tbl.create(engine)
+
+
+def _copy_get(chunks: queue.Queue) -> list | None:
+    """Take the next chunk from the queue.
+
+    Args:
+        chunks (queue.Queue): The queue populated by :func:`_copy_read`.
+
+    Raises:
+        Exception: The error raised by the reader, if applicable.
+
+    Returns:
+        list | None: The next chunk of rows, or None if the source is
+        exhausted.
+
+    """
+    item = chunks.get()
+    if isinstance(item, Exception):
+        raise item
+    return item
+
+
+def _copy_read(dbi: DBInterface,
+               stmt: str,
+               params: dict,
+               chunksize: int,
+               chunks: queue.Queue,
+               stop: threading.Event):
+    """Stream the source onto the queue.
+
+    This is the reader thread's worker for :func:`copy_table`. Each
+    chunk is put onto the queue, followed by None once the source is
+    exhausted. If an error is raised, the error is put onto the queue
+    instead, to be raised by the writer.
+
+    Args:
+        dbi (DBInterface): Interface to the source database.
+        stmt (str): The source statement.
+        params (dict): Parameter bindings for the statement, or None.
+        chunksize (int): Number of rows per chunk.
+        chunks (queue.Queue): The (bounded) queue.
+        stop (threading.Event): Set by the writer to stop the reader.
+
+    """
+    def put(item: object) -> bool:
+        # A full queue is waited on until the writer takes a chunk, or stops.
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        with contextlib.closing(dbi.iter_query(stmt,
+                                               params=params,
+                                               chunksize=chunksize,
+                                               raw=True,
+                                               raise_errors=True)) as stream:
+            for rows in stream:
+                if not put(rows):
+                    return
+        put(None)
+    except Exception as err:
+        put(err)
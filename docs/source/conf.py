@@ -59,6 +59,7 @@ extensions = ['sphinx.ext.autodoc',
 # https://stackoverflow.com/a/67486947/6340496
 autodoc_mock_imports = [
                         'cx_Oracle', 
+                        'oracledb',
 #                        'pandas',  # Needs to be installed for typing.
                         'mysql-connector-python',
                         'pyodbc', 
@@ -31,6 +31,7 @@ declare -a scripts=("${path}/create_table__guitars.sql" \
                     "${path}/create_table__players.sql" \
                     "${path}/create_view__v_guitars_fender.sql" \
                     "${path}/create_proc__sp_get_guitars_colour.sql" \
+                    "${path}/create_proc__sp_get_guitars_summary.sql" \
                     "${path}/create_proc__sp_insert_guitars_add_new.sql" \
                     "${path}/create_proc__sp_insert_players_add_new.sql" \
                     "${path}/create_proc__sp_update_guitars_colour.sql")
@@ -0,0 +1,38 @@
+/*
+    Purpose:    Collect all guitars of a given colour, and a count of
+                guitars by make, as two result sets.
+    Author:     J. Berendt
+    Date:       2026-10-19
+    Revision:   1
+
+    Updates:
+    1:  Written.
+*/
+
+DELIMITER $$
+DROP PROCEDURE IF EXISTS `sp_get_guitars_summary`$$
+CREATE PROCEDURE `sp_get_guitars_summary` (IN _colour VARCHAR(25))
+
+BEGIN
+
+    SELECT
+        *
+    FROM
+        `guitars`
+    WHERE
+        `colour` = _colour
+    ORDER BY
+        `model`;
+
+    SELECT
+        `make`,
+        COUNT(*) AS `n`
+    FROM
+        `guitars`
+    GROUP BY
+        `make`
+    ORDER BY
+        `make`;
+
+END$$
+DELIMITER ;
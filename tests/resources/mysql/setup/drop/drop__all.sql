@@ -10,6 +10,7 @@
 
 DROP VIEW `dbilib_test`.`v_guitars_fender`;
 DROP PROCEDURE `dbilib_test`.`sp_get_guitars_colour`;
+DROP PROCEDURE `dbilib_test`.`sp_get_guitars_summary`;
 DROP PROCEDURE `dbilib_test`.`sp_insert_guitars_add_new`;
 DROP PROCEDURE `dbilib_test`.`sp_insert_players_add_new`;
 DROP PROCEDURE `dbilib_test`.`sp_update_guitars_colour`;
@@ -649,6 +649,31 @@ class TestDatabaseMSSQL(TestBase):
         self.assertIn(exp2A, tst2)
         self.assertIn(exp2B, tst2)
 
+    def test10d__backup_many(self):
+        """Test the ``backup_many`` method, including a chunked copy.
+
+        :Test:
+            - Create a database object using the connection string.
+            - Backup two tables and one which does not exist, using a
+              chunk size which forces a chunked copy of the guitars
+              table.
+            - Verify the per-table exit codes are as expected.
+            - Verify the checksums between the source and backup tables
+              match.
+
+        """
+        buff = io.StringIO()
+        dbi = DBInterface(connstr=self._CONNSTR)
+        exp = {'guitars': ExitCode.OK,
+               'players': ExitCode.OK,
+               'idontexist': ExitCode.ERR_BKUP_TBNEX}
+        with contextlib.redirect_stdout(buff):
+            tst = dbi.backup_many(list(exp), max_workers=3, chunk_rows=5)
+        tst2A = dbi.checksum(table_name='guitars', database_name='dbilib_test')
+        tst2B = dbi.checksum(table_name='guitars', database_name='__bak__dbilib_test')
+        self.assertEqual(exp, tst, msg=self._MSG1.format(exp, tst))
+        self.assertEqual(tst2A, tst2B)
+
 # %% Helper methods
 
     @classmethod
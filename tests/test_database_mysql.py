@@ -194,6 +194,44 @@ class TestDatabaseMySQL(TestBase):
         tst = dbi.execute_query('select colour from guitars where model = \'Presentation\'')[0][0]
         self.assertEqual(exp, tst, msg=self._MSG1.format(exp, tst))
 
+    def test03c__call_procedure__all(self):
+        """Test the call_procedure method returns all result sets.
+
+        :Test:
+            - Call a procedure returning two result sets, with the
+              ``'all'`` option.
+            - Verify both result sets are returned, as DataFrames.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        tst = dbi.call_procedure(proc='sp_get_guitars_summary', params=['black'], result_sets='all')
+        exp = dbi.call_procedure(proc='sp_get_guitars_colour', params=['black'])
+        self.assertEqual(2, len(tst), msg=self._MSG1.format(2, len(tst)))
+        self.assertTrue(exp.equals(tst[0]), msg=self._MSG1.format(exp, tst[0]))
+        self.assertEqual(['make', 'n'], list(tst[1].columns))
+
+    def test03d__call_procedure__stream(self):
+        """Test the call_procedure method streams all result sets.
+
+        :Test:
+            - Call a procedure returning two result sets, with the
+              ``'stream'`` option and a small chunk size.
+            - Verify the chunks are no larger than the chunk size.
+            - Verify the reassembled result sets match the ``'all'``
+              option's result sets.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        exp = dbi.call_procedure(proc='sp_get_guitars_summary', params=['black'], result_sets='all')
+        chunks = list(dbi.call_procedure(proc='sp_get_guitars_summary',
+                                         params=['black'],
+                                         result_sets='stream',
+                                         chunksize=2))
+        tst = [pd.concat([c for i, c in chunks if i == idx], ignore_index=True) for idx in (0, 1)]
+        self.assertTrue(all(len(c) <= 2 for _, c in chunks))
+        for e, t in zip(exp, tst):
+            self.assertTrue(e.equals(t), msg=self._MSG1.format(e, t))
+
     def test04__call_procedure_update(self):
         """Test the call_procedure_update method, without a return ID.
 
@@ -0,0 +1,391 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:Purpose:   Testing module for the ``database`` module; specifically
+            Oracle functionality.
+
+:Tests:     Refer to the :class:`~TestDatabaseOracle` docstring.
+
+:Platform:  Linux/Windows | Python 3.6+
+:Developer: J Berendt
+:Email:     development@s3dev.uk
+
+:Comments:  These tests exercise the interface's driver-facing methods
+            against stand-in driver objects, and therefore require
+            neither a database server nor the Oracle driver.
+
+"""
+# pylint: disable=import-error
+# pylint: disable=invalid-name
+# pylint: disable=protected-access
+
+import contextlib
+import functools
+import io
+import sys
+import threading
+import types
+from types import SimpleNamespace
+from unittest import mock
+import sqlalchemy as sa
+# locals
+from base import TestBase
+from testlibs.constants import startoftest
+from testlibs.constants import templates
+from testlibs.utilities import utilities
+from dbilib._dbi_oracle import _DBIOracle
+
+
+class TestDatabaseOracle(TestBase):
+    """Testing class used to test the Oracle database interface.
+
+    :Tests Overview:
+
+        For specific testing details, refer to the docstring of each
+        testing method.
+
+    """
+
+    _MSG1 = templates.not_as_expected.database
+    # Stand-in for the driver module's database type constants.
+    _DBAPI = SimpleNamespace(**{name: name for name in ('DB_TYPE_BINARY_DOUBLE',
+                                                        'DB_TYPE_BINARY_FLOAT',
+                                                        'DB_TYPE_BLOB',
+                                                        'DB_TYPE_CLOB',
+                                                        'DB_TYPE_LONG',
+                                                        'DB_TYPE_LONG_NVARCHAR',
+                                                        'DB_TYPE_LONG_RAW',
+                                                        'DB_TYPE_NCLOB',
+                                                        'DB_TYPE_NUMBER',
+                                                        'DB_TYPE_VARCHAR')})
+
+    class _Driver(types.ModuleType):
+        """Stand-in for a driver module, as imported by the SQLAlchemy
+        dialect.
+
+        Any constant requested by the dialect is created on first access,
+        and the session pools created by ``create_pool`` are recorded.
+        """
+
+        def __init__(self, name: str, version: str):
+            super().__init__(name)
+            self.version = version
+            self.paramstyle = 'named'
+            self.pools = []
+
+        def __getattr__(self, name):
+            if name.startswith('__'):
+                raise AttributeError(name)
+            value = type(name, (), {})
+            setattr(self, name, value)
+            return value
+
+        def create_pool(self, *args, **kwargs):
+            pool = SimpleNamespace(args=args,
+                                   kwargs=kwargs,
+                                   acquire=lambda: None,
+                                   close=lambda **kwargs: None)
+            self.pools.append(pool)
+            return pool
+
+        @staticmethod
+        def makedsn(host, port, **kwargs):
+            # pylint: disable=unused-argument  # Driver signature.
+            return f'{host}:{port}'
+
+    class _DatabaseError(Exception):
+        """Stand-in for the driver's ``DatabaseError``, whose first
+        argument holds the error's ``message``, ``full_code`` and failed
+        row ``offset``.
+        """
+
+        def __str__(self):
+            return self.args[0].message
+
+    @classmethod
+    def setUpClass(cls):
+        """Actions to be performed at the start of testing.
+
+        :Tasks:
+            - Print the start of testing message.
+
+        """
+        utilities.msgs.print_testing_start(msg=startoftest.database_oracle)
+
+    def test01a__output_type_handler__numbers(self):
+        """Test the output type handler's conversion of numeric columns.
+
+        :Test:
+            - Call the handler with the column metadata of various
+              ``NUMBER``, ``FLOAT`` and ``BINARY_*`` columns, as passed by
+              both the ``python-oracledb`` and ``cx_Oracle`` drivers.
+            - Verify only floating point columns which are exactly
+              representable as a double are fetched as ``BINARY_DOUBLE``,
+              and the others use the driver's default conversion.
+
+        """
+        double = 'DB_TYPE_BINARY_DOUBLE'
+        cases = (('NUMBER', 0, -127, None),     # Unconstrained NUMBER.
+                 ('NUMBER', 0, 0, None),        # Unconstrained integer.
+                 ('NUMBER', 10, 0, None),       # NUMBER(10).
+                 ('NUMBER', 38, 0, None),       # NUMBER(38).
+                 ('NUMBER', 10, 2, double),     # NUMBER(10, 2).
+                 ('NUMBER', 15, 5, double),     # NUMBER(15, 5).
+                 ('NUMBER', 20, 5, None),       # NUMBER(20, 5).
+                 ('NUMBER', 53, -127, double),  # FLOAT(53).
+                 ('NUMBER', 126, -127, None),   # FLOAT(126).
+                 ('BINARY_DOUBLE', 0, 0, None),
+                 ('BINARY_FLOAT', 0, 0, None),
+                 ('VARCHAR', 0, 0, None))
+        dbi, cursor = self._handler_setup()
+        for type_, precision, scale, exp in cases:
+            default_type = f'DB_TYPE_{type_}'
+            info = SimpleNamespace(type_code=default_type, precision=precision, scale=scale)
+            with self.subTest(msg=f'{type_=}, {precision=}, {scale=}'):
+                tst1 = dbi._output_type_handler(cursor, info)
+                tst2 = dbi._output_type_handler(cursor, 'col', default_type, 0, precision, scale)
+                self.assertEqual(exp, tst1, msg=self._MSG1.format(exp, tst1))
+                self.assertEqual(exp, tst2, msg=self._MSG1.format(exp, tst2))
+
+    def test01b__output_type_handler__lobs(self):
+        """Test the output type handler's conversion of LOB columns.
+
+        :Test:
+            - Call the handler with the column metadata of ``CLOB``,
+              ``NCLOB`` and ``BLOB`` columns, as passed by both the
+              ``python-oracledb`` and ``cx_Oracle`` drivers.
+            - Verify the columns are fetched as their ``LONG`` types.
+
+        """
+        cases = (('DB_TYPE_CLOB', 'DB_TYPE_LONG'),
+                 ('DB_TYPE_NCLOB', 'DB_TYPE_LONG_NVARCHAR'),
+                 ('DB_TYPE_BLOB', 'DB_TYPE_LONG_RAW'))
+        dbi, cursor = self._handler_setup()
+        for default_type, exp in cases:
+            info = SimpleNamespace(type_code=default_type, precision=0, scale=0)
+            with self.subTest(msg=f'{default_type=}'):
+                tst1 = dbi._output_type_handler(cursor, info)
+                tst2 = dbi._output_type_handler(cursor, 'col', default_type, 0, 0, 0)
+                self.assertEqual(exp, tst1, msg=self._MSG1.format(exp, tst1))
+                self.assertEqual(exp, tst2, msg=self._MSG1.format(exp, tst2))
+
+    def test02a__callproc_many__row_errors(self):
+        """Test the failed rows of a batched procedure call are
+        collected.
+
+        :Test:
+            - Call the procedure for six items in batches of three,
+              where three of the items fail; including the first item of
+              both batches, with the same error.
+            - Verify the failed items' indexes and messages are
+              collected, and every other item is called.
+
+        """
+        msg = 'ORA-00001: unique constraint violated'
+        dbi, called = self._callproc_setup(fails={0: msg, 3: msg, 4: msg})
+        errors = []
+        dbi._callproc_many(proc='sp_load', items=list(range(6)), batch_size=3, done=[0],
+                           errors=errors)
+        exp1 = [(0, msg), (3, msg), (4, msg)]
+        exp2 = [1, 2, 5]
+        self.assertEqual(exp1, errors, msg=self._MSG1.format(exp1, errors))
+        self.assertEqual(exp2, called, msg=self._MSG1.format(exp2, called))
+
+    def test02b__callproc_many__call_errors(self):
+        """Test errors raised by the call itself are raised, rather than
+        collected against each item.
+
+        :Test:
+            - Verify a PL/SQL compilation error on the first item is
+              raised, and nothing is collected.
+            - Verify a privilege error in the second batch is reported by
+              ``call_procedure_update_many``, alongside the row errors of
+              the committed first batch.
+
+        """
+        msg1 = 'ORA-06550: line 1, column 7:\nPLS-00306: wrong number or types of arguments'
+        msg2 = 'ORA-00001: unique constraint violated'
+        msg3 = 'ORA-01031: insufficient privileges'
+        dbi, _ = self._callproc_setup(fails=dict.fromkeys(range(4), msg1))
+        errors = []
+        with self.assertRaises(self._DatabaseError):
+            dbi._callproc_many(proc='sp_load', items=list(range(4)), batch_size=2, done=[0],
+                               errors=errors)
+        self.assertEqual([], errors, msg=self._MSG1.format([], errors))
+        dbi, called = self._callproc_setup(fails={0: msg2, 3: msg2, 2: msg3})
+        dbi._with_retry = lambda func, *args, idempotent__, **kwargs: func(*args, **kwargs)
+        with contextlib.redirect_stdout(io.StringIO()):
+            tst = dbi.call_procedure_update_many(proc='sp_load',
+                                                 iterable=range(6),
+                                                 batch_size=2,
+                                                 return_errors=True)
+        exp = (False, [(0, msg2), (2, msg3)])
+        self.assertEqual(exp, tst, msg=self._MSG1.format(exp, tst))
+        self.assertEqual([1], called, msg=self._MSG1.format([1], called))
+
+    def test03a__create_engine__driver(self):
+        """Test the engine is created over the driver named by the
+        connection string.
+
+        :Test:
+            - Create an interface for both the ``oracledb`` and
+              ``cx_oracle`` drivers.
+            - Verify each interface's ``dbapi`` is the named driver, and
+              its engine uses SQLAlchemy's pool.
+            - Verify the ``native_pool`` option is rejected for the
+              ``cx_oracle`` driver.
+
+        """
+        with self._drivers() as drivers:
+            for driver, module in (('oracledb', 'oracledb'), ('cx_oracle', 'cx_Oracle')):
+                with self.subTest(msg=f'{driver=}'):
+                    dbi = _DBIOracle(connstr=self._connstr(driver=driver))
+                    tst1 = dbi.dbapi
+                    tst2 = type(dbi._engine.pool)
+                    dbi.close()
+                    self.assertIs(drivers[module], tst1, msg=self._MSG1.format(module, tst1))
+                    self.assertIs(sa.pool.QueuePool, tst2,
+                                  msg=self._MSG1.format(sa.pool.QueuePool, tst2))
+            with self.assertRaises(ValueError):
+                _DBIOracle(connstr=self._connstr(driver='cx_oracle'), native_pool=True)
+            tst = drivers['oracledb'].pools
+            self.assertEqual([], tst, msg=self._MSG1.format([], tst))
+
+    def test03b__create_engine__native_pool(self):
+        """Test the engine is created over a native session pool.
+
+        :Test:
+            - Create an ``oracledb`` interface with the ``native_pool``
+              and ``stmtcachesize`` options.
+            - Verify a single session pool is created from the
+              connection string's arguments, the pool options and the
+              statement cache size.
+            - Verify the engine acquires its connections from the session
+              pool, and does not pool them itself.
+
+        """
+        with self._drivers() as drivers:
+            dbi = _DBIOracle(connstr=self._connstr(driver='oracledb'),
+                             native_pool={'max': 5},
+                             stmtcachesize=50)
+            pools = drivers['oracledb'].pools
+            tst1 = dbi._engine.pool._creator
+            tst2 = type(dbi._engine.pool)
+            dbi.close()
+        exp = {'user': 'usr', 'password': 'pwd', 'dsn': 'host:1521',
+               'min': 1, 'max': 5, 'increment': 1, 'stmtcachesize': 50}
+        self.assertEqual(1, len(pools), msg=self._MSG1.format(1, len(pools)))
+        self.assertEqual(exp, pools[0].kwargs, msg=self._MSG1.format(exp, pools[0].kwargs))
+        self.assertIs(pools[0].acquire, tst1, msg=self._MSG1.format(pools[0].acquire, tst1))
+        self.assertIs(sa.pool.NullPool, tst2, msg=self._MSG1.format(sa.pool.NullPool, tst2))
+
+    def test03c__create_engine__stmtcachesize(self):
+        """Test the statement cache size is set on each new connection.
+
+        :Test:
+            - Create an interface for both drivers, with and without
+              the ``stmtcachesize`` option.
+            - Verify the engine's ``connect`` listener sets the
+              connection's statement cache size only if the option is
+              provided.
+
+        """
+        with self._drivers():
+            for driver in ('oracledb', 'cx_oracle'):
+                for size in (None, 50):
+                    with self.subTest(msg=f'{driver=}, {size=}'):
+                        dbi = _DBIOracle(connstr=self._connstr(driver=driver),
+                                         stmtcachesize=size)
+                        listeners = [fn for fn in dbi._engine.pool.dispatch.connect
+                                     if isinstance(fn, functools.partial)]
+                        dbi.close()
+                        conn = SimpleNamespace(stmtcachesize=20)
+                        for listener in listeners:
+                            listener(conn, None)
+                        exp = size or 20
+                        self.assertEqual(exp, conn.stmtcachesize,
+                                         msg=self._MSG1.format(exp, conn.stmtcachesize))
+
+    def _callproc_setup(self, fails: dict) -> tuple:
+        """Create an interface for testing the batched procedure calls.
+
+        The interface is created without a connection, and its
+        connection replaced with one whose cursor's ``executemany``
+        method stops at the first failing item, as the driver does for
+        PL/SQL.
+
+        Args:
+            fails (dict): The error message raised by each failing item,
+                keyed by item.
+
+        Returns:
+            tuple: The interface, and the list of successfully called
+            items.
+
+        """
+        called = []
+
+        def _executemany(_, rows):
+            for offset, row in enumerate(rows):
+                if row[-1] in fails:
+                    msg = fails[row[-1]]
+                    raise self._DatabaseError(SimpleNamespace(message=msg,
+                                                              full_code=msg.split(':')[0],
+                                                              offset=offset))
+                called.append(row[-1])
+
+        dbapi = SimpleNamespace(DatabaseError=self._DatabaseError)
+        cursor = SimpleNamespace(executemany=_executemany, close=lambda: None)
+        conn = SimpleNamespace(connection=SimpleNamespace(
+            cursor=lambda: cursor, connection=SimpleNamespace(commit=lambda: None)))
+        dbi = _DBIOracle.__new__(_DBIOracle)
+        dbi._engine = SimpleNamespace(dialect=SimpleNamespace(dbapi=dbapi))
+        dbi._local = threading.local()
+        dbi._connect = lambda: contextlib.nullcontext(conn)
+        return dbi, called
+
+    @staticmethod
+    def _connstr(driver: str) -> str:
+        """Build a connection string for the given driver.
+
+        Args:
+            driver (str): The SQLAlchemy driver name.
+
+        Returns:
+            str: The connection string.
+
+        """
+        return f'oracle+{driver}://usr:pwd@host:1521/?service_name=svc'
+
+    @contextlib.contextmanager
+    def _drivers(self) -> dict:
+        """Install stand-ins for both driver modules.
+
+        The stand-ins are imported by the SQLAlchemy dialects in place of
+        the real drivers, for the duration of the context.
+
+        Yields:
+            dict: The stand-in driver modules, keyed by module name.
+
+        """
+        drivers = {'oracledb': self._Driver(name='oracledb', version='2.0.0'),
+                   'cx_Oracle': self._Driver(name='cx_Oracle', version='8.3.0')}
+        with mock.patch.dict(sys.modules, drivers):
+            yield drivers
+
+    def _handler_setup(self) -> tuple:
+        """Create an interface and cursor for testing the output type
+        handler.
+
+        The interface is created without a connection, and its engine
+        replaced with one exposing the stand-in driver module. The
+        cursor's ``var`` method returns the requested type.
+
+        Returns:
+            tuple: The interface and cursor objects.
+
+        """
+        dbi = _DBIOracle.__new__(_DBIOracle)
+        dbi._engine = SimpleNamespace(dialect=SimpleNamespace(dbapi=self._DBAPI))
+        cursor = SimpleNamespace(arraysize=1000, var=lambda type_, arraysize: type_)
+        return dbi, cursor
@@ -20,15 +20,26 @@
 
 import contextlib
 import io
+import numpy as np
 import os
 import pandas as pd
+import queue
+import sqlalchemy as sa
+import sqlite3
 import subprocess
+import tempfile
+import threading
+import time
+from utils4 import utils
 # locals
 from base import TestBase
 from testlibs.constants import startoftest
 from testlibs.constants import templates
 from testlibs.utilities import utilities
-from dbilib.database import DBInterface
+from dbilib._dbi_base import ExitCode
+from dbilib.database import (AdmissionError, AdmissionPolicy, DBInterface, LazyResult,
+                             MemoryBudget, MemoryBudgetError, RetryPolicy, ShardedInterface,
+                             SpilledResult, copy_table)
 
 
 class TestDatabaseSQLite(TestBase):
@@ -198,6 +209,1339 @@ class TestDatabaseSQLite(TestBase):
         self.assertTrue(all([tst1 is None, tst2 is None]),
                         msg=self._MSG1.format(exp, (tst1, tst2)))
 
+    def test05a__paginate(self):
+        """Test the paginate method walks the full table.
+
+        :Test:
+            - Call the ``paginate`` method with a page size which does
+              not divide the number of rows evenly.
+            - Verify the page sizes are as expected.
+            - Verify every row is returned exactly once, in key order.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        pages = [page for page, _ in dbi.paginate('guitars', key_columns=['id'], page_size=5)]
+        exp1 = [5, 5, 4]
+        exp2 = list(range(1, 15))
+        tst1 = [len(p) for p in pages]
+        tst2 = [r[0] for p in pages for r in p]
+        self.assertEqual(exp1, tst1, msg=self._MSG1.format(exp1, tst1))
+        self.assertEqual(exp2, tst2, msg=self._MSG1.format(exp2, tst2))
+
+    def test05b__paginate__resume(self):
+        """Test the paginate method resumes from a cursor token.
+
+        :Test:
+            - Collect the token from the first page.
+            - Resume the pagination from the token, with a filter and
+              composite key, returning DataFrames.
+            - Verify only the remaining (filtered) rows are returned.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        _, token = next(dbi.paginate('guitars', key_columns=['id'], page_size=5))
+        pages = dbi.paginate('guitars',
+                             key_columns=['id'],
+                             page_size=3,
+                             where='colour <> :colour',
+                             params={'colour': 'Black'},
+                             token=token,
+                             raw=False)
+        df = pd.concat([p for p, _ in pages])
+        exp = dbi.execute_query('select id from guitars where id > 5 and colour <> \'Black\'',
+                                flat=True)
+        tst = tuple(df['id'])
+        self.assertEqual(exp, tst, msg=self._MSG1.format(exp, tst))
+
+    def test05c__paginate__error(self):
+        """Test the paginate method raises a database error.
+
+        :Test:
+            - Call the ``paginate`` method on a table which does not
+              exist.
+            - Verify the error is raised, rather than the pagination
+              ending as if the table were empty.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        with self.assertRaises(sa.exc.OperationalError):
+            next(dbi.paginate('some_table', key_columns=['id']))
+
+    def test06a__iter_query(self):
+        """Test the iter_query method streams the results in chunks.
+
+        :Test:
+            - Call the ``iter_query`` method with a chunk size which does
+              not divide the number of rows evenly.
+            - Verify the chunk sizes are as expected.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        exp = [4, 4, 4, 2]
+        tst = [len(c) for c in dbi.iter_query('select * from guitars', chunksize=4, raw=False)]
+        self.assertEqual(exp, tst, msg=self._MSG1.format(exp, tst))
+
+    def test06b__parallel_extract__callback(self):
+        """Test the parallel_extract method, using a callback sink.
+
+        :Test:
+            - Extract the table into four partitions, using each of the
+              boundary methods.
+            - Verify each row is extracted exactly once.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        for method in ('minmax', 'quantile'):
+            with self.subTest(msg=f'{method=}'):
+                rows = []
+                counts = dbi.parallel_extract('guitars',
+                                              partition_column='id',
+                                              n_partitions=4,
+                                              sink=lambda _, chunk: rows.extend(chunk),
+                                              method=method,
+                                              chunksize=2)
+                exp = list(range(1, 15))
+                tst = sorted(r[0] for r in rows)
+                self.assertEqual(4, len(counts))
+                self.assertEqual(14, sum(counts))
+                self.assertEqual(exp, tst, msg=self._MSG1.format(exp, tst))
+
+    def test06c__parallel_extract__queue(self):
+        """Test the parallel_extract method, using a bounded queue sink.
+
+        :Test:
+            - Extract the table into a bounded queue, which is consumed
+              on a separate thread.
+            - Verify an end-of-partition sentinel is received for each
+              partition, and each row is extracted exactly once.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        q = queue.Queue(maxsize=1)
+        rows, done = [], []
+        def consume():
+            while len(done) < 3:
+                part, chunk = q.get()
+                if chunk is None:
+                    done.append(part)
+                else:
+                    rows.extend(chunk['id'])
+        thread = threading.Thread(target=consume)
+        thread.start()
+        dbi.parallel_extract('guitars',
+                             partition_column='id',
+                             n_partitions=3,
+                             sink=q,
+                             chunksize=2,
+                             raw=False)
+        thread.join(timeout=5)
+        exp = list(range(1, 15))
+        tst = sorted(rows)
+        self.assertEqual([0, 1, 2], sorted(done))
+        self.assertEqual(exp, tst, msg=self._MSG1.format(exp, tst))
+
+    def test06d__parallel_extract__pools(self):
+        """Test the parallel_extract method on an interface without a
+        sized connection pool, and for a missing table.
+
+        :Test:
+            - Extract a private in-memory database (served by a single,
+              shared connection), using each boundary method.
+            - Verify each row is extracted exactly once.
+            - Verify a database error is raised for a table which does
+              not exist.
+
+        """
+        dbi = DBInterface(connstr='sqlite://')
+        dbi.execute_query('create table foo (id integer)')
+        dbi.execute_query('insert into foo values ' + ', '.join(f'({i})' for i in range(1, 21)))
+        for method in ('minmax', 'quantile'):
+            with self.subTest(msg=f'{method=}'):
+                rows = []
+                counts = dbi.parallel_extract('foo',
+                                              partition_column='id',
+                                              n_partitions=4,
+                                              sink=lambda _, chunk: rows.extend(chunk),
+                                              method=method,
+                                              chunksize=3)
+                exp = list(range(1, 21))
+                tst = sorted(r[0] for r in rows)
+                self.assertEqual(20, sum(counts))
+                self.assertEqual(exp, tst, msg=self._MSG1.format(exp, tst))
+        for method in ('minmax', 'quantile'):
+            with self.subTest(msg=f'{method=}'):
+                with self.assertRaises(sa.exc.OperationalError):
+                    dbi.parallel_extract('some_table',
+                                         partition_column='id',
+                                         n_partitions=4,
+                                         sink=lambda *_: None,
+                                         method=method)
+
+    def test07a__extract_incremental(self):
+        """Test the incremental extraction, including watermark ties.
+
+        :Test:
+            - Create a table with a watermark column, where several rows
+              share the same watermark value.
+            - Pull all rows, as the state file does not yet exist.
+            - Add rows which tie with the high-water mark, and a later
+              row, then pull again.
+            - Verify only the new rows are returned, and a third pull
+              returns an empty DataFrame.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        dbi.execute_query('create table events (id integer primary key, updated_at text)')
+        stmt = 'insert into events values (:id, :updated_at)'
+        with tempfile.TemporaryDirectory() as tmp:
+            state = os.path.join(tmp, 'state.json')
+            kwargs = {'table': 'events',
+                      'watermark_column': 'updated_at',
+                      'key_columns': ['id'],
+                      'state': state}
+            for i in (1, 2, 3):
+                dbi.execute_query(stmt, params={'id': i, 'updated_at': '2025-01-01'})
+            tst1 = [r[0] for r in dbi.extract_incremental(**kwargs)]
+            for i, ts in ((4, '2025-01-01'), (5, '2025-01-02')):
+                dbi.execute_query(stmt, params={'id': i, 'updated_at': ts})
+            tst2 = [r[0] for r in dbi.extract_incremental(**kwargs)]
+            tst3 = dbi.extract_incremental(**kwargs, raw=False)
+        dbi.execute_query('drop table events')
+        self.assertEqual([1, 2, 3], tst1, msg=self._MSG1.format([1, 2, 3], tst1))
+        self.assertEqual([4, 5], tst2, msg=self._MSG1.format([4, 5], tst2))
+        self.assertTrue(tst3.empty)
+        self.assertEqual(['id', 'updated_at'], list(tst3.columns))
+
+    def test07b__iter_incremental(self):
+        """Test the streamed incremental extraction resumes per chunk.
+
+        :Test:
+            - Stream the guitars table in chunks, stopping after the
+              second chunk has been consumed.
+            - Resume the pull, and verify the remaining rows are
+              returned exactly once.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        with tempfile.TemporaryDirectory() as tmp:
+            kwargs = {'table': 'guitars',
+                      'watermark_column': 'id',
+                      'key_columns': ['id'],
+                      'state': os.path.join(tmp, 'state.json'),
+                      'chunksize': 5,
+                      'raw': False}
+            gen = dbi.iter_incremental(**kwargs)
+            tst1 = [len(next(gen)), len(next(gen))]
+            next(gen)  # Consume the second chunk, not collecting the third.
+            gen.close()
+            tst2 = [df['id'].tolist() for df in dbi.iter_incremental(**kwargs)]
+        self.assertEqual([5, 5], tst1, msg=self._MSG1.format([5, 5], tst1))
+        self.assertEqual([[11, 12, 13, 14]], tst2, msg=self._MSG1.format([[11, 12, 13, 14]], tst2))
+
+    def test08a__checksum(self):
+        """Test the checksum method.
+
+        :Test:
+            - Copy the guitars table.
+            - Verify the checksums of the table and its copy match.
+            - Update a row in the copy, and verify the checksums differ.
+            - Verify None is returned for a table which does not exist.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        dbi.execute_query('create table guitars_copy as select * from guitars')
+        tst1 = dbi.checksum('guitars') == dbi.checksum('guitars_copy')
+        dbi.execute_query('update guitars_copy set colour = \'Red\' where id = 10')
+        tst2 = dbi.checksum('guitars') == dbi.checksum('guitars_copy')
+        tst3 = dbi.checksum('idontexist')
+        dbi.execute_query('drop table guitars_copy')
+        self.assertTrue(tst1)
+        self.assertFalse(tst2)
+        self.assertIsNone(tst3)
+
+    def test08b__compare_blocks(self):
+        """Test the block checksum comparison and incremental verification.
+
+        :Test:
+            - Copy the guitars table, and update a single row.
+            - Verify the block checksums cover all rows.
+            - Verify the comparison drills into the mismatched block and
+              returns only the differing key range.
+            - Verify the same range is returned when the matched blocks
+              from the first comparison are skipped.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        dbi.execute_query('create table guitars_copy as select * from guitars')
+        dbi.execute_query('update guitars_copy set colour = \'Red\' where id = 10')
+        blocks = dbi.checksum_blocks('guitars', key_column='id', block_size=8)
+        kwargs = {'key_column': 'id', 'other_table': 'guitars_copy',
+                  'block_size': 8, 'min_block_size': 2}
+        tst1, verified = dbi.compare_blocks('guitars', **kwargs)
+        tst2, _ = dbi.compare_blocks('guitars', **kwargs, previous=verified)
+        dbi.execute_query('drop table guitars_copy')
+        self.assertEqual([0, 1], sorted(blocks))
+        self.assertEqual(14, sum(v[2] for v in blocks.values()))
+        self.assertEqual([(10, 11)], tst1, msg=self._MSG1.format([(10, 11)], tst1))
+        self.assertEqual([0], sorted(verified))
+        self.assertEqual([(10, 11)], tst2, msg=self._MSG1.format([(10, 11)], tst2))
+
+    def test08c__compare_blocks__missing(self):
+        """Test the block checksum comparison raises for a missing table.
+
+        :Test:
+            - Verify comparing against (and from) a table which does not
+              exist raises a database error, rather than reporting no
+              differences.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        with self.assertRaises(sa.exc.OperationalError):
+            dbi.compare_blocks('guitars', key_column='id', other_table='some_table')
+        with self.assertRaises(sa.exc.OperationalError):
+            dbi.compare_blocks('some_table', key_column='id', other_table='guitars')
+
+    def test09a__backup(self):
+        """Test the backup method, verifying the whole database.
+
+        :Test:
+            - Backup the database in single-page steps, with a progress
+              callback.
+            - Verify the exit code, summary message and backup file are
+              as expected, and the progress callback was called.
+
+        """
+        buff = io.StringIO()
+        calls = []
+        dbi = DBInterface(connstr=self._CONNSTR)
+        with tempfile.TemporaryDirectory() as tmp:
+            target = os.path.join(tmp, 'backup.db')
+            with contextlib.redirect_stdout(buff):
+                tst1 = dbi.backup(target=target, pages=1, progress=lambda *a: calls.append(a))
+            tst2 = os.path.exists(target)
+        tst3 = buff.getvalue()
+        self.assertEqual(ExitCode.OK, tst1, msg=self._MSG1.format(ExitCode.OK, tst1))
+        self.assertTrue(tst2)
+        self.assertIn('backup successful', tst3)
+        self.assertTrue(calls)
+
+    def test09b__backup__table(self):
+        """Test the backup method, verifying a single table.
+
+        :Test:
+            - Backup the database, verifying the guitars table.
+            - Verify the backup table's checksum matches the source.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        with tempfile.TemporaryDirectory() as tmp:
+            target = os.path.join(tmp, 'backup.db')
+            tst1 = dbi.backup(table_name='guitars', target=target, verbose=False)
+            bak = DBInterface(connstr=f'sqlite:///{target}')
+            tst2 = bak.checksum('guitars')
+            bak.engine.dispose()
+        exp2 = dbi.checksum('guitars')
+        self.assertEqual(ExitCode.OK, tst1, msg=self._MSG1.format(ExitCode.OK, tst1))
+        self.assertEqual(exp2, tst2, msg=self._MSG1.format(exp2, tst2))
+
+    def test09c__backup__errors(self):
+        """Test the backup method exit codes for invalid arguments.
+
+        :Test:
+            - Verify a table which does not exist returns the
+              ``ERR_BKUP_TBNEX`` exit code.
+            - Verify a target directory which does not exist returns
+              the ``ERR_BKUP_DBNEX`` exit code.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        tst1 = dbi.backup(table_name='idontexist', target='/tmp/bak.db', verbose=False)
+        tst2 = dbi.backup(target='/tmp/idontexist/bak.db', verbose=False)
+        self.assertEqual(ExitCode.ERR_BKUP_TBNEX, tst1)
+        self.assertEqual(ExitCode.ERR_BKUP_DBNEX, tst2)
+
+    def test09d__backup__default_target(self):
+        """Test the backup method's default target, for URI filenames and
+        in-memory databases.
+
+        :Test:
+            - Backup a database through a read-only (URI filename)
+              interface, and verify the backup is written beside the
+              database file.
+            - Verify a ValueError is raised when backing up an in-memory
+              database without a target.
+
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'src.db')
+            with sqlite3.connect(path) as conn:
+                conn.execute('create table foo (id integer)')
+            conn.close()
+            with DBInterface(connstr=f'sqlite:///{path}', read_only=True) as dbi:
+                tst1 = dbi.backup(verbose=False)
+            tst2 = os.path.exists(os.path.join(tmp, '__bak__src.db'))
+        self.assertEqual(ExitCode.OK, tst1, msg=self._MSG1.format(ExitCode.OK, tst1))
+        self.assertTrue(tst2)
+        with self.assertRaises(ValueError):
+            DBInterface(connstr='sqlite://').backup(verbose=False)
+
+    def test10a__pragmas__profile(self):
+        """Test a PRAGMA profile is applied to new connections.
+
+        :Test:
+            - Create an interface to a temporary database, using the
+              'read-heavy' profile.
+            - Verify the journal mode, synchronous and temp store
+              settings are as expected.
+
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'pragmas.db')
+            sqlite3.connect(path).close()
+            dbi = DBInterface(connstr=f'sqlite:///{path}', pragmas='read-heavy')
+            tst1 = dbi.execute_query('pragma journal_mode')[0][0]
+            tst2 = dbi.execute_query('pragma synchronous')[0][0]
+            tst3 = dbi.execute_query('pragma temp_store')[0][0]
+            dbi.engine.dispose()
+        self.assertEqual('wal', tst1, msg=self._MSG1.format('wal', tst1))
+        self.assertEqual(1, tst2, msg=self._MSG1.format(1, tst2))  # NORMAL
+        self.assertEqual(2, tst3, msg=self._MSG1.format(2, tst3))  # MEMORY
+
+    def test10c__pragmas__read_only(self):
+        """Test each PRAGMA profile can be used with a read-only
+        connection.
+
+        :Test:
+            - For each profile, create a read-only interface to a
+              temporary database.
+            - Verify the database can be queried, and the journal mode
+              (which writes to the file) is neither applied nor changed.
+
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'pragmas.db')
+            with sqlite3.connect(path) as conn:
+                conn.execute('create table foo (id integer)')
+                conn.execute('insert into foo values (1)')
+            conn.close()
+            for profile in ('safe', 'read-heavy', 'bulk-load'):
+                with self.subTest(msg=f'{profile=}'):
+                    with DBInterface(connstr=f'sqlite:///{path}',
+                                     read_only=True,
+                                     pragmas=profile) as dbi:
+                        tst1 = dbi.execute_query('select count(*) from foo', raise_errors=True)
+                        tst2 = dbi.execute_query('pragma journal_mode')[0][0]
+                        tst3 = dbi.pragmas
+                    self.assertEqual([(1,)], tst1, msg=self._MSG1.format([(1,)], tst1))
+                    self.assertEqual('delete', tst2, msg=self._MSG1.format('delete', tst2))
+                    self.assertNotIn('journal_mode', tst3)
+                    self.assertIn('temp_store', tst3)
+
+    def test10b__pragmas__invalid(self):
+        """Test invalid PRAGMA settings are rejected.
+
+        :Test:
+            - Verify a ValueError is raised for an unknown profile, and
+              for a PRAGMA value which is not a simple value.
+
+        """
+        with self.assertRaises(ValueError):
+            DBInterface(connstr=self._CONNSTR, pragmas='idontexist')
+        with self.assertRaises(ValueError):
+            DBInterface(connstr=self._CONNSTR, pragmas={'cache_size': '1; drop table guitars'})
+
+    def test11a__memory(self):
+        """Test a private in-memory database persists across calls.
+
+        :Test:
+            - Create an in-memory database interface.
+            - Create and populate a table, using separate calls.
+            - Verify the data is visible to a subsequent call.
+
+        """
+        dbi = DBInterface(connstr='sqlite://')
+        dbi.execute_query('create table foo (id integer)')
+        dbi.execute_query('insert into foo values (1), (2)')
+        exp = [(2,)]
+        tst = dbi.execute_query('select count(*) from foo')
+        self.assertEqual(exp, tst, msg=self._MSG1.format(exp, tst))
+
+    def test11b__read_only(self):
+        """Test the read-only and immutable modes.
+
+        :Test:
+            - Create a read-only, and an immutable interface.
+            - Verify the data can be read.
+            - Verify a write is rejected, and the data is unchanged.
+
+        """
+        for kwargs in ({'read_only': True}, {'immutable': True}):
+            with self.subTest(msg=f'{kwargs=}'):
+                dbi = DBInterface(connstr=self._CONNSTR, **kwargs)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    dbi.execute_query('delete from guitars')
+                tst = dbi.execute_query('select count(*) from guitars')[0][0]
+                dbi.engine.dispose()
+                self.assertEqual('ro', dbi.engine.url.query.get('mode'))
+                self.assertEqual(14, tst, msg=self._MSG1.format(14, tst))
+
+    def test11c__in_memory(self):
+        """Test the database file is loaded into a shared in-memory database.
+
+        :Test:
+            - Create an interface with the ``in_memory`` option.
+            - Verify the data is read from concurrent connections.
+            - Verify a change is not written back to the file.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR, in_memory=True)
+        with dbi.engine.connect() as c1, dbi.engine.connect() as c2:
+            tst1 = [c.execute(sa.text('select count(*) from guitars')).scalar() for c in (c1, c2)]
+        dbi.execute_query('delete from guitars')
+        tst2 = dbi.execute_query('select count(*) from guitars')[0][0]
+        tst3 = DBInterface(connstr=self._CONNSTR).execute_query('select count(*) from guitars')[0][0]
+        self.assertEqual([14, 14], tst1, msg=self._MSG1.format([14, 14], tst1))
+        self.assertEqual(0, tst2, msg=self._MSG1.format(0, tst2))
+        self.assertEqual(14, tst3, msg=self._MSG1.format(14, tst3))
+
+    def test12a__retry__locked(self):
+        """Test a read is retried while the database is locked.
+
+        :Test:
+            - Lock the database with an exclusive transaction, which is
+              released by a background thread.
+            - Verify the query succeeds once the lock is released.
+            - Verify the retries are counted, and the callback is called.
+
+        """
+        calls = []
+        policy = RetryPolicy(retries=20, backoff=0.05, max_backoff=0.1, jitter=False,
+                             on_retry=lambda *args: calls.append(args))
+        dbi = DBInterface(connstr=f'{self._CONNSTR}?timeout=0', retry=policy)
+        lock = sqlite3.connect(self._CREDS.get('database'), isolation_level=None,
+                               check_same_thread=False)
+        lock.execute('begin exclusive')
+        timer = threading.Timer(0.3, lock.rollback)
+        timer.start()
+        tst = dbi.execute_query('select count(*) from guitars', raw=True)
+        timer.join()
+        lock.close()
+        self.assertEqual(14, tst[0][0], msg=self._MSG1.format(14, tst[0][0]))
+        self.assertTrue(dbi.metrics['retries'] > 0)
+        self.assertEqual(dbi.metrics['retries'], len(calls))
+        self.assertEqual(0, dbi.metrics['retries_exhausted'])
+
+    def test12b__retry__writes(self):
+        """Test a write is not retried unless the policy allows it.
+
+        :Test:
+            - Lock the database with an exclusive transaction.
+            - Verify an INSERT fails without a retry.
+            - Verify a read is retried until the retries are exhausted.
+
+        """
+        dbi = DBInterface(connstr=f'{self._CONNSTR}?timeout=0',
+                          retry=RetryPolicy(retries=2, backoff=0.01))
+        lock = sqlite3.connect(self._CREDS.get('database'), isolation_level=None)
+        lock.execute('begin exclusive')
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                dbi.execute_query('insert into guitars (id) values (999)')
+            tst1 = dbi.metrics
+            with contextlib.redirect_stdout(io.StringIO()):
+                dbi.execute_query('select count(*) from guitars')
+            tst2 = dbi.metrics
+        finally:
+            lock.rollback()
+            lock.close()
+        self.assertEqual((0, 0), (tst1['retries'], tst1['retries_exhausted']))
+        self.assertEqual((2, 1), (tst2['retries'], tst2['retries_exhausted']))
+
+    def test13a__timeout(self):
+        """Test a long-running query is cancelled by the statement timeout.
+
+        :Test:
+            - Run a long recursive query with a short timeout.
+            - Verify the query is cancelled promptly, and None returned.
+            - Verify the timeout is counted, and the connection was
+              invalidated (not returned to the pool).
+            - Verify the interface remains usable.
+
+        """
+        stmt = ('with recursive c(x) as (select 1 union all select x + 1 from c) '
+                'select count(*) from c')
+        dbi = DBInterface(connstr=self._CONNSTR)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()) as buf:
+            tst1 = dbi.execute_query(stmt, timeout=0.2)
+        elapsed = time.perf_counter() - start
+        tst2 = dbi.execute_query('select count(*) from guitars', timeout=5)[0][0]
+        self.assertIsNone(tst1)
+        self.assertIn('interrupted', buf.getvalue())
+        self.assertTrue(elapsed < 5, msg=f'Query was not cancelled promptly: {elapsed:.2f}s')
+        self.assertEqual(1, dbi.metrics['timeouts'])
+        self.assertEqual(0, dbi.engine.pool.checkedout())
+        self.assertEqual(14, tst2, msg=self._MSG1.format(14, tst2))
+
+    def test14a__transaction(self):
+        """Test a transaction pins one connection, and commits or rolls
+        back as a unit.
+
+        :Test:
+            - Run several statements in a transaction, and verify a
+              single connection is checked out.
+            - Verify the changes are not visible to another connection
+              until the transaction is committed.
+            - Verify an error rolls back all statements in the block.
+
+        """
+        stmt = "insert into guitars values (:id, :make, 'Test', 'Red')"
+        dbi = DBInterface(connstr=self._CONNSTR, shared=False)
+        other = DBInterface(connstr=self._CONNSTR)
+        checkouts = []
+        sa.event.listen(dbi.engine, 'checkout', lambda *args: checkouts.append(1))
+        try:
+            with dbi.transaction() as tx:
+                for i in range(1001, 1006):
+                    tx.execute_query(stmt, params={'id': i, 'make': 'tx'})
+                tst1 = tx.execute_query("select count(*) from guitars where make = 'tx'")[0][0]
+                tst2 = other.execute_query("select count(*) from guitars where make = 'tx'")[0][0]
+                self.assertTrue(dbi.in_transaction)
+            tst3 = other.execute_query("select count(*) from guitars where make = 'tx'")[0][0]
+            ncheckouts = len(checkouts)
+            with self.assertRaises(sa.exc.IntegrityError):
+                with dbi.transaction() as tx:
+                    tx.execute_query(stmt, params={'id': 1006, 'make': 'tx'})
+                    tx.execute_query(stmt, params={'id': 1006, 'make': 'tx'})
+            tst4 = other.execute_query("select count(*) from guitars where make = 'tx'")[0][0]
+        finally:
+            other.execute_query("delete from guitars where make = 'tx'")
+        self.assertEqual(1, ncheckouts, msg=self._MSG1.format(1, ncheckouts))
+        self.assertEqual((5, 0, 5, 5), (tst1, tst2, tst3, tst4))
+        self.assertFalse(dbi.in_transaction)
+
+    def test14b__transaction__savepoint(self):
+        """Test a nested transaction rolls back to its savepoint.
+
+        :Test:
+            - Insert a row in the outer transaction.
+            - Raise an error in a nested transaction, after an insert.
+            - Verify only the nested transaction's insert is rolled back.
+
+        """
+        stmt = "insert into guitars values (:id, :make, 'Test', 'Red')"
+        dbi = DBInterface(connstr=self._CONNSTR)
+        try:
+            with dbi.transaction() as tx:
+                tx.execute_query(stmt, params={'id': 1001, 'make': 'tx'})
+                with self.assertRaises(ValueError):
+                    with tx.transaction():
+                        tx.execute_query(stmt, params={'id': 1002, 'make': 'tx'})
+                        raise ValueError('Roll back the savepoint.')
+            tst = dbi.execute_query("select id from guitars where make = 'tx'", flat=True)
+        finally:
+            dbi.execute_query("delete from guitars where make = 'tx'")
+        self.assertEqual((1001,), tst, msg=self._MSG1.format((1001,), tst))
+
+    def test15a__shared_engine(self):
+        """Test interfaces for the same database share an engine, which
+        is disposed when the last interface is closed.
+
+        :Test:
+            - Create two interfaces, and verify they share an engine.
+            - Close the first, and verify the engine is not disposed.
+            - Use a third interface as a context manager, and verify the
+              engine is not disposed on exit.
+            - Close the second, and verify the engine is disposed.
+
+        """
+        # A unique PRAGMA setting keeps the engine private to this test.
+        pragmas = {'cache_size': -4321}
+        disposed = []
+        dbi1 = DBInterface(connstr=self._CONNSTR, pragmas=pragmas)
+        dbi2 = DBInterface(connstr=self._CONNSTR, pragmas=pragmas)
+        sa.event.listen(dbi1.engine, 'engine_disposed', lambda *args: disposed.append(1))
+        tst1 = dbi1.engine is dbi2.engine
+        dbi1.close()
+        dbi1.close()  # A second close has no effect.
+        with DBInterface(connstr=self._CONNSTR, pragmas=pragmas) as dbi3:
+            tst2 = dbi3.engine is dbi2.engine
+            tst3 = dbi3.execute_query('select count(*) from guitars')[0][0]
+        tst4 = len(disposed)
+        tst5 = dbi2.execute_query('pragma cache_size')[0][0]
+        dbi2.close()
+        self.assertTrue(tst1)
+        self.assertTrue(tst2)
+        self.assertEqual(14, tst3, msg=self._MSG1.format(14, tst3))
+        self.assertEqual(0, tst4, msg=self._MSG1.format(0, tst4))
+        self.assertEqual(-4321, tst5, msg=self._MSG1.format(-4321, tst5))
+        self.assertEqual(1, len(disposed), msg=self._MSG1.format(1, len(disposed)))
+        self.assertIsNone(dbi2.engine)
+
+    def test15b__shared_engine__distinct(self):
+        """Test interfaces which must not share an engine are given their
+        own engine.
+
+        :Test:
+            - Verify the ``shared=False`` argument creates a new engine.
+            - Verify different PRAGMA settings create a new engine.
+            - Verify private in-memory databases are never shared.
+
+        """
+        dbi = DBInterface(connstr=self._CONNSTR)
+        tst1 = DBInterface(connstr=self._CONNSTR, shared=False).engine
+        tst2 = DBInterface(connstr=self._CONNSTR, pragmas='safe').engine
+        mem1 = DBInterface(connstr='sqlite://')
+        mem2 = DBInterface(connstr='sqlite://')
+        mem1.execute_query('create table t (x int)')
+        self.assertIsNot(dbi.engine, tst1)
+        self.assertIsNot(dbi.engine, tst2)
+        self.assertIsNot(mem1.engine, mem2.engine)
+        self.assertFalse(mem2.table_exists(table_name='t'))
+
+    def test16a__replicas__round_robin(self):
+        """Test reads are routed to the replicas in turn, and writes to
+        the primary.
+
+        :Test:
+            - Create a primary and two replica databases, each holding
+              its own name.
+            - Verify reads (and ``table_exists``) alternate between the
+              replicas.
+            - Verify a write, and a read with ``primary=True``, are
+              executed on the primary.
+
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            primary, *replicas = (self._node_db(tmp, name) for name in ('p', 'r1', 'r2'))
+            with DBInterface(connstr=primary, replicas=replicas) as dbi:
+                tst1 = [dbi.execute_query('select name from node')[0][0] for _ in range(4)]
+                tst2 = dbi.table_exists(table_name='node')
+                dbi.execute_query("update node set name = 'p*'")
+                tst3 = dbi.execute_query('select name from node', primary=True)[0][0]
+                tst4 = dbi.execute_query('select name from node')[0][0]
+        self.assertEqual(['r1', 'r2', 'r1', 'r2'], tst1)
+        self.assertTrue(tst2)
+        self.assertEqual('p*', tst3, msg=self._MSG1.format('p*', tst3))
+        self.assertEqual('r2', tst4, msg=self._MSG1.format('r2', tst4))
+
+    def test16b__replicas__least_outstanding(self):
+        """Test reads are routed to the replica with the fewest
+        connections checked out, and the read-your-writes window.
+
+        :Test:
+            - Hold a connection on one replica with a partially consumed
+              ``iter_query`` call, and verify the reads are routed to the
+              other replica.
+            - Verify reads are routed to the primary within the
+              read-your-writes window after a write.
+
+        """
+        stmt = 'select name from node'
+        with tempfile.TemporaryDirectory() as tmp:
+            primary, *replicas = (self._node_db(tmp, name) for name in ('p', 'r1', 'r2'))
+            with DBInterface(connstr=primary,
+                             replicas=replicas,
+                             routing='least-outstanding',
+                             read_your_writes=60) as dbi:
+                stream = dbi.iter_query(stmt, chunksize=1)
+                held = next(stream)[0][0]
+                tst1 = {dbi.execute_query(stmt)[0][0] for _ in range(3)}
+                stream.close()
+                dbi.execute_query("update node set name = 'p*'")
+                tst2 = dbi.execute_query(stmt)[0][0]
+            with self.assertRaises(ValueError):
+                DBInterface(connstr=primary, replicas=replicas, routing='random')
+        self.assertEqual({'r1', 'r2'} - {held}, tst1)
+        self.assertEqual('p*', tst2, msg=self._MSG1.format('p*', tst2))
+
+    def test16c__replicas__disguised_writes(self):
+        """Test writes which start with a read keyword are routed to the
+        primary.
+
+        :Test:
+            - Verify a CTE feeding a ``DELETE`` is executed (and
+              committed) on the primary, leaving the replicas untouched.
+            - Verify ``SELECT ... INTO``, ``FOR UPDATE`` and ``PRAGMA``
+              assignments are not classified as reads.
+            - Verify plain queries and ``PRAGMA`` reads are.
+
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            primary, *replicas = (self._node_db(tmp, name) for name in ('p', 'r1', 'r2'))
+            with DBInterface(connstr=primary, replicas=replicas) as dbi:
+                dbi.execute_query('with x as (select name from node) '
+                                  'delete from node where name in (select name from x)')
+                tst1 = dbi.execute_query('select count(*) from node', primary=True)[0][0]
+                tst2 = [dbi.execute_query('select count(*) from node')[0][0] for _ in range(2)]
+                tst3 = [dbi._is_read(stmt) for stmt in ('select * into node2 from node',
+                                                        'select * from node for update',
+                                                        'pragma journal_mode = wal')]
+                tst4 = [dbi._is_read(stmt) for stmt in ('select name from node',
+                                                        'pragma journal_mode')]
+        self.assertEqual(0, tst1, msg=self._MSG1.format(0, tst1))
+        self.assertEqual([1, 1], tst2)
+        self.assertEqual([False, False, False], tst3)
+        self.assertEqual([True, True], tst4)
+
+    def test16d__replicas__primary_only(self):
+        """Test reads within a primary-only block are routed to the
+        primary, for the current thread only.
+
+        :Test:
+            - Verify reads within the block are executed on the primary,
+              and do not open the read-your-writes window.
+            - Verify a read from another thread, within the block, is
+              routed to a replica.
+
+        """
+        stmt = 'select name from node'
+        with tempfile.TemporaryDirectory() as tmp:
+            primary, *replicas = (self._node_db(tmp, name) for name in ('p', 'r1'))
+            with DBInterface(connstr=primary, replicas=replicas, read_your_writes=60) as dbi:
+                other = []
+                with dbi._primary_only():
+                    tst1 = dbi.execute_query(stmt)[0][0]
+                    thread = threading.Thread(target=lambda: other.append(
+                        dbi.execute_query(stmt)[0][0]))
+                    thread.start()
+                    thread.join()
+                tst2 = dbi.execute_query(stmt)[0][0]
+        self.assertEqual('p', tst1, msg=self._MSG1.format('p', tst1))
+        self.assertEqual(['r1'], other, msg=self._MSG1.format(['r1'], other))
+        self.assertEqual('r1', tst2, msg=self._MSG1.format('r1', tst2))
+
+    def test17a__sharded__merge(self):
+        """Test a query is run on each shard, and the results merged.
+
+        :Test:
+            - Create three shards, each holding a subset of the ids.
+            - Verify the concatenated, ordered and reduced merges.
+            - Verify the ordered merge of DataFrames.
+            - Verify a query on a subset of the shards.
+
+        """
+        stmt = 'select id from customers order by id'
+        with tempfile.TemporaryDirectory() as tmp:
+            shards = {name: self._shard_db(tmp, name, ids)
+                      for name, ids in (('a', (1, 4, 7)), ('b', (2, 5)), ('c', (3, 6)))}
+            with ShardedInterface(shards=shards) as shi:
+                tst1 = [r[0] for r in shi.execute_query(stmt)]
+                tst2 = [r[0] for r in shi.execute_query(stmt, merge='ordered', key=0)]
+                tst3 = shi.execute_query('select count(*) from customers',
+                                         merge=lambda a, b: [(a[0][0] + b[0][0],)])
+                tst4 = shi.execute_query(stmt, raw=False, merge='ordered', key='id',
+                                         descending=True)
+                tst5 = [r[0] for r in shi.execute_query(stmt, shards=['c', 'a'])]
+                with self.assertRaises(KeyError):
+                    shi.execute_query(stmt, shards=['z'])
+                with self.assertRaises(ValueError):
+                    shi.execute_query(stmt, merge='ordered')
+        self.assertEqual([1, 4, 7, 2, 5, 3, 6], tst1)
+        self.assertEqual([1, 2, 3, 4, 5, 6, 7], tst2)
+        self.assertEqual([(7,)], tst3)
+        self.assertEqual([7, 6, 5, 4, 3, 2, 1], tst4['id'].tolist())
+        self.assertEqual([3, 6, 1, 4, 7], tst5)
+
+    def test17b__sharded__partial_failure(self):
+        """Test the results of the healthy shards are returned if a query
+        fails on a shard.
+
+        :Test:
+            - Create three shards, one of which is missing the table.
+            - Verify the healthy shards' results are returned.
+            - Verify the failed shard's error is returned.
+
+        """
+        stmt = 'select id from customers order by id'
+        buff = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            shards = [self._shard_db(tmp, 'a', (1, 3)),
+                      self._node_db(tmp, 'b'),
+                      self._shard_db(tmp, 'c', (2,))]
+            with ShardedInterface(shards=shards, max_workers=2) as shi:
+                with contextlib.redirect_stdout(buff):
+                    tst1, tst2 = shi.execute_query(stmt,
+                                                   merge='ordered',
+                                                   key=0,
+                                                   return_errors=True)
+        self.assertEqual([(1,), (2,), (3,)], [tuple(r) for r in tst1])
+        self.assertEqual([1], list(tst2))
+        self.assertIsInstance(tst2[1], sa.exc.OperationalError)
+        self.assertIn('ShardError', buff.getvalue())
+
+    def test18a__admission__shed(self):
+        """Test saturated batch work is shed, while interactive work is
+        admitted.
+
+        :Test:
+            - Hold the only batch slot with a partially consumed stream.
+            - Verify a batch query is shed once its queue timeout passes.
+            - Verify an interactive query is admitted.
+            - Verify a batch query is admitted once the slot is free.
+            - Verify the admission metrics.
+
+        """
+        stmt = 'select count(*) from guitars'
+        policy = AdmissionPolicy(limits={'interactive': None, 'batch': 1},
+                                 timeouts={'batch': 0.1})
+        dbi = DBInterface(connstr=self._CONNSTR, admission=policy)
+        stream = dbi.iter_query('select id from guitars', chunksize=1, priority='batch')
+        next(stream)
+        with self.assertRaises(AdmissionError):
+            dbi.execute_query(stmt, priority='batch')
+        tst1 = dbi.execute_query(stmt)[0][0]
+        stream.close()
+        tst2 = dbi.execute_query(stmt, priority='batch')[0][0]
+        tst3 = dbi.metrics['admission']
+        with self.assertRaises(ValueError):
+            dbi.execute_query(stmt, priority='urgent')
+        self.assertEqual((14, 14), (tst1, tst2))
+        self.assertEqual((2, 1), (tst3['batch']['admitted'], tst3['batch']['shed']))
+        self.assertEqual((1, 0), (tst3['interactive']['admitted'], tst3['interactive']['shed']))
+
+    def test18b__admission__queue(self):
+        """Test saturated batch work is queued until admitted, and shed
+        if the queue is full.
+
+        :Test:
+            - Hold the only batch slot with a transaction.
+            - Verify a query from another thread is queued, and a query
+              from a third thread is shed, as the queue is full.
+            - Verify the queued query is admitted when the transaction
+              ends, and its wait time is recorded.
+
+        """
+        stmt = 'select count(*) from guitars'
+        policy = AdmissionPolicy(limits={'interactive': None, 'batch': 1},
+                                 queue_sizes={'batch': 1})
+        dbi = DBInterface(connstr=self._CONNSTR, admission=policy, priority='batch')
+        results, errors = [], []
+
+        def query():
+            try:
+                results.append(dbi.execute_query(stmt)[0][0])
+            except AdmissionError as err:
+                errors.append(err)
+
+        with dbi.transaction():
+            queued = threading.Thread(target=query)
+            queued.start()
+            time.sleep(0.2)
+            shed = threading.Thread(target=query)
+            shed.start()
+            shed.join()
+            tst1 = list(results)
+        queued.join()
+        tst2 = policy.metrics['batch']
+        self.assertEqual([], tst1)
+        self.assertEqual([14], results)
+        self.assertEqual(1, len(errors))
+        self.assertEqual((2, 1), (tst2['admitted'], tst2['shed']))
+        self.assertGreaterEqual(tst2['wait_max'], 0.15)
+
+    def test18c__admission__extracts(self):
+        """Test the extraction methods are subject to admission, and use
+        a transaction's pinned connection.
+
+        :Test:
+            - Hold the only batch slot with a partially consumed stream.
+            - Verify an incremental extraction is shed, and extracts no
+              rows.
+            - Verify an incremental extraction within a transaction uses
+              the transaction's connection, rather than waiting for a
+              second slot.
+
+        """
+        policy = AdmissionPolicy(limits={'interactive': None, 'batch': 1},
+                                 timeouts={'batch': 0.1})
+        dbi = DBInterface(connstr=self._CONNSTR, admission=policy, priority='batch')
+        with tempfile.TemporaryDirectory() as tmp:
+            kwargs = {'table': 'guitars',
+                      'watermark_column': 'id',
+                      'key_columns': ['id'],
+                      'state': os.path.join(tmp, 'state.json'),
+                      'chunksize': 5}
+            stream = dbi.iter_query('select id from guitars', chunksize=1)
+            next(stream)
+            with contextlib.redirect_stdout(io.StringIO()):
+                tst1 = list(dbi.iter_incremental(**kwargs))
+            stream.close()
+            tst2 = policy.metrics['batch']['shed']
+            with dbi.transaction():
+                tst3 = sum(len(c) for c in dbi.iter_incremental(**kwargs))
+        self.assertEqual([], tst1)
+        self.assertEqual(1, tst2, msg=self._MSG1.format(1, tst2))
+        self.assertEqual(14, tst3, msg=self._MSG1.format(14, tst3))
+
+    def test19a__execute_query__output(self):
+        """Test the columnar and NumPy output modes.
+
+        :Test:
+            - Verify the ``'columns'`` mode returns a list per column.
+            - Verify the ``'arrays'`` mode returns an array per column.
+            - Verify the ``'numpy'`` mode returns a structured array.
+            - Verify an invalid mode raises a ValueError.
+
+        """
+        stmt = 'select id, make from guitars where id <= 3 order by id'
+        dbi = DBInterface(connstr=self._CONNSTR)
+        tst1 = dbi.execute_query(stmt, output='columns')
+        tst2 = dbi.execute_query(stmt, output='arrays')
+        tst3 = dbi.execute_query(stmt, output='numpy')
+        with self.assertRaises(ValueError):
+            dbi.execute_query(stmt, output='arrow')
+        self.assertEqual({'id': [1, 2, 3], 'make': tst1['make']}, tst1)
+        self.assertEqual(3, len(tst1['make']))
+        self.assertIsInstance(tst2['id'], np.ndarray)
+        self.assertEqual([1, 2, 3], tst2['id'].tolist())
+        self.assertEqual(('id', 'make'), tst3.dtype.names)
+        self.assertEqual([1, 2, 3], tst3['id'].tolist())
+        self.assertEqual(tst1['make'], tst3['make'].tolist())
+
+    def test19b__execute_query__flat(self):
+        """Test the flattened results, including empty results.
+
+        :Test:
+            - Verify the default flat mode returns a tuple.
+            - Verify the flat NumPy mode returns a 1-D array.
+            - Verify empty results return an empty tuple, or an empty
+              array, rather than raising an error.
+
+        """
+        stmt = 'select id from guitars where id <= :n order by id'
+        dbi = DBInterface(connstr=self._CONNSTR)
+        tst1 = dbi.execute_query(stmt, params={'n': 3}, flat=True)
+        tst2 = dbi.execute_query(stmt, params={'n': 3}, flat=True, output='numpy')
+        tst3 = dbi.execute_query(stmt, params={'n': 0}, flat=True)
+        tst4 = dbi.execute_query(stmt, params={'n': 0}, flat=True, output='numpy')
+        tst5 = dbi.execute_query(stmt, params={'n': 0}, output='numpy')
+        self.assertEqual((1, 2, 3), tst1)
+        self.assertEqual((1, [1, 2, 3]), (tst2.ndim, tst2.tolist()))
+        self.assertEqual((), tst3)
+        self.assertEqual(0, tst4.size)
+        self.assertEqual((0, ('id',)), (tst5.size, tst5.dtype.names))
+
+    def test20a__execute_query__backend(self):
+        """Test the DataFrame backends.
+
+        :Test:
+            - Verify the pandas backend, set on the interface or per
+              call, returns the same DataFrame as the default.
+            - Verify the polars and Arrow backends return a frame of the
+              expected shape, including for empty results, if the
+              library is installed. Otherwise, verify a
+              ``ModuleNotFoundError`` is raised.
+
+        """
+        stmt = 'select id, make, model from guitars where id <= :n order by id'
+        dbi = DBInterface(connstr=self._CONNSTR)
+        exp = dbi.execute_query(stmt, params={'n': 3}, raw=False)
+        tst1 = dbi.execute_query(stmt, params={'n': 3}, raw=False, backend='pandas')
+        tst2 = DBInterface(connstr=self._CONNSTR, backend='pandas').execute_query(stmt,
+                                                                                  params={'n': 3},
+                                                                                  raw=False)
+        self.assertTrue(exp.equals(tst1))
+        self.assertTrue(exp.equals(tst2))
+        for backend, library in (('polars', 'polars'), ('arrow', 'pyarrow')):
+            with self.subTest(backend=backend):
+                if utils.testimport(library, verbose=False):
+                    tst3 = dbi.execute_query(stmt, params={'n': 3}, raw=False, backend=backend)
+                    tst4 = dbi.execute_query(stmt, params={'n': 0}, raw=False, backend=backend)
+                    # A pyarrow.Table's columns are arrays, rather than names.
+                    names = [getattr(t, 'column_names', t.columns) for t in (tst3, tst4)]
+                    self.assertEqual((3, ['id', 'make', 'model']), (len(tst3), list(names[0])))
+                    self.assertEqual((0, ['id', 'make', 'model']), (len(tst4), list(names[1])))
+                else:
+                    with self.assertRaises(ModuleNotFoundError):
+                        dbi.execute_query(stmt, params={'n': 3}, raw=False, backend=backend)
+
+    def test20b__execute_query__backend__invalid(self):
+        """Test an invalid DataFrame backend is rejected.
+
+        :Test:
+            - Verify a ``ValueError`` is raised for an invalid backend,
+              on the interface or per call.
+
+        """
+        with self.assertRaises(ValueError):
+            DBInterface(connstr=self._CONNSTR, backend='spam')
+        with self.assertRaises(ValueError):
+            DBInterface(connstr=self._CONNSTR).execute_query('select 1', backend='spam')
+
+    def test21a__upsert(self):
+        """Test rows are inserted and updated via a staging table.
+
+        :Test:
+            - Upsert a DataFrame overlapping the existing keys.
+            - Verify the inserted and updated counts.
+            - Verify the table's contents, including a NaN stored as
+              NULL.
+
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            connstr = self._prices_db(tmp)
+            df = pd.DataFrame({'product_id': [2, 3, 4, 5],
+                               'price': [20.5, np.nan, 40.0, 50.0],
+                               'name': ['b*', 'c*', 'd', 'e']})
+            with DBInterface(connstr=connstr) as dbi:
+                tst1 = dbi.upsert('prices', df, keys=['product_id'])
+                tst2 = dbi.execute_query('select * from prices order by product_id')
+        self.assertEqual({'inserted': 2, 'updated': 2}, tst1)
+        self.assertEqual([(1, 1.0, 'a'), (2, 20.5, 'b*'), (3, None, 'c*'),
+                          (4, 40.0, 'd'), (5, 50.0, 'e')],
+                         [tuple(r) for r in tst2])
+
+    def test21b__upsert__options(self):
+        """Test the upsert's update columns and argument validation.
+
+        :Test:
+            - Upsert a list of dictionaries, updating the name only.
+            - Upsert with no update columns, and verify the existing
+              rows are left unchanged.
+            - Verify empty data returns zero counts.
+            - Verify a ``ValueError`` is raised for a key which is not
+              in the data.
+
+        """
+        rows = [{'product_id': 1, 'price': 10.0, 'name': 'a*'},
+                {'product_id': 9, 'price': 90.0, 'name': 'i'}]
+        with tempfile.TemporaryDirectory() as tmp:
+            connstr = self._prices_db(tmp)
+            with DBInterface(connstr=connstr) as dbi:
+                tst1 = dbi.upsert('prices', rows, keys='product_id', update=['name'])
+                tst2 = dbi.execute_query('select * from prices where product_id in (1, 9)')
+                tst3 = dbi.upsert('prices', [{'product_id': 1, 'price': 0.0, 'name': 'z'}],
+                                  keys='product_id',
+                                  update=[])
+                tst4 = dbi.execute_query('select * from prices where product_id = 1')
+                tst5 = dbi.upsert('prices', [], keys='product_id')
+                with self.assertRaises(ValueError):
+                    dbi.upsert('prices', rows, keys='spam')
+        self.assertEqual({'inserted': 1, 'updated': 1}, tst1)
+        self.assertEqual([(1, 1.0, 'a*'), (9, 90.0, 'i')], sorted(tuple(r) for r in tst2))
+        self.assertEqual({'inserted': 0, 'updated': 1}, tst3)
+        self.assertEqual([(1, 1.0, 'a*')], [tuple(r) for r in tst4])
+        self.assertEqual({'inserted': 0, 'updated': 0}, tst5)
+
+    def test22a__copy_table(self):
+        """Test a table is copied between two databases.
+
+        :Test:
+            - Copy a table into a new database, in chunks of two rows
+              via a single-chunk queue, and verify the rows and the
+              primary key are copied.
+            - Copy a ``SELECT`` source into a new table, and verify the
+              inferred column types.
+            - Replace the new table, and verify its rows.
+
+        """
+        stmt = 'select product_id, price * 2 as price2 from prices where product_id > :id'
+        with tempfile.TemporaryDirectory() as tmp:
+            with (DBInterface(connstr=self._prices_db(tmp)) as src,
+                  DBInterface(connstr=self._empty_db(tmp, 'dst')) as dst):
+                tst1 = copy_table(src, dst, 'prices', chunksize=2, queue_size=1)
+                tst2 = dst.execute_query('select * from prices order by product_id')
+                tst3 = sa.inspect(dst.engine).get_pk_constraint('prices')['constrained_columns']
+                tst4 = copy_table(src, dst, 'prices', source=stmt, params={'id': 1},
+                                  dst_table='doubled')
+                tst5 = {c['name']: type(c['type']).__name__
+                        for c in sa.inspect(dst.engine).get_columns('doubled')}
+                tst6 = copy_table(src, dst, 'prices', source=stmt, params={'id': 2},
+                                  dst_table='doubled',
+                                  if_exists='replace')
+                tst7 = dst.execute_query('select * from doubled')
+        self.assertEqual(3, tst1)
+        self.assertEqual([(1, 1.0, 'a'), (2, 2.0, 'b'), (3, 3.0, 'c')], [tuple(r) for r in tst2])
+        self.assertEqual(['product_id'], tst3)
+        self.assertEqual(2, tst4)
+        self.assertEqual({'product_id': 'BIGINT', 'price2': 'FLOAT'}, tst5)
+        self.assertEqual((1, [(3, 6.0)]), (tst6, [tuple(r) for r in tst7]))
+
+    def test22b__copy_table__errors(self):
+        """Test the copy's error handling.
+
+        :Test:
+            - Verify a ``ValueError`` is raised for an invalid
+              ``if_exists`` option, and for an existing table with
+              ``if_exists='fail'``.
+            - Verify a source error is raised by the copy.
+            - Verify a failed write is rolled back, leaving the
+              destination table unchanged.
+
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            with (DBInterface(connstr=self._prices_db(tmp)) as src,
+                  DBInterface(connstr=self._empty_db(tmp, 'dst')) as dst):
+                copy_table(src, dst, 'prices')
+                with self.assertRaises(ValueError):
+                    copy_table(src, dst, 'prices', if_exists='spam')
+                with self.assertRaises(ValueError):
+                    copy_table(src, dst, 'prices', if_exists='fail')
+                with self.assertRaises(sa.exc.OperationalError):
+                    copy_table(src, dst, 'prices', source='select * from spam')
+                # The first two chunks are written before the third
+                # chunk's key conflicts.
+                dst.execute_query('delete from prices where product_id < 3')
+                with self.assertRaises(sa.exc.IntegrityError):
+                    copy_table(src, dst, 'prices', chunksize=1)
+                tst1 = dst.execute_query('select product_id from prices', flat=True)
+        self.assertEqual((3,), tst1)
+
+    def test23a__budget__raise(self):
+        """Test a memory budget is enforced while fetching.
+
+        :Test:
+            - Verify results within the budget are the same as without
+              a budget, for the raw, DataFrame and columnar formats.
+            - Verify a ``MemoryBudgetError`` is raised if the row or
+              byte limit is exceeded; set per call, or on the
+              interface.
+
+        """
+        stmt = 'select * from guitars order by id'
+        budget = MemoryBudget(max_rows=1000, max_bytes=2**20)
+        dbi = DBInterface(connstr=self._CONNSTR)
+        exp1 = dbi.execute_query(stmt)
+        exp2 = dbi.execute_query(stmt, raw=False)
+        exp3 = dbi.execute_query(stmt, output='columns')
+        tst1 = dbi.execute_query(stmt, budget=budget)
+        tst2 = dbi.execute_query(stmt, raw=False, budget=budget)
+        tst3 = dbi.execute_query(stmt, output='columns', budget=budget)
+        with self.assertRaises(MemoryBudgetError):
+            dbi.execute_query(stmt, budget=MemoryBudget(max_rows=5))
+        with self.assertRaises(MemoryBudgetError):
+            dbi.execute_query(stmt, raw=False, budget=MemoryBudget(max_bytes=100))
+        with self.assertRaises(MemoryBudgetError):
+            DBInterface(connstr=self._CONNSTR, budget=MemoryBudget(max_rows=5)).execute_query(stmt)
+        self.assertEqual(exp1, tst1)
+        self.assertTrue(exp2.equals(tst2))
+        self.assertEqual(exp3, tst3)
+
+    def test23b__budget__spill(self):
+        """Test a result exceeding the budget is spilled to disk.
+
+        :Test:
+            - If pyarrow is installed, verify the result is spilled to a
+              memory-mapped file holding all rows, and the file is
+              deleted on close.
+            - Otherwise, verify a ``ModuleNotFoundError`` is raised by
+              a spilling budget.
+
+        """
+        stmt = 'select * from guitars order by id'
+        if not utils.testimport('pyarrow', verbose=False):
+            with self.assertRaises(ModuleNotFoundError):
+                MemoryBudget(max_rows=5, spill=True)
+            return
+        dbi = DBInterface(connstr=self._CONNSTR)
+        exp = dbi.execute_query(stmt, raw=False)
+        with tempfile.TemporaryDirectory() as tmp:
+            budget = MemoryBudget(max_rows=5, spill=True, spill_dir=tmp)
+            with dbi.execute_query(stmt, raw=False, budget=budget) as res:
+                tst1 = isinstance(res, SpilledResult)
+                tst2 = res.to_pandas()
+                tst3 = sum(b.num_rows for b in res.iter_batches())
+            tst4 = os.listdir(tmp)
+        self.assertTrue(tst1)
+        self.assertTrue(exp.equals(tst2))
+        self.assertEqual(len(exp), tst3)
+        self.assertEqual([], tst4)
+
+    def test23c__budget__spill__promote(self):
+        """Test a spilled result's column types are promoted by a later
+        batch.
+
+        :Test:
+            - If pyarrow is installed, spill a result whose first batch
+              holds only nulls (or integers) in columns which later hold
+              strings and floats.
+            - Verify the spilled result is the same as the result in
+              memory, and only the spilled file remains.
+
+        """
+        if not utils.testimport('pyarrow', verbose=False):
+            return
+        stmt = ('select id, '
+                'case when id > 3 then colour end as colour, '
+                'case when id > 3 then id * 1.5 end as price, '
+                'case when id > 3 then id + 0.5 else id end as rating '
+                'from guitars order by id')
+        dbi = DBInterface(connstr=self._CONNSTR)
+        exp = dbi.execute_query(stmt, raw=False)
+        with tempfile.TemporaryDirectory() as tmp:
+            budget = MemoryBudget(max_rows=2, spill=True, spill_dir=tmp)
+            with dbi.execute_query(stmt, raw=False, budget=budget) as res:
+                tst1 = res.to_pandas()
+                tst2 = len(os.listdir(tmp))
+        self.assertTrue(exp.equals(tst1), msg=self._MSG1.format(exp, tst1))
+        self.assertEqual(1, tst2, msg=self._MSG1.format(1, tst2))
+
+    def test24a__lazy(self):
+        """Test a lazy result fetches on demand, and releases its
+        connection.
+
+        :Test:
+            - Verify the connection is held until the first row is
+              fetched, then released.
+            - Verify the scalar, batched and materialised results match
+              the eager results.
+            - Verify the connection is released once the batches are
+              exhausted.
+
+        """
+        stmt = 'select * from guitars order by id'
+        dbi = DBInterface(connstr=self._CONNSTR, shared=False)
+        pool = dbi.engine.pool
+        exp1 = dbi.execute_query(stmt)
+        exp2 = dbi.execute_query(stmt, raw=False)
+        res = dbi.execute_query(stmt, lazy=True)
+        tst1 = (isinstance(res, LazyResult), pool.checkedout())
+        tst2 = res.first()
+        tst3 = (res.closed, pool.checkedout())
+        tst4 = dbi.execute_query('select count(*) from guitars', lazy=True).scalar()
+        res = dbi.execute_query(stmt, lazy=True)
+        tst5 = [len(b) for b in res.iter_batches(5)]
+        tst6 = (res.closed, pool.checkedout())
+        tst7 = dbi.execute_query(stmt, lazy=True).to_pandas()
+        tst8 = dbi.execute_query(stmt, lazy=True).to_numpy()
+        tst9 = dbi.execute_query(stmt, lazy=True).all()
+        self.assertEqual((True, 1), tst1)
+        self.assertEqual(exp1[0], tst2)
+        self.assertEqual((True, 0), tst3)
+        self.assertEqual(len(exp1), tst4)
+        self.assertEqual(len(exp1), sum(tst5))
+        self.assertEqual(5, tst5[0])
+        self.assertEqual((True, 0), tst6)
+        self.assertTrue(exp2.equals(tst7))
+        self.assertEqual((len(exp1), tuple(exp2.columns)), (tst8.size, tst8.dtype.names))
+        self.assertEqual(exp1, tst9)
+
+    def test24b__lazy__release(self):
+        """Test a lazy result's connection is released deterministically.
+
+        :Test:
+            - Verify leaving a ``with`` block, after a partial fetch,
+              releases the connection.
+            - Verify a closed result raises a ``ResourceClosedError``.
+            - Verify a statement which does not return rows returns
+              None, and releases the connection.
+
+        """
+        stmt = 'select * from guitars order by id'
+        dbi = DBInterface(connstr=self._CONNSTR, shared=False)
+        pool = dbi.engine.pool
+        with dbi.execute_query(stmt, lazy=True) as res:
+            tst1 = len(next(res.iter_batches(2)))
+            tst2 = pool.checkedout()
+        tst3 = pool.checkedout()
+        with self.assertRaises(sa.exc.ResourceClosedError):
+            res.first()
+        tst4 = dbi.execute_query("update guitars set colour = colour where id = 1", lazy=True)
+        self.assertEqual((2, 1, 0), (tst1, tst2, tst3))
+        self.assertIsNone(tst4)
+        self.assertEqual(0, pool.checkedout())
+
     @classmethod
     def _db_setup(cls) -> bool:
         """Run the database setup script, via a subproess.
@@ -234,3 +1578,77 @@ class TestDatabaseSQLite(TestBase):
             _ = proc.communicate()
         # Invert the bit so exit code 0 is True, and visa versa.
         return proc.returncode ^ 1
+
+    @staticmethod
+    def _empty_db(path: str, name: str) -> str:
+        """Create an empty database.
+
+        Args:
+            path (str): Directory in which the database is created.
+            name (str): The database's name.
+
+        Returns:
+            str: The database's connection string.
+
+        """
+        fpath = os.path.join(path, f'{name}.db')
+        sqlite3.connect(fpath).close()
+        return f'sqlite:///{fpath}'
+
+    @staticmethod
+    def _node_db(path: str, name: str) -> str:
+        """Create a database holding its own name, in a ``node`` table.
+
+        Args:
+            path (str): Directory in which the database is created.
+            name (str): The database's name.
+
+        Returns:
+            str: The database's connection string.
+
+        """
+        fpath = os.path.join(path, f'{name}.db')
+        with sqlite3.connect(fpath) as conn:
+            conn.execute('create table node (name text)')
+            conn.execute('insert into node values (?)', (name,))
+        conn.close()
+        return f'sqlite:///{fpath}'
+
+    @staticmethod
+    def _prices_db(path: str) -> str:
+        """Create a prices database, holding three products.
+
+        Args:
+            path (str): Directory in which the database is created.
+
+        Returns:
+            str: The database's connection string.
+
+        """
+        fpath = os.path.join(path, 'prices.db')
+        with sqlite3.connect(fpath) as conn:
+            conn.execute('create table prices (product_id integer primary key, price real, name text)')
+            conn.executemany('insert into prices values (?, ?, ?)',
+                             [(1, 1.0, 'a'), (2, 2.0, 'b'), (3, 3.0, 'c')])
+        conn.close()
+        return f'sqlite:///{fpath}'
+
+    @staticmethod
+    def _shard_db(path: str, name: str, ids: tuple) -> str:
+        """Create a shard database holding the given customer ids.
+
+        Args:
+            path (str): Directory in which the database is created.
+            name (str): The shard's name.
+            ids (tuple): The customer ids held by the shard.
+
+        Returns:
+            str: The shard's connection string.
+
+        """
+        fpath = os.path.join(path, f'{name}.db')
+        with sqlite3.connect(fpath) as conn:
+            conn.execute('create table customers (id integer, name text)')
+            conn.executemany('insert into customers values (?, ?)', [(i, name) for i in ids])
+        conn.close()
+        return f'sqlite:///{fpath}'
@@ -32,6 +32,11 @@ class _StartOfTest:
         """MySQL database functionality testing start of test message."""
         return 'MySQL database interface'
 
+    @property
+    def database_oracle(self):
+        """Oracle database functionality testing start of test message."""
+        return 'Oracle database interface'
+
     @property
     def database_sqlite(self):
         """SQLite database functionality testing start of test message."""